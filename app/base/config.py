@@ -50,10 +50,62 @@ class AppConfig(BaseSettings):
     DEFAULT_LLM_MODEL: str = Field("gpt-4", env="DEFAULT_LLM_MODEL")
     WHISPER_MODEL: str = Field("openai/whisper-large-v3", env="WHISPER_MODEL")
     UZBEK_MODEL: str = Field("aisha-org/Whisper-Uzbek", env="UZBEK_MODEL")
+    WHISPER_BACKEND: str = Field("faster", env="WHISPER_BACKEND")  # faster, openai
+    WHISPER_DEVICE: str = Field("auto", env="WHISPER_DEVICE")  # auto, cpu, cuda
+    WHISPER_CPU_COMPUTE_TYPE: str = Field("int8", env="WHISPER_CPU_COMPUTE_TYPE")  # int8, int8_float32, float32
+    WHISPER_GPU_COMPUTE_TYPE: str = Field("float16", env="WHISPER_GPU_COMPUTE_TYPE")
+    WHISPER_CPU_THREADS: int = Field(0, env="WHISPER_CPU_THREADS")  # 0 = CTranslate2 default
+    WHISPER_CPU_THREADS_PER_MODEL: str = Field("", env="WHISPER_CPU_THREADS_PER_MODEL")  # e.g. "ru:8,uz:4"
+    WHISPER_NUM_WORKERS: int = Field(1, env="WHISPER_NUM_WORKERS")
+    WHISPER_CT2_CACHE_DIR: str = Field("data/ct2_models", env="WHISPER_CT2_CACHE_DIR")
     SENTENCE_BERT_MODEL: str = Field(
         "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2", env="SBERT_MODEL"
     )
 
+    # === LLM Client ===
+    LLM_MAX_IN_FLIGHT: int = Field(16, env="LLM_MAX_IN_FLIGHT")
+    LLM_MAX_CONNECTIONS: int = Field(32, env="LLM_MAX_CONNECTIONS")
+    LLM_TIMEOUT_SECONDS: float = Field(60.0, env="LLM_TIMEOUT_SECONDS")
+    LLM_MAX_RETRIES: int = Field(2, env="LLM_MAX_RETRIES")
+
+    # === LLM Response Cache ===
+    LLM_CACHE_BACKEND: str = Field("memory", env="LLM_CACHE_BACKEND")  # memory, sqlite, redis, none
+    LLM_CACHE_TTL_SECONDS: int = Field(86400, env="LLM_CACHE_TTL_SECONDS")
+    LLM_CACHE_MAX_ITEMS: int = Field(10000, env="LLM_CACHE_MAX_ITEMS")
+    LLM_CACHE_PATH: str = Field("data/llm_cache.sqlite", env="LLM_CACHE_PATH")
+
+    # === Transcript Cache ===
+    TRANSCRIPT_CACHE_MAX_BYTES: int = Field(64 * 1024 * 1024, env="TRANSCRIPT_CACHE_MAX_BYTES")
+    TRANSCRIPT_CACHE_DISK_MAX_BYTES: int = Field(512 * 1024 * 1024, env="TRANSCRIPT_CACHE_DISK_MAX_BYTES")
+    TRANSCRIPT_CACHE_PATH: str = Field("data/transcript_cache.sqlite", env="TRANSCRIPT_CACHE_PATH")  # "" disables disk tier
+
+    # === Embedding Cache ===
+    EMBEDDING_CACHE_MAX_ITEMS: int = Field(50000, env="EMBEDDING_CACHE_MAX_ITEMS")
+    EMBEDDING_CACHE_PATH: str = Field("data/embedding_cache.sqlite", env="EMBEDDING_CACHE_PATH")  # "" disables disk tier
+
+    # === Bulk Resume Parsing ===
+    RESUME_PARSE_WORKERS: int = Field(4, env="RESUME_PARSE_WORKERS")
+    RESUME_PARSE_BATCH_SIZE: int = Field(16, env="RESUME_PARSE_BATCH_SIZE")
+    RESUME_BATCH_MAX_FILES: int = Field(5000, env="RESUME_BATCH_MAX_FILES")
+    RESUME_PARSER_WARMUP: bool = Field(False, env="RESUME_PARSER_WARMUP")
+    RESUME_PARSER_WARMUP_LANGUAGES: str = Field("en,ru", env="RESUME_PARSER_WARMUP_LANGUAGES")  # comma-separated
+
+    # === Interview Processing ===
+    ASR_WORKERS_PER_MODEL: int = Field(16, env="ASR_WORKERS_PER_MODEL")  # mostly waiting on the batcher
+    ASR_MAX_PENDING_PER_MODEL: int = Field(64, env="ASR_MAX_PENDING_PER_MODEL")
+    WHISPER_BATCH_WINDOW_MS: int = Field(30, env="WHISPER_BATCH_WINDOW_MS")  # 0 disables micro-batching
+    WHISPER_MAX_BATCH_SIZE: int = Field(8, env="WHISPER_MAX_BATCH_SIZE")
+    INTERVIEW_LLM_CONCURRENCY: int = Field(8, env="INTERVIEW_LLM_CONCURRENCY")
+
+    # === Audit Explanations ===
+    AUDIT_EXPLAIN_MODE: str = Field("linear", env="AUDIT_EXPLAIN_MODE")  # linear (exact, closed form) or shap
+    AUDIT_SHAP_BACKGROUND_SIZE: int = Field(100, env="AUDIT_SHAP_BACKGROUND_SIZE")
+    AUDIT_BATCH_MAX_ITEMS: int = Field(10000, env="AUDIT_BATCH_MAX_ITEMS")
+
+    # === Skill Bank Compaction ===
+    SKILL_BANK_COMPACTION_INTERVAL_SECONDS: int = Field(60, env="SKILL_BANK_COMPACTION_INTERVAL_SECONDS")
+    SKILL_BANK_DEDUP_THRESHOLD: float = Field(0.8, env="SKILL_BANK_DEDUP_THRESHOLD")  # cosine
+
     # === External Services ===
     PSYCHOMETRIC_API_URL: str = Field("http://localhost:8010", env="PSYCHOMETRIC_API_URL")
     FRAUD_SCORING_URL: str = Field("http://localhost:8011", env="FRAUD_SCORING_URL")
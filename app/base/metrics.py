@@ -31,6 +31,67 @@ api_exception_counter = Counter(
     ["type"]
 )
 
+embedding_cache_requests = Counter(
+    "embedding_cache_requests_total", "Embedding cache lookups by result (memory_hit, disk_hit, miss)",
+    ["result"]
+)
+
+llm_cache_requests = Counter(
+    "llm_cache_requests_total", "LLM response cache lookups by result (hit, miss)",
+    ["result"]
+)
+
+transcript_cache_requests = Counter(
+    "transcript_cache_requests_total", "Transcript cache lookups by result (memory_hit, disk_hit, miss)",
+    ["result"]
+)
+
+asr_queue_depth = Gauge(
+    "asr_queue_depth", "Pending ASR jobs per Whisper model lane",
+    ["model"]
+)
+
+asr_backpressure_total = Counter(
+    "asr_backpressure_total", "ASR submissions rejected because the model lane was full",
+    ["model"]
+)
+
+whisper_batch_size = Histogram(
+    "whisper_batch_size", "Clips per batched Whisper forward pass",
+    ["model"],
+    buckets=(1, 2, 4, 8, 16, 32)
+)
+
+interview_stream_sessions = Gauge(
+    "interview_stream_sessions", "Live streaming interview sessions on this worker"
+)
+
+interview_stream_buffer_bytes = Gauge(
+    "interview_stream_buffer_bytes", "Audio buffer bytes held by each live streaming session",
+    ["session"]
+)
+
+interview_stream_audio_dropped_bytes = Counter(
+    "interview_stream_audio_dropped_bytes_total",
+    "Audio bytes dropped because a session's backpressure buffer was full"
+)
+
+interview_stream_sessions_closed = Counter(
+    "interview_stream_sessions_closed_total",
+    "Streaming sessions closed by reason (completed, idle, duration, buffer, replaced, rejected)",
+    ["reason"]
+)
+
+whisper_model_memory_bytes = Gauge(
+    "whisper_model_memory_bytes", "Resident memory growth when each Whisper model was loaded",
+    ["model"]
+)
+
+embedding_model_memory_bytes = Gauge(
+    "embedding_model_memory_bytes", "Parameter and buffer memory held by each loaded embedding model",
+    ["model"]
+)
+
 
 # === FastAPI Middleware for Metrics ===
 
@@ -1,3 +1,11 @@
+DEFAULT_WEIGHTS = {
+    "semantic": 0.4,
+    "skill_overlap": 0.3,
+    "psychometric": 0.2,
+    "fairness": 0.1,
+}
+
+
 def compute_final_score(
     semantic_score: float,
     skill_overlap: float,
@@ -5,12 +13,7 @@ def compute_final_score(
     fairness_score: float,
     weights: dict = None
 ) -> float:
-    weights = weights or {
-        "semantic": 0.4,
-        "skill_overlap": 0.3,
-        "psychometric": 0.2,
-        "fairness": 0.1,
-    }
+    weights = weights or DEFAULT_WEIGHTS
     return round(
         semantic_score * weights["semantic"] +
         skill_overlap * weights["skill_overlap"] +
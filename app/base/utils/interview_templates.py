@@ -1,7 +1,11 @@
 import os
+import re
 import random
-from typing import List, Literal, Optional
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, List, Literal, Optional, Set, Tuple
 from app.base.models import InterviewQuestion
+from app.base.utils.prompt_loader import get_prompt_registry
 
 # === Templates for Extraction ===
 PROFILE_EXTRACTION_TEMPLATE = """
@@ -39,12 +43,212 @@ Answers:
 {answers}
 """
 
+SESSION_SUMMARY_UPDATE_TEMPLATE = """
+You are keeping a running summary of a candidate's interview performance.
+
+Domain: {domain}
+Level: {level}
+
+Summary so far:
+{summary}
+
+New answer:
+Q: {question}
+A: {answer}
+
+Rewrite the summary so it also covers the new answer. Return only the updated summary.
+"""
+
 # === Base Path ===
 QUESTION_BANK_DIR = "app/prompts/interview_questions"
 
 # === Type Aliases ===
 QuestionType = Literal["hard", "soft", "case", "management", "mixed"]
 
+QUESTION_TYPE_FILES: Dict[str, str] = {
+    "soft": "soft_skills.txt",
+    "hard": "hard_skills.txt",
+    "case": "case_study.txt",
+    "management": "management_skills.txt"
+}
+
+BANK_LANGUAGES = ("uz", "ru", "en")
+ANY = "*"  # index wildcard for an unfiltered domain or difficulty
+_LANGUAGE_PREFIXES = {"Q:": "uz", "UZ:": "uz", "RU:": "ru", "EN:": "en"}
+_SLUG = re.compile(r"[^a-z0-9]+")
+
+
+def _slug(value: str) -> str:
+    return _SLUG.sub("-", value.lower()).strip("-")
+
+
+# === Question Bank Index ===
+
+class QuestionBank:
+    """
+    The question bank files parsed once into entries and an index of entry ids keyed by
+    (type, language, domain, difficulty). Each entry is one question block:
+
+        ## Section heading          → domain (slug), e.g. "data-databases"
+        Q: / UZ: / RU: / EN: ...    → text per language
+        #tag:sql #database          → more domains
+        #difficulty:senior          → optional; untagged questions serve every level
+
+    Sampling touches only the drawn ids; InterviewQuestion objects are built for those alone.
+    """
+    def __init__(self, files: Dict[str, str]):
+        self.texts: List[Dict[str, str]] = []
+        self.types: List[str] = []
+        self.index: Dict[Tuple[str, str, str, str], List[int]] = defaultdict(list)
+        for qtype, text in files.items():
+            self._parse(qtype, text)
+        self.index = dict(self.index)
+
+    def _parse(self, qtype: str, text: str):
+        section = "general"
+        block: Dict[str, str] = {}
+        domains: Set[str] = set()
+        levels: Set[str] = set()
+
+        def flush():
+            if block:
+                self._add(qtype, dict(block), {section, *domains}, levels or {ANY})
+            block.clear()
+            domains.clear()
+            levels.clear()
+
+        for raw in text.splitlines():
+            line = raw.strip()
+            if not line:
+                continue
+            if line.startswith("## "):
+                flush()
+                section = _slug(line[3:])
+                continue
+            prefix = line.split(" ", 1)[0]
+            if prefix in _LANGUAGE_PREFIXES:
+                lang = _LANGUAGE_PREFIXES[prefix]
+                if lang in block:
+                    flush()
+                block[lang] = line[len(prefix):].strip()
+            elif line.startswith("#tag:") or line.startswith("#difficulty:"):
+                for token in line.split():
+                    key, _, value = token.lstrip("#").partition(":")
+                    value = _slug(value or key)
+                    (levels if key == "difficulty" else domains).add(value)
+        flush()
+
+    def _add(self, qtype: str, texts: Dict[str, str], domains: Set[str], levels: Set[str]):
+        entry_id = len(self.texts)
+        self.texts.append(texts)
+        self.types.append(qtype)
+        for lang in BANK_LANGUAGES:
+            if lang not in texts:
+                continue
+            for domain in (ANY, *domains):
+                for level in {ANY, *levels}:
+                    self.index[(qtype, lang, domain, level)].append(entry_id)
+
+    def candidates(
+        self, qtype: str, language: str, domain: Optional[str], difficulty: Optional[str]
+    ) -> Tuple[List[int], List[int]]:
+        """
+        (preferred, fallback) ids: the most specific non-empty bucket (domain+difficulty,
+        domain, difficulty) and the whole type for topping up.
+        """
+        domain = _slug(domain) if domain and domain != "general" else ANY
+        difficulty = _slug(difficulty) if difficulty and difficulty != "mixed" else ANY
+        fallback = self.index.get((qtype, language, ANY, ANY), [])
+        for key in ((domain, difficulty), (domain, ANY), (ANY, difficulty)):
+            bucket = self.index.get((qtype, language, *key))
+            if bucket:
+                return bucket, fallback
+        return fallback, fallback
+
+    @staticmethod
+    def allocate(count: int, sizes: Dict[str, int], weights: Dict[str, float]) -> Dict[str, int]:
+        """
+        Split `count` across types in proportion to `weights` (largest remainder), capped by
+        each type's bucket size; shortfalls are handed to types that still have questions.
+        """
+        quotas = {t: 0 for t in sizes}
+        remaining = count
+        while remaining > 0:
+            open_types = [t for t in sizes if quotas[t] < sizes[t] and weights.get(t, 0) > 0]
+            if not open_types:
+                break
+            total = sum(weights[t] for t in open_types)
+            shares = {t: remaining * weights[t] / total for t in open_types}
+            granted = {t: min(int(shares[t]), sizes[t] - quotas[t]) for t in open_types}
+            leftover = remaining - sum(granted.values())
+            for t in sorted(open_types, key=lambda t: (shares[t] - int(shares[t]), random.random()), reverse=True):
+                if leftover <= 0:
+                    break
+                if quotas[t] + granted[t] < sizes[t]:
+                    granted[t] += 1
+                    leftover -= 1
+            if not any(granted.values()):
+                break
+            for t, n in granted.items():
+                quotas[t] += n
+            remaining = count - sum(quotas.values())
+        return quotas
+
+    def sample(
+        self,
+        types: List[str],
+        language: str,
+        domain: Optional[str],
+        difficulty: Optional[str],
+        count: int,
+        weights: Optional[Dict[str, float]] = None
+    ) -> List[InterviewQuestion]:
+        language = language if language in BANK_LANGUAGES else BANK_LANGUAGES[0]
+        buckets = {t: self.candidates(t, language, domain, difficulty) for t in types}
+        sizes = {t: len(fallback) for t, (_, fallback) in buckets.items() if fallback}
+        quotas = self.allocate(count, sizes, weights or {t: 1.0 for t in sizes})
+
+        drawn: List[int] = []
+        for qtype, n in quotas.items():
+            if not n:
+                continue
+            preferred, fallback = buckets[qtype]
+            picked = random.sample(preferred, min(n, len(preferred)))
+            if len(picked) < n:
+                # Too few filtered matches: top up from the rest of the type.
+                taken = set(picked)
+                picked += random.sample([i for i in fallback if i not in taken], n - len(picked))
+            drawn += picked
+        random.shuffle(drawn)
+        return [InterviewQuestion(text=self.texts[i][language], type=self.types[i]) for i in drawn]
+
+
+_bank: Optional[QuestionBank] = None
+_bank_signature: Optional[Tuple] = None
+_bank_lock = Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    """
+    Process-wide index, rebuilt only when a bank file's mtime changes.
+    """
+    global _bank, _bank_signature
+    registry = get_prompt_registry()
+    templates = {}
+    for qtype, filename in QUESTION_TYPE_FILES.items():
+        try:
+            templates[qtype] = registry.get(os.path.join(QUESTION_BANK_DIR, filename))
+        except FileNotFoundError:
+            continue
+    signature = tuple((t.path, t.mtime) for t in templates.values())
+
+    with _bank_lock:
+        if _bank is None or signature != _bank_signature:
+            _bank = QuestionBank({qtype: t.text for qtype, t in templates.items()})
+            _bank_signature = signature
+        return _bank
+
+
 # === Loader ===
 
 def load_questions(
@@ -52,41 +256,13 @@ def load_questions(
     difficulty: Optional[str] = None,
     type: QuestionType = "mixed",
     language: str = "en",
-    count: int = 5
+    count: int = 5,
+    weights: Optional[Dict[str, float]] = None
 ) -> List[InterviewQuestion]:
     """
-    Load questions from local prompt files based on type.
+    Draw `count` questions from the indexed bank, filtered by domain and difficulty when
+    the bank has matches. "mixed" draws stratified across types (equal weights unless
+    `weights` is given, e.g. {"hard": 2, "soft": 1}).
     """
-    type_to_file = {
-        "soft": "soft_skills.txt",
-        "hard": "hard_skills.txt",
-        "case": "case_study.txt",
-        "management": "management_skills.txt"
-    }
-
-    files_to_load = (
-        list(type_to_file.values()) if type == "mixed"
-        else [type_to_file.get(type)]
-    )
-
-    questions = []
-
-    for filename in files_to_load:
-        full_path = os.path.join(QUESTION_BANK_DIR, filename)
-        if not os.path.exists(full_path):
-            continue
-
-        with open(full_path, "r", encoding="utf-8") as f:
-            lines = [l.strip() for l in f.readlines() if l.strip()]
-            for line in lines:
-                questions.append(InterviewQuestion(
-                    text=line,
-                    type=filename.replace("_skills.txt", ""),
-                    domain=domain or "general",
-                    difficulty=difficulty or "mixed",
-                    language=language
-                ))
-
-    # Shuffle and return the desired count
-    random.shuffle(questions)
-    return questions[:count]
+    types = list(QUESTION_TYPE_FILES) if type == "mixed" else [type]
+    return get_question_bank().sample(types, language, domain, difficulty, count, weights)
@@ -1,13 +1,158 @@
 import os
+import re
+import time
+import logging
+from string import Formatter
+from threading import Lock
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger("prompt_loader")
+
+PROMPTS_DIR = "app/prompts"
+MTIME_CHECK_INTERVAL = 2.0  # seconds between stat() calls per template
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_DOUBLE_BRACE_FIELD = re.compile(r"\{\{\s*[A-Za-z_]")
+
+
+class PromptTemplate:
+    """
+    A prompt file parsed once into literal text and placeholder segments (str.format syntax).
+    """
+    def __init__(self, path: str, text: str, mtime: float):
+        self.path = path
+        self.text = text
+        self.mtime = mtime
+        self.checked_at = time.monotonic()
+        self.parse_error: Optional[str] = None
+        # (literal, field, format_spec, conversion); field is None for trailing text
+        try:
+            self._segments: List[Tuple[str, Optional[str], str, Optional[str]]] = list(Formatter().parse(text))
+        except ValueError as e:
+            self.parse_error = str(e)
+            self._segments = [(text, None, "", None)]
+        self.placeholders: FrozenSet[str] = frozenset(f for _, f, _, _ in self._segments if f is not None)
+
+    def problems(self) -> List[str]:
+        """
+        Placeholders that `render` can never fill from a flat context, and `{{ name }}`
+        blocks, which str.format emits literally instead of substituting.
+        """
+        issues = [f"invalid placeholder {{{f}}}" for f in sorted(self.placeholders) if not _IDENTIFIER.match(f)]
+        if self.parse_error:
+            issues.append(f"not a valid format string ({self.parse_error}); rendered verbatim")
+        if _DOUBLE_BRACE_FIELD.search(self.text):
+            issues.append("uses {{ name }} blocks, which render literally")
+        return issues
+
+    def render(self, context: dict) -> str:
+        parts = []
+        for literal, field, spec, conversion in self._segments:
+            if literal:
+                parts.append(literal)
+            if field is None:
+                continue
+            try:
+                value = context[field]
+            except KeyError as e:
+                raise ValueError(f"Missing template variable: {e}")
+            if conversion:
+                value = {"r": repr, "a": ascii, "s": str}[conversion](value)
+            if spec:
+                parts.append(format(value, spec))
+            else:
+                parts.append(value if isinstance(value, str) else str(value))
+        return "".join(parts)
+
+
+class PromptRegistry:
+    """
+    Every file under PROMPTS_DIR, read and parsed once. A template is re-read only when
+    its mtime changes (checked at most every MTIME_CHECK_INTERVAL seconds).
+    """
+    def __init__(self, root: str = PROMPTS_DIR):
+        self.root = root
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._lines: Dict[str, Tuple[float, List[str]]] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normpath(path)
+
+    def load_all(self) -> Dict[str, List[str]]:
+        """
+        Compile every prompt file and return {path: problems} for the ones that fail validation.
+        """
+        report = {}
+        for directory, _, files in os.walk(self.root):
+            for filename in sorted(files):
+                if not filename.endswith(".txt"):
+                    continue
+                template = self.get(os.path.join(directory, filename))
+                if template.problems():
+                    report[template.path] = template.problems()
+        for path, issues in report.items():
+            logger.warning(f"[PromptRegistry] {path}: {'; '.join(issues)}")
+        logger.info(f"[PromptRegistry] Loaded {len(self._templates)} templates from {self.root}")
+        return report
+
+    def get(self, path: str) -> PromptTemplate:
+        key = self._key(path)
+        template = self._templates.get(key)
+        now = time.monotonic()
+        if template is not None and now - template.checked_at < MTIME_CHECK_INTERVAL:
+            return template
+
+        try:
+            mtime = os.stat(key).st_mtime
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Prompt file not found: {path}")
+
+        if template is not None and template.mtime == mtime:
+            template.checked_at = now
+            return template
+
+        with open(key, "r", encoding="utf-8") as f:
+            template = PromptTemplate(key, f.read(), mtime)
+        with self._lock:
+            reloaded = key in self._templates
+            self._templates[key] = template
+        if reloaded:
+            logger.info(f"[PromptRegistry] Reloaded {key}")
+            for issue in template.problems():
+                logger.warning(f"[PromptRegistry] {key}: {issue}")
+        return template
+
+    def lines(self, path: str) -> List[str]:
+        """
+        Non-empty stripped lines of a prompt file (e.g. a question bank), cached per mtime.
+        """
+        template = self.get(path)
+        cached = self._lines.get(template.path)
+        if cached is None or cached[0] != template.mtime:
+            cached = (template.mtime, [line.strip() for line in template.text.splitlines() if line.strip()])
+            self._lines[template.path] = cached
+        return cached[1]
+
+
+_registry: Optional[PromptRegistry] = None
+_registry_lock = Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = PromptRegistry()
+        return _registry
+
 
 def load_prompt_template(path: str) -> str:
     """
-    Load raw prompt from .txt file.
+    Load raw prompt from .txt file (served from the prompt registry).
     """
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Prompt file not found: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read()
+    return get_prompt_registry().get(path).text
 
 
 def render_prompt(template: str, context: dict) -> str:
@@ -0,0 +1,42 @@
+import json
+import logging
+from typing import AsyncIterator, Callable, Dict, Optional
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger("sse")
+
+
+def sse_event(event: str, data: Dict) -> str:
+    """
+    Format one Server-Sent Event frame with a JSON payload.
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def stream_tokens(
+    tokens: AsyncIterator[str],
+    on_done: Optional[Callable[[str], Dict]] = None
+) -> StreamingResponse:
+    """
+    Stream LLM tokens as `token` events, then one `done` event carrying the full text
+    (plus whatever `on_done(text)` adds), or an `error` event if generation fails.
+    A client disconnect cancels the iteration, which cancels the upstream LLM request.
+    """
+    async def events():
+        parts = []
+        try:
+            async for token in tokens:
+                parts.append(token)
+                yield sse_event("token", {"text": token})
+            content = "".join(parts).strip()
+            yield sse_event("done", {"content": content, **(on_done(content) if on_done else {})})
+        except Exception as e:
+            logger.exception(f"[SSE] Generation failed: {e}")
+            yield sse_event("error", {"message": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
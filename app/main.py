@@ -3,9 +3,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import APIKeyHeader
 from prometheus_fastapi_instrumentator import Instrumentator
 from starlette.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.base.config import settings
 from app.base.logging_config import app_logger as logger
+from app.models.embedding_loader import EmbeddingModelRegistry
+from app.models.spacy_loader import SpacyModelRegistry
+from app.models.whisper_loader import WhisperModelRegistry
+from app.services import resume_parser_service
+from app.base.utils.prompt_loader import get_prompt_registry
 
 from app.routers import (
     resume_parser,
@@ -69,6 +75,18 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"detail": "Internal server error"}
     )
 
+# --- Prompt templates: parse once, report placeholder problems at boot ---
+@app.on_event("startup")
+async def load_prompt_templates():
+    await run_in_threadpool(get_prompt_registry().load_all)
+
+# --- Optional model warm-up ---
+@app.on_event("startup")
+async def warm_up_models():
+    if settings.RESUME_PARSER_WARMUP:
+        languages = [lang.strip() for lang in settings.RESUME_PARSER_WARMUP_LANGUAGES.split(",") if lang.strip()]
+        await run_in_threadpool(resume_parser_service.warm_up, languages)
+
 # --- API Routers ---
 app.include_router(resume_parser.router, prefix="/resume", tags=["Resume"])
 app.include_router(resume_generator.router, prefix="/resume", tags=["Resume"])
@@ -86,6 +104,14 @@ app.include_router(interview_bot_router, prefix="/interview", tags=["Interview"]
 def health_check():
     return {"status": "ok"}
 
+@app.get("/models/memory", tags=["System"])
+def model_memory():
+    return {
+        "embedding_models": EmbeddingModelRegistry.memory_report(),
+        "spacy_models": SpacyModelRegistry.loaded(),
+        "whisper_models": WhisperModelRegistry.memory_report(),
+    }
+
 @app.get("/version", tags=["System"])
 def version_check():
     return {
@@ -0,0 +1,214 @@
+"""
+Embedding Cache for HirefyAI
+
+Content-addressed cache for sentence embeddings, keyed by model name and text hash.
+Two tiers:
+    - a bounded in-memory LRU
+    - an on-disk SQLite store so embeddings survive restarts and are shared by workers
+
+Services should encode through `get_cached_encoder(model_name)` rather than calling
+`SentenceTransformer.encode` directly.
+"""
+
+import os
+import sqlite3
+import hashlib
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.base.config import settings
+from app.base.metrics import embedding_cache_requests
+from app.models.embedding_loader import EmbeddingModelRegistry
+
+logger = logging.getLogger("embedding_cache")
+
+SQLITE_IN_CHUNK = 500
+
+
+class EmbeddingCache:
+    """
+    Two-tier (LRU memory + SQLite disk) store of float32 vectors.
+    Keys are (namespace, sha256(text)); the namespace identifies model and encode options.
+    """
+    def __init__(self, max_items: int = None, db_path: Optional[str] = None):
+        self.max_items = max_items or settings.EMBEDDING_CACHE_MAX_ITEMS
+        self.db_path = settings.EMBEDDING_CACHE_PATH if db_path is None else db_path
+        self._memory: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = Lock()
+        self._conn = self._open_db() if self.db_path else None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _open_db(self) -> Optional[sqlite3.Connection]:
+        try:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "namespace TEXT NOT NULL, hash TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (namespace, hash))"
+            )
+            conn.commit()
+            logger.info(f"[EmbeddingCache] Disk tier at {self.db_path}")
+            return conn
+        except Exception as e:
+            logger.warning(f"[EmbeddingCache] Disk tier disabled: {e}")
+            return None
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, namespace: str, hashes: List[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+
+        with self._lock:
+            for h in hashes:
+                vec = self._memory.get((namespace, h))
+                if vec is not None:
+                    self._memory.move_to_end((namespace, h))
+                    found[h] = vec
+                else:
+                    missing.append(h)
+            self.stats["memory_hits"] += len(found)
+
+            if missing and self._conn is not None:
+                disk = self._read_disk(namespace, missing)
+                for h, vec in disk.items():
+                    found[h] = vec
+                    self._remember(namespace, h, vec)
+                self.stats["disk_hits"] += len(disk)
+
+            misses = len(hashes) - len(found)
+            self.stats["misses"] += misses
+
+        embedding_cache_requests.labels(result="memory_hit").inc(len(hashes) - len(missing))
+        embedding_cache_requests.labels(result="disk_hit").inc(len(missing) - misses)
+        embedding_cache_requests.labels(result="miss").inc(misses)
+        return found
+
+    def put_many(self, namespace: str, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+        with self._lock:
+            for h, vec in items.items():
+                self._remember(namespace, h, vec)
+            if self._conn is not None:
+                try:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (namespace, hash, vector) VALUES (?, ?, ?)",
+                        [(namespace, h, np.asarray(vec, dtype=np.float32).tobytes()) for h, vec in items.items()]
+                    )
+                    self._conn.commit()
+                except Exception as e:
+                    logger.warning(f"[EmbeddingCache] Disk write failed: {e}")
+
+    def _remember(self, namespace: str, h: str, vec: np.ndarray):
+        self._memory[(namespace, h)] = vec
+        self._memory.move_to_end((namespace, h))
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, namespace: str, hashes: List[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        try:
+            for start in range(0, len(hashes), SQLITE_IN_CHUNK):
+                chunk = hashes[start:start + SQLITE_IN_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE namespace = ? AND hash IN ({placeholders})",
+                    [namespace, *chunk]
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"[EmbeddingCache] Disk read failed: {e}")
+        return found
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embeddings")
+                self._conn.commit()
+
+
+class CachedEncoder:
+    """
+    Encodes texts with a registry-shared SentenceTransformer, serving repeats from the cache.
+    """
+    def __init__(self, model_name: str, cache: EmbeddingCache):
+        self.model_name = model_name
+        self.model = EmbeddingModelRegistry.get_model(model_name)
+        self.cache = cache
+
+    def _namespace(self, normalize: bool) -> str:
+        return f"{EmbeddingModelRegistry.resolve_model_key(self.model_name)}|norm={int(normalize)}"
+
+    def encode(
+        self,
+        texts: Union[str, List[str]],
+        normalize: bool = True,
+        batch_size: int = 64
+    ) -> np.ndarray:
+        """
+        Returns a (dim,) vector for a single string or an (n, dim) float32 matrix for a list.
+        Only cache misses reach the model, and they are encoded in one call.
+        """
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        if not batch:
+            return np.zeros((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        namespace = self._namespace(normalize)
+        hashes = [EmbeddingCache.hash_text(t) for t in batch]
+        found = self.cache.get_many(namespace, list(dict.fromkeys(hashes)))
+
+        pending: Dict[str, str] = {}
+        for h, t in zip(hashes, batch):
+            if h not in found and h not in pending:
+                pending[h] = t
+
+        if pending:
+            encoded = self.model.encode(
+                list(pending.values()),
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=normalize
+            ).astype(np.float32)
+            fresh = dict(zip(pending.keys(), encoded))
+            self.cache.put_many(namespace, fresh)
+            found.update(fresh)
+
+        matrix = np.stack([found[h] for h in hashes])
+        return matrix[0] if single else matrix
+
+
+_shared_cache: Optional[EmbeddingCache] = None
+_encoders: Dict[str, CachedEncoder] = {}
+_encoders_lock = Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _shared_cache
+    with _encoders_lock:
+        if _shared_cache is None:
+            _shared_cache = EmbeddingCache()
+        return _shared_cache
+
+
+def get_cached_encoder(model_name: Optional[str] = None) -> CachedEncoder:
+    """
+    Process-wide CachedEncoder per model, all backed by the same EmbeddingCache.
+    """
+    key = EmbeddingModelRegistry.resolve_model_key(model_name or settings.SENTENCE_BERT_MODEL)
+    cache = get_embedding_cache()
+    with _encoders_lock:
+        if key not in _encoders:
+            _encoders[key] = CachedEncoder(key, cache)
+        return _encoders[key]
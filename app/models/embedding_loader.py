@@ -0,0 +1,94 @@
+"""
+Embedding Loader for HirefyAI
+
+Process-wide registry for SentenceTransformer models. Every service that needs
+sentence embeddings asks the registry instead of constructing its own model, so
+each worker holds exactly one copy of the weights per model name.
+"""
+
+import time
+import logging
+from typing import Dict, Optional
+from threading import Lock
+
+from sentence_transformers import SentenceTransformer
+
+from app.base.config import settings
+from app.base.metrics import embedding_model_memory_bytes
+
+logger = logging.getLogger("embedding_loader")
+
+
+class EmbeddingModelRegistry:
+    """
+    Global singleton registry for SentenceTransformer models with lazy loading.
+
+    Short names (e.g. "all-MiniLM-L6-v2") and their hub ids
+    ("sentence-transformers/all-MiniLM-L6-v2") resolve to the same instance.
+    """
+    _instances: Dict[str, SentenceTransformer] = {}
+    _stats: Dict[str, Dict[str, float]] = {}
+    _lock = Lock()
+
+    @classmethod
+    def get_model(cls, model_name: Optional[str] = None) -> SentenceTransformer:
+        key = cls.resolve_model_key(model_name or settings.SENTENCE_BERT_MODEL)
+
+        model = cls._instances.get(key)
+        if model is not None:
+            return model
+
+        with cls._lock:
+            if key not in cls._instances:
+                logger.info(f"[EmbeddingLoader] Loading model '{key}'")
+                try:
+                    started = time.perf_counter()
+                    model = SentenceTransformer(key)
+                    load_seconds = time.perf_counter() - started
+                except Exception as e:
+                    logger.exception(f"[EmbeddingLoader] Failed to load model '{key}': {e}")
+                    raise RuntimeError(f"Embedding model loading failed for '{key}'") from e
+
+                memory = cls._model_memory_bytes(model)
+                cls._instances[key] = model
+                cls._stats[key] = {
+                    "memory_bytes": memory,
+                    "load_seconds": round(load_seconds, 3),
+                    "dimension": model.get_sentence_embedding_dimension(),
+                }
+                embedding_model_memory_bytes.labels(model=key).set(memory)
+                logger.info(f"[EmbeddingLoader] Loaded '{key}' in {load_seconds:.2f}s ({memory / 1024 ** 2:.1f} MB)")
+
+            return cls._instances[key]
+
+    @staticmethod
+    def resolve_model_key(model_name: str) -> str:
+        name = model_name.strip()
+        if "/" not in name:
+            return f"sentence-transformers/{name}"
+        return name
+
+    @staticmethod
+    def _model_memory_bytes(model: SentenceTransformer) -> int:
+        params = sum(p.numel() * p.element_size() for p in model.parameters())
+        buffers = sum(b.numel() * b.element_size() for b in model.buffers())
+        return int(params + buffers)
+
+    @classmethod
+    def memory_report(cls) -> Dict[str, Dict[str, float]]:
+        """
+        Per-model memory (bytes), load time and embedding dimension for loaded models.
+        """
+        with cls._lock:
+            return {key: dict(stats) for key, stats in cls._stats.items()}
+
+    @classmethod
+    def preload(cls, model_names: list):
+        """
+        Warm up the given models to avoid latency on first request.
+        """
+        for name in model_names:
+            try:
+                cls.get_model(name)
+            except Exception as e:
+                logger.warning(f"[EmbeddingLoader] Failed to preload model '{name}': {e}")
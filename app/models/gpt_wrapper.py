@@ -1,9 +1,11 @@
 import logging
 import json
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any
 
+from app.models.gpt_writer import GPTWriter, FALLBACK_MESSAGES
 from app.base.utils.interview_templates import (
     SESSION_SUMMARY_TEMPLATE,
+    SESSION_SUMMARY_UPDATE_TEMPLATE,
     SKILL_EXTRACTION_TEMPLATE,
     PROFILE_EXTRACTION_TEMPLATE,
 )
@@ -13,7 +15,8 @@ logger = logging.getLogger("gpt_scorer")
 
 class GPTScorer:
     def __init__(self, model: str = "gpt-4"):
-        self.llm = GPTWriter(model=model)
+        self.model_name = model
+        self.llm = GPTWriter(model=model, cache=True)
 
     def score_answer(self, question: str, answer: str, language: str = "en") -> Dict[str, Any]:
         prompt = self._build_score_prompt(question, answer, language)
@@ -29,6 +32,29 @@ class GPTScorer:
                 "model_used": "fallback"
             }
 
+    async def ascore_answer(self, question: str, answer: str, language: str = "en") -> Dict[str, Any]:
+        prompt = self._build_score_prompt(question, answer, language)
+        try:
+            response = await self.llm.awrite(prompt)
+            return self._parse_score_response(response)
+        except Exception as e:
+            logger.warning(f"[ScoreFallback] {e}")
+            return {
+                "score": 0.0,
+                "reasoning": "Scoring failed.",
+                "tags": [],
+                "model_used": "fallback"
+            }
+
+    async def _awrite_or_raise(self, prompt: str) -> str:
+        """
+        `GPTWriter.awrite` returns a fallback message instead of raising; turn it back into an error.
+        """
+        response = await self.llm.awrite(prompt)
+        if response in FALLBACK_MESSAGES:
+            raise RuntimeError(response)
+        return response
+
     def get_summary(self, answers_block: str, domain: str, level: str, language_name: str = "uz") -> str:
         try:
             summary_prompt = SESSION_SUMMARY_TEMPLATE.format(
@@ -42,6 +68,35 @@ class GPTScorer:
             logger.warning(f"[SummaryFallback] {e}")
             return "Summary could not be generated."
 
+    async def astream_summary(self, answers_block: str, domain: str, level: str) -> AsyncIterator[str]:
+        """
+        Token-streaming variant of `get_summary`; API errors propagate to the caller.
+        """
+        summary_prompt = SESSION_SUMMARY_TEMPLATE.format(
+            answers=answers_block,
+            domain=domain,
+            level=level
+        )
+        async for token in self.llm.astream(summary_prompt):
+            yield token
+
+    async def aupdate_summary(self, summary: str, question: str, answer: str, domain: str, level: str) -> str:
+        """
+        Fold one more Q/A pair into a running session summary.
+        """
+        prompt = SESSION_SUMMARY_UPDATE_TEMPLATE.format(
+            summary=summary or "(no answers yet)",
+            question=question,
+            answer=answer,
+            domain=domain,
+            level=level
+        )
+        try:
+            return (await self._awrite_or_raise(prompt)).strip()
+        except Exception as e:
+            logger.warning(f"[SummaryUpdateFallback] {e}")
+            return summary
+
     def extract_skills(self, full_text: str, job_context: str) -> Dict[str, Any]:
         try:
             prompt = SKILL_EXTRACTION_TEMPLATE.format(
@@ -58,6 +113,22 @@ class GPTScorer:
                 "intent": "unknown"
             }
 
+    async def aextract_skills(self, full_text: str, job_context: str) -> Dict[str, Any]:
+        try:
+            prompt = SKILL_EXTRACTION_TEMPLATE.format(
+                full_text=full_text,
+                job_context=job_context
+            )
+            response = await self._awrite_or_raise(prompt)
+            return self._parse_skill_response(response)
+        except Exception as e:
+            logger.warning(f"[SkillExtractFallback] {e}")
+            return {
+                "skills": [],
+                "traits": [],
+                "intent": "unknown"
+            }
+
     def extract_profile(self, full_text: str) -> Dict[str, Any]:
         try:
             prompt = PROFILE_EXTRACTION_TEMPLATE.format(full_text=full_text)
@@ -74,6 +145,14 @@ class GPTScorer:
                 "current_role": None
             }
 
+    def extract_traits(self, prompt: str, language: str = "en") -> Dict[str, Any]:
+        try:
+            response = self.llm.write(prompt)
+            return json.loads(response)
+        except Exception as e:
+            logger.warning(f"[TraitExtractFallback] {e}")
+            return {}
+
     # === Internal Prompt Builders ===
 
     def _build_score_prompt(self, question: str, answer: str, language: str) -> str:
@@ -2,21 +2,31 @@
 GPTWriter: Unified abstraction over OpenAI GPT APIs for prompt-to-text generation.
 
 Supports:
-- GPT-3.5, GPT-4 (via openai.ChatCompletion)
+- GPT-3.5, GPT-4 (via the shared async LLMClient)
 - Extendable to Claude, Mistral, local models
 
 Usage:
     writer = GPTWriter(model="gpt-4")
-    output = writer.write("Tell me a joke.")
+    output = writer.write("Tell me a joke.")            # sync facade
+    output = await writer.awrite("Tell me a joke.")     # async
+    async for token in writer.astream("Tell me a joke."):  # token streaming
+        ...
 """
 
-import os
-import openai
 import logging
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Tuple
+
+from openai import OpenAIError
+
+from app.models.llm_client import get_llm_client
+from app.models.llm_cache import LLMResponseCache, get_llm_cache
 
 logger = logging.getLogger("gpt_writer")
 
+API_ERROR_MESSAGE = "⚠️ GPT response unavailable due to API error."
+UNEXPECTED_ERROR_MESSAGE = "⚠️ GPT encountered an unexpected error."
+FALLBACK_MESSAGES = (API_ERROR_MESSAGE, UNEXPECTED_ERROR_MESSAGE)
+
 
 class GPTWriter:
     def __init__(
@@ -25,61 +35,146 @@ class GPTWriter:
         temperature: float = 0.7,
         max_tokens: int = 1024,
         api_key: Optional[str] = None,
+        cache: bool = False,
     ):
+        """
+        cache=True serves identical (model, params, prompt) requests from the LLM response cache.
+        Only successful completions are cached.
+        """
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-
-        if not self.api_key:
-            raise ValueError("OpenAI API key is missing. Set OPENAI_API_KEY environment variable.")
+        self.client = get_llm_client(api_key)
+        self.cache = get_llm_cache() if cache else None
 
-        openai.api_key = self.api_key
+    def _fallback(self, error: Exception) -> str:
+        if isinstance(error, OpenAIError):
+            logger.error(f"[GPTWriter] OpenAI API error: {error}")
+            return API_ERROR_MESSAGE
+        logger.error(f"[GPTWriter] Unexpected error: {error}")
+        return UNEXPECTED_ERROR_MESSAGE
 
-    def write(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+    def _lookup(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str],
+        model: str
+    ) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+        """
+        Returns (cache keys, cached responses) per prompt; both are all-None when caching is off.
+        """
+        if self.cache is None:
+            return [None] * len(prompts), [None] * len(prompts)
+        keys = [
+            LLMResponseCache.make_key(model, p, system_prompt, self.temperature, self.max_tokens)
+            for p in prompts
+        ]
+        return keys, [self.cache.get(k) for k in keys]
+
+    def _store(self, key: Optional[str], result) -> str:
+        if isinstance(result, Exception):
+            return self._fallback(result)
+        if key is not None:
+            self.cache.set(key, result)
+        return result
+
+    async def awrite(self, prompt: str, system_prompt: Optional[str] = None, model: Optional[str] = None) -> str:
         """
         Sends a prompt to the GPT model and returns the response.
 
         Args:
             prompt (str): User prompt
             system_prompt (Optional[str]): Optional system message (e.g. "You are a helpful assistant.")
+            model (Optional[str]): Per-call model override
 
         Returns:
             str: Model-generated text
         """
+        model = model or self.model
+        (key,), (cached,) = self._lookup([prompt], system_prompt, model)
+        if cached is not None:
+            return cached
+
+        logger.info(f"[GPTWriter] Sending prompt to {model}")
         try:
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-
-            logger.info(f"[GPTWriter] Sending prompt to {self.model}")
-
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=messages,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
-
-            result = response["choices"][0]["message"]["content"].strip()
-            return result
-
-        except openai.error.OpenAIError as e:
-            logger.exception(f"[GPTWriter] OpenAI API error: {e}")
-            return "⚠️ GPT response unavailable due to API error."
+            result = await self.client.complete(prompt, model, system_prompt, self.temperature, self.max_tokens)
         except Exception as e:
-            logger.exception(f"[GPTWriter] Unexpected error: {e}")
-            return "⚠️ GPT encountered an unexpected error."
+            result = e
+        return self._store(key, result)
 
-    def write_batch(self, prompts: List[str], system_prompt: Optional[str] = None) -> List[str]:
+    async def astream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> AsyncIterator[str]:
         """
-        Process a list of prompts sequentially using the same model config.
+        Yield the response token by token. A cached response is yielded as one chunk; a
+        fully streamed response is cached. Unlike `awrite`, API errors are raised rather
+        than replaced by a fallback message, since part of the output may already be sent.
+        """
+        model = model or self.model
+        (key,), (cached,) = self._lookup([prompt], system_prompt, model)
+        if cached is not None:
+            yield cached
+            return
+
+        logger.info(f"[GPTWriter] Streaming prompt to {model}")
+        parts = []
+        async for token in self.client.stream(prompt, model, system_prompt, self.temperature, self.max_tokens):
+            parts.append(token)
+            yield token
+        self._store(key, "".join(parts).strip())
+
+    async def awrite_batch(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> List[str]:
+        """
+        Process a list of prompts concurrently using the same model config.
 
         Returns:
-            List of responses
+            List of responses, in prompt order
         """
-        results = []
-        for prompt in prompts:
-            results.append(self.write(prompt, system_prompt))
+        model = model or self.model
+        keys, results = self._lookup(prompts, system_prompt, model)
+        misses = [i for i, r in enumerate(results) if r is None]
+        fresh = await self.client.complete_many(
+            [prompts[i] for i in misses], model, system_prompt, self.temperature, self.max_tokens
+        )
+        for i, result in zip(misses, fresh):
+            results[i] = self._store(keys[i], result)
+        return results
+
+    # === Sync facade ===
+
+    def write(self, prompt: str, system_prompt: Optional[str] = None, model: Optional[str] = None) -> str:
+        model = model or self.model
+        (key,), (cached,) = self._lookup([prompt], system_prompt, model)
+        if cached is not None:
+            return cached
+
+        logger.info(f"[GPTWriter] Sending prompt to {model}")
+        try:
+            result = self.client.complete_sync(prompt, model, system_prompt, self.temperature, self.max_tokens)
+        except Exception as e:
+            result = e
+        return self._store(key, result)
+
+    def write_batch(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> List[str]:
+        model = model or self.model
+        keys, results = self._lookup(prompts, system_prompt, model)
+        misses = [i for i, r in enumerate(results) if r is None]
+        fresh = self.client.complete_many_sync(
+            [prompts[i] for i in misses], model, system_prompt, self.temperature, self.max_tokens
+        )
+        for i, result in zip(misses, fresh):
+            results[i] = self._store(keys[i], result)
         return results
@@ -0,0 +1,244 @@
+"""
+LLM Response Cache for HirefyAI
+
+Prompt-level cache for deterministic LLM calls (scoring, extraction, summaries), so
+client retries and re-scoring of the same transcript don't pay for the round-trip again.
+
+Keys are sha256(model, generation params, system prompt, whitespace-normalized prompt).
+Entries carry a TTL; the store is size-bounded. Backends:
+    - "memory": in-process LRU
+    - "sqlite": local file, shared by workers on the host
+    - "redis":  settings.REDIS_URL (size bound left to Redis' maxmemory policy)
+    - "none":   disabled
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Tuple
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from app.base.config import settings
+from app.base.metrics import llm_cache_requests
+
+logger = logging.getLogger("llm_cache")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+# === Backends ===
+
+class LLMCacheBackend(ABC):
+    name = "base"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """
+        Cached value, or None when missing or expired.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl_seconds: int):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+
+class MemoryLLMCacheBackend(LLMCacheBackend):
+    name = "memory"
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl_seconds: int):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteLLMCacheBackend(LLMCacheBackend):
+    name = "sqlite"
+
+    def __init__(self, db_path: str, max_items: int):
+        self.max_items = max_items
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+        self._conn.commit()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, value: str, ttl_seconds: int):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl_seconds, now)
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,))
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_items,)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+
+class RedisLLMCacheBackend(LLMCacheBackend):
+    """
+    `client` may be any object with redis-py's get/setex/scan_iter/delete (e.g. fakeredis in tests).
+    """
+    name = "redis"
+    prefix = "llmcache:"
+
+    def __init__(self, url: Optional[str] = None, client=None):
+        if client is None:
+            if not redis:
+                raise ImportError("redis package not installed")
+            client = redis.Redis.from_url(url or settings.REDIS_URL, decode_responses=True)
+        self._client = client
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(self.prefix + key)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return value
+
+    def set(self, key: str, value: str, ttl_seconds: int):
+        self._client.setex(self.prefix + key, ttl_seconds, value)
+
+    def clear(self):
+        for key in self._client.scan_iter(f"{self.prefix}*"):
+            self._client.delete(key)
+
+
+# === Cache ===
+
+class LLMResponseCache:
+    def __init__(self, backend: LLMCacheBackend, ttl_seconds: int = None):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds or settings.LLM_CACHE_TTL_SECONDS
+
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = None,
+        max_tokens: int = None
+    ) -> str:
+        normalized = _WHITESPACE.sub(" ", prompt).strip()
+        payload = json.dumps(
+            [model, temperature, max_tokens, system_prompt or "", normalized],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"[LLMCache] {self.backend.name} read failed: {e}")
+            value = None
+        llm_cache_requests.labels(result="hit" if value is not None else "miss").inc()
+        return value
+
+    def set(self, key: str, value: str):
+        try:
+            self.backend.set(key, value, self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"[LLMCache] {self.backend.name} write failed: {e}")
+
+    def clear(self):
+        self.backend.clear()
+
+
+def _build_backend(kind: str) -> Optional[LLMCacheBackend]:
+    if kind == "none":
+        return None
+    try:
+        if kind == "redis":
+            return RedisLLMCacheBackend(settings.REDIS_URL)
+        if kind == "sqlite":
+            return SQLiteLLMCacheBackend(settings.LLM_CACHE_PATH, settings.LLM_CACHE_MAX_ITEMS)
+    except Exception as e:
+        logger.warning(f"[LLMCache] '{kind}' backend unavailable, falling back to memory: {e}")
+    return MemoryLLMCacheBackend(settings.LLM_CACHE_MAX_ITEMS)
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_initialized = False
+_cache_lock = Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Process-wide response cache for the configured backend; None when LLM_CACHE_BACKEND=none.
+    """
+    global _cache, _cache_initialized
+    with _cache_lock:
+        if not _cache_initialized:
+            backend = _build_backend(settings.LLM_CACHE_BACKEND.lower())
+            _cache = LLMResponseCache(backend) if backend else None
+            _cache_initialized = True
+            if backend:
+                logger.info(f"[LLMCache] Using {backend.name} backend (ttl={settings.LLM_CACHE_TTL_SECONDS}s)")
+        return _cache
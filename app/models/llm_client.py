@@ -0,0 +1,223 @@
+"""
+LLM Client for HirefyAI
+
+One async OpenAI client per process, shared by every LLM caller:
+    - a pooled keep-alive HTTP connection (httpx.AsyncClient)
+    - a semaphore bounding in-flight requests (LLM_MAX_IN_FLIGHT)
+    - a dedicated event-loop thread, so sync callers (threadpool endpoints) and async
+      callers on any loop share the same pool and limit
+
+Usage:
+    client = get_llm_client()
+    text = await client.complete(prompt, model="gpt-4")        # async
+    text = client.complete_sync(prompt, model="gpt-4")         # blocking facade
+    async for token in client.stream(prompt, model="gpt-4"):   # token streaming
+        ...
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.base.config import settings
+
+logger = logging.getLogger("llm_client")
+
+_STREAM_END = object()
+
+
+class LLMClient:
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not self.api_key:
+            raise ValueError("OpenAI API key is missing. Set OPENAI_API_KEY environment variable.")
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-client-loop", daemon=True)
+        self._thread.start()
+        self._run(self._setup())
+        logger.info(
+            f"[LLMClient] Ready (max_in_flight={settings.LLM_MAX_IN_FLIGHT}, "
+            f"max_connections={settings.LLM_MAX_CONNECTIONS})"
+        )
+
+    async def _setup(self):
+        self._semaphore = asyncio.Semaphore(settings.LLM_MAX_IN_FLIGHT)
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_CONNECTIONS
+            ),
+            timeout=settings.LLM_TIMEOUT_SECONDS
+        )
+        self._client = AsyncOpenAI(
+            api_key=self.api_key,
+            http_client=self._http,
+            max_retries=settings.LLM_MAX_RETRIES
+        )
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    @staticmethod
+    def build_messages(prompt: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    async def _complete(self, messages: List[Dict[str, str]], model: str, temperature: float, max_tokens: int) -> str:
+        async with self._semaphore:
+            response = await self._client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+        return (response.choices[0].message.content or "").strip()
+
+    async def _stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        emit: Callable[[object], None]
+    ):
+        async with self._semaphore:
+            stream = await self._client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+            )
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        emit(chunk.choices[0].delta.content)
+            finally:
+                await stream.close()
+
+    # === Async API (usable from any event loop) ===
+
+    async def complete(
+        self,
+        prompt: str,
+        model: str = "gpt-4",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024
+    ) -> str:
+        """
+        Raises openai.OpenAIError on API failure; callers decide on fallbacks.
+        """
+        messages = self.build_messages(prompt, system_prompt)
+        future = asyncio.run_coroutine_threadsafe(
+            self._complete(messages, model, temperature, max_tokens), self._loop
+        )
+        return await asyncio.wrap_future(future)
+
+    async def complete_many(
+        self,
+        prompts: List[str],
+        model: str = "gpt-4",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024
+    ) -> List[object]:
+        """
+        Fan out concurrently (still bounded by the in-flight limit). Results keep prompt order;
+        a failed prompt yields its exception instead of a string.
+        """
+        return await asyncio.gather(
+            *[self.complete(p, model, system_prompt, temperature, max_tokens) for p in prompts],
+            return_exceptions=True
+        )
+
+    async def stream(
+        self,
+        prompt: str,
+        model: str = "gpt-4",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024
+    ) -> AsyncIterator[str]:
+        """
+        Yield completion tokens as they arrive. Closing the iterator early (e.g. the HTTP
+        client disconnected) cancels the request and frees its in-flight slot.
+        Raises openai.OpenAIError on API failure.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def emit(item: object):
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        messages = self.build_messages(prompt, system_prompt)
+        future = asyncio.run_coroutine_threadsafe(
+            self._stream(messages, model, temperature, max_tokens, emit), self._loop
+        )
+        future.add_done_callback(lambda _: emit(_STREAM_END))
+        try:
+            while (token := await queue.get()) is not _STREAM_END:
+                yield token
+            future.result()
+        finally:
+            future.cancel()
+
+    # === Sync facade ===
+
+    def complete_sync(
+        self,
+        prompt: str,
+        model: str = "gpt-4",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024
+    ) -> str:
+        messages = self.build_messages(prompt, system_prompt)
+        return self._run(self._complete(messages, model, temperature, max_tokens))
+
+    def complete_many_sync(
+        self,
+        prompts: List[str],
+        model: str = "gpt-4",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024
+    ) -> List[object]:
+        async def fan_out():
+            return await asyncio.gather(
+                *[
+                    self._complete(self.build_messages(p, system_prompt), model, temperature, max_tokens)
+                    for p in prompts
+                ],
+                return_exceptions=True
+            )
+        return self._run(fan_out())
+
+    def close(self):
+        self._run(self._http.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+_clients: Dict[str, LLMClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_llm_client(api_key: Optional[str] = None) -> LLMClient:
+    """
+    Process-wide LLMClient per API key.
+    """
+    key = api_key or os.getenv("OPENAI_API_KEY") or ""
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = LLMClient(key or None)
+        return _clients[key]
@@ -3,15 +3,14 @@ import json
 import logging
 from typing import List, Optional
 from openai import OpenAIError
-import openai
 
 from app.base.models import InterviewQuestion
+from app.models.llm_client import get_llm_client
 
 # === Logging Setup ===
 logger = logging.getLogger("prompt_templates")
 
-# === OpenAI Config ===
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# === LLM Config ===
 LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4-turbo")
 DEFAULT_LANG = "uz"
 
@@ -120,16 +119,13 @@ def generate_dynamic_questions(
 
     try:
         logger.info(f"[LLM] Generating questions in {language_name}")
-        response = openai.ChatCompletion.create(
+        raw_json = get_llm_client().complete_sync(
+            prompt,
             model=model,
-            messages=[
-                {"role": "system", "content": f"You are a multilingual structured interview generator in {language_name}."},
-                {"role": "user", "content": prompt}
-            ],
+            system_prompt=f"You are a multilingual structured interview generator in {language_name}.",
             temperature=temperature,
             max_tokens=1000
         )
-        raw_json = response.choices[0].message["content"].strip()
         parsed = json.loads(raw_json)
 
         questions = []
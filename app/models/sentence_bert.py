@@ -2,9 +2,11 @@
 
 import logging
 from typing import List, Union
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import util
 import numpy as np
 
+from app.models.embedding_loader import EmbeddingModelRegistry
+
 logger = logging.getLogger("sentence_bert")
 
 
@@ -17,7 +19,7 @@ class SentenceBERTEmbedder:
     """
     def __init__(self, model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"):
         try:
-            self.model = SentenceTransformer(model_name)
+            self.model = EmbeddingModelRegistry.get_model(model_name)
             self.name = model_name
             logger.info(f"[SentenceBERT] Loaded model: {model_name}")
         except Exception as e:
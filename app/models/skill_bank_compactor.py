@@ -0,0 +1,185 @@
+"""
+Skill Bank Compactor for HirefyAI
+
+Grows `skill_bank.json` in the background instead of inside the resume-parse request.
+
+Parses append candidate skills to an append-only pending log. A periodic daemon
+thread drains the log, drops candidates whose nearest neighbour in the bank (or in the
+same batch) is above a cosine threshold, and atomically rewrites the bank. Only new
+candidates are embedded; bank vectors come from the SkillBankIndex / embedding cache.
+
+Two file locks coordinate uvicorn workers: one serializes compaction, the other is held
+briefly by appends and by the rename that hands the log to the compactor, so no append
+lands in a file that is being drained. A drained log is deleted only after the bank write
+succeeds; leftovers from a failed run are picked up by the next one.
+"""
+
+import os
+import glob
+import json
+import time
+import fcntl
+import logging
+import threading
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.base.config import settings
+from app.models.skill_bank_index import SKILL_BANK_PATH, get_skill_bank_index
+
+logger = logging.getLogger("skill_bank_compactor")
+
+
+class SkillBankCompactor:
+    def __init__(
+        self,
+        bank_path: str = SKILL_BANK_PATH,
+        interval_seconds: float = None,
+        similarity_threshold: float = None
+    ):
+        self.bank_path = bank_path
+        self.pending_path = f"{bank_path}.pending"
+        self.lock_path = f"{bank_path}.lock"
+        self.pending_lock_path = f"{self.pending_path}.lock"
+        self.interval_seconds = interval_seconds or settings.SKILL_BANK_COMPACTION_INTERVAL_SECONDS
+        self.similarity_threshold = similarity_threshold or settings.SKILL_BANK_DEDUP_THRESHOLD
+        self.index = get_skill_bank_index(bank_path)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+
+    # === Producer side (request path) ===
+
+    def submit(self, skills: List[str]):
+        """
+        Queue candidate skills for the next compaction. O(1) append, no encoding.
+        """
+        if not skills:
+            return
+        try:
+            with self._locked(self.pending_lock_path):
+                with open(self.pending_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(skills, ensure_ascii=False) + "\n")
+        except Exception as e:
+            logger.warning(f"[SkillBankCompactor] Failed to queue skills: {e}")
+        self.start()
+
+    # === Worker ===
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="skill-bank-compactor", daemon=True)
+            self._thread.start()
+            logger.info(f"[SkillBankCompactor] Started (every {self.interval_seconds}s)")
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.compact()
+            except Exception as e:
+                logger.exception(f"[SkillBankCompactor] Compaction failed: {e}")
+
+    @staticmethod
+    @contextmanager
+    def _locked(path: str):
+        with open(path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def compact(self) -> int:
+        """
+        Drain the pending log and merge novel skills into the bank. Returns the number added.
+        """
+        with self._locked(self.lock_path):
+            drained, candidates = self._drain_pending()
+            if not candidates:
+                self._discard(drained)
+                return 0
+
+            bank = self.index.skills
+            known = {s.lower() for s in bank}
+            fresh = list(dict.fromkeys(c for c in candidates if c.lower() not in known))
+            added = self._novel(fresh) if fresh else []
+            if added:
+                self._write_bank(sorted(set(bank) | set(added)))
+            # Only now are the candidates safely in the bank (or rejected)
+            self._discard(drained)
+            logger.info(f"[SkillBankCompactor] {len(candidates)} queued → {len(added)} added")
+            return len(added)
+
+    def _drain_pending(self) -> Tuple[List[str], List[str]]:
+        """
+        Hand the pending log to the compactor and read it, along with logs left by failed runs.
+        Returns (drained files, candidates); the caller deletes the files once they're merged.
+        """
+        with self._locked(self.pending_lock_path):
+            if os.path.exists(self.pending_path):
+                os.replace(self.pending_path, f"{self.pending_path}.draining.{os.getpid()}.{time.time_ns()}")
+
+        drained = sorted(glob.glob(f"{glob.escape(self.pending_path)}.draining.*"))
+        candidates: List[str] = []
+        for path in drained:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        candidates.extend(s.strip() for s in json.loads(line) if s and s.strip())
+                    except json.JSONDecodeError:
+                        continue
+        return drained, candidates
+
+    @staticmethod
+    def _discard(paths: List[str]):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _novel(self, candidates: List[str]) -> List[str]:
+        """
+        Keep candidates whose nearest neighbour (bank or already-accepted) is below threshold.
+        """
+        nearest = self.index.top_k(candidates, k=1)
+        vectors = self.index.encoder.encode(candidates)
+
+        accepted: List[str] = []
+        accepted_vecs: List[np.ndarray] = []
+        for skill, vec, match in zip(candidates, vectors, nearest):
+            if match and match[0][1] >= self.similarity_threshold:
+                continue
+            if accepted_vecs and float(np.max(np.stack(accepted_vecs) @ vec)) >= self.similarity_threshold:
+                continue
+            accepted.append(skill)
+            accepted_vecs.append(vec)
+        return accepted
+
+    def _write_bank(self, skills: List[str]):
+        tmp_path = f"{self.bank_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(skills, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.bank_path)
+
+
+_compactor: Optional[SkillBankCompactor] = None
+_compactor_lock = threading.Lock()
+
+
+def get_skill_bank_compactor(bank_path: str = SKILL_BANK_PATH) -> SkillBankCompactor:
+    global _compactor
+    with _compactor_lock:
+        if _compactor is None:
+            _compactor = SkillBankCompactor(bank_path)
+        return _compactor
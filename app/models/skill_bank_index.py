@@ -0,0 +1,103 @@
+"""
+Skill Bank Index for HirefyAI
+
+Loads `skill_bank.json` once, keeps a normalized embedding matrix of all skills and
+answers top-k similarity queries for a batch of inputs with one matrix multiply.
+The bank is re-read and re-embedded only when the file's mtime changes.
+"""
+
+import os
+import json
+import logging
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.embedding_cache import get_cached_encoder
+
+logger = logging.getLogger("skill_bank_index")
+
+SKILL_BANK_PATH = "skill_bank.json"
+SKILL_BANK_MODEL = "all-MiniLM-L6-v2"
+
+
+class SkillBankIndex:
+    def __init__(self, path: str = SKILL_BANK_PATH, model_name: str = SKILL_BANK_MODEL):
+        self.path = path
+        self.encoder = get_cached_encoder(model_name)
+        self._skills: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._mtime: Optional[float] = None
+        self._lock = Lock()
+
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def _refresh(self) -> Tuple[List[str], Optional[np.ndarray]]:
+        """
+        Reload and re-embed the bank if the file changed; returns a consistent snapshot.
+        """
+        mtime = self._current_mtime()
+        if mtime == self._mtime:
+            return self._skills, self._matrix
+
+        with self._lock:
+            if mtime == self._mtime:
+                return self._skills, self._matrix
+
+            skills: List[str] = []
+            if mtime is not None:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        skills = json.load(f)
+                except Exception as e:
+                    logger.warning(f"[SkillBankIndex] Failed to load {self.path}: {e}")
+                    return self._skills, self._matrix
+
+            matrix = self.encoder.encode(skills) if skills else None
+            self._skills, self._matrix, self._mtime = skills, matrix, mtime
+            logger.info(f"[SkillBankIndex] Loaded {len(skills)} skills from {self.path}")
+            return skills, matrix
+
+    @property
+    def skills(self) -> List[str]:
+        return self._refresh()[0]
+
+    def top_k(self, queries: List[str], k: int = 5) -> List[List[Tuple[str, float]]]:
+        """
+        For each query, the k most similar bank skills as (skill, cosine) pairs, best first.
+        """
+        skills, matrix = self._refresh()
+        if matrix is None or not queries:
+            return [[] for _ in queries]
+
+        k = min(k, len(skills))
+        scores = self.encoder.encode(queries) @ matrix.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        return [
+            [(skills[i], float(s)) for i, s in zip(row_idx, row_scores)]
+            for row_idx, row_scores in zip(top.tolist(), top_scores.tolist())
+        ]
+
+
+_indexes: Dict[str, SkillBankIndex] = {}
+_indexes_lock = Lock()
+
+
+def get_skill_bank_index(path: str = SKILL_BANK_PATH) -> SkillBankIndex:
+    """
+    Process-wide SkillBankIndex per bank file.
+    """
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = SkillBankIndex(path)
+        return _indexes[path]
@@ -0,0 +1,73 @@
+"""
+spaCy Loader for HirefyAI
+
+Lazy, per-language registry for spaCy pipelines. Nothing is loaded at import time;
+a language's pipeline is loaded on the first document in that language and shared
+by every caller in the process. Languages mapped to the same package share one instance.
+"""
+
+import time
+import logging
+from typing import Dict, List
+from threading import Lock
+
+import spacy
+
+logger = logging.getLogger("spacy_loader")
+
+SPACY_LANGUAGE_MODELS = {
+    "en": "en_core_web_sm",
+    "ru": "ru_core_news_sm",
+    "uz": "en_core_web_sm",  # fallback
+}
+
+# Resume parsing only needs entities, noun chunks and sentences.
+SPACY_EXCLUDED_COMPONENTS = ["lemmatizer"]
+
+
+class SpacyModelRegistry:
+    """
+    Global singleton registry for spaCy pipelines, keyed by package name.
+    """
+    _instances: Dict[str, "spacy.language.Language"] = {}
+    _lock = Lock()
+
+    @classmethod
+    def supported_languages(cls) -> List[str]:
+        return list(SPACY_LANGUAGE_MODELS)
+
+    @classmethod
+    def get_model(cls, lang: str) -> "spacy.language.Language":
+        package = SPACY_LANGUAGE_MODELS.get(lang, SPACY_LANGUAGE_MODELS["en"])
+
+        nlp = cls._instances.get(package)
+        if nlp is not None:
+            return nlp
+
+        with cls._lock:
+            if package not in cls._instances:
+                logger.info(f"[SpacyLoader] Loading '{package}' for language '{lang}'")
+                try:
+                    started = time.perf_counter()
+                    cls._instances[package] = spacy.load(package, exclude=SPACY_EXCLUDED_COMPONENTS)
+                except Exception as e:
+                    logger.exception(f"[SpacyLoader] Failed to load '{package}': {e}")
+                    raise RuntimeError(f"spaCy model loading failed for '{package}'") from e
+                logger.info(f"[SpacyLoader] Loaded '{package}' in {time.perf_counter() - started:.2f}s")
+
+            return cls._instances[package]
+
+    @classmethod
+    def loaded(cls) -> List[str]:
+        return list(cls._instances)
+
+    @classmethod
+    def preload(cls, languages: List[str]):
+        """
+        Warm up pipelines for the given languages to avoid latency on first request.
+        """
+        for lang in languages:
+            try:
+                cls.get_model(lang)
+            except Exception as e:
+                logger.warning(f"[SpacyLoader] Failed to preload model '{lang}': {e}")
@@ -0,0 +1,234 @@
+"""
+Streaming ASR for HirefyAI
+
+Turns a live stream of PCM chunks into transcript events:
+    - "partial":  the current utterance decoded so far (re-decoded as audio grows)
+    - "segment":  a finished utterance (closed by a short silence or a forced cut)
+    - "endpoint": a long silence after speech, i.e. the candidate finished the answer
+
+Audio lives in a preallocated ring buffer of int16 samples; an energy VAD with an
+adaptive noise floor finds utterance boundaries. Partial decodes are overlapping windows
+over the growing utterance; utterances longer than Whisper's window are cut at the
+quietest recent frame rather than at a fixed byte offset, so words are not split.
+Finished segment text is passed to the decoder as a prompt for the next window.
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.routers.interview_bot.config import config
+
+logger = logging.getLogger("streaming_asr")
+
+# (float32 mono samples at AUDIO_SAMPLE_RATE, prompt) → (text, confidence)
+DecodeFn = Callable[[np.ndarray, Optional[str]], Tuple[str, float]]
+
+
+class PCMRingBuffer:
+    """
+    Fixed-capacity int16 ring buffer addressed by absolute sample position.
+    """
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=np.int16)
+        self.total = 0  # samples ever written
+
+    @property
+    def oldest(self) -> int:
+        return max(0, self.total - self.capacity)
+
+    def write(self, samples: np.ndarray):
+        n = len(samples)
+        if n >= self.capacity:
+            self._buffer[:] = samples[-self.capacity:]
+            self.total += n
+            # Re-align so that position `total` maps to index total % capacity.
+            self._buffer = np.roll(self._buffer, self.total % self.capacity)
+            return
+
+        start = self.total % self.capacity
+        first = min(n, self.capacity - start)
+        self._buffer[start:start + first] = samples[:first]
+        if first < n:
+            self._buffer[:n - first] = samples[first:]
+        self.total += n
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        start, end = max(start, self.oldest), min(end, self.total)
+        if end <= start:
+            return np.zeros(0, dtype=np.int16)
+        s = start % self.capacity
+        e = s + (end - start)
+        if e <= self.capacity:
+            return self._buffer[s:e].copy()
+        return np.concatenate((self._buffer[s:], self._buffer[:e - self.capacity]))
+
+
+class EnergyVAD:
+    """
+    Frame-level voice activity from RMS energy against an adaptive noise floor.
+    """
+    def __init__(self, min_rms: float, energy_ratio: float, adapt_rate: float = 0.05):
+        self.min_rms = min_rms
+        self.energy_ratio = energy_ratio
+        self.adapt_rate = adapt_rate
+        self.noise_floor: Optional[float] = None
+
+    def classify(self, frame: np.ndarray) -> Tuple[bool, float]:
+        rms = float(np.sqrt(np.mean(frame.astype(np.float32) ** 2))) if len(frame) else 0.0
+        if self.noise_floor is None:
+            self.noise_floor = rms
+        speech = rms > max(self.min_rms, self.noise_floor * self.energy_ratio)
+        if not speech:
+            self.noise_floor += self.adapt_rate * (rms - self.noise_floor)
+        return speech, rms
+
+
+class StreamingTranscriber:
+    def __init__(self, decode: DecodeFn):
+        self.decode = decode
+        self.sample_rate = config.AUDIO_SAMPLE_RATE
+        self.sample_width = config.AUDIO_SAMPLE_WIDTH
+        self.channels = config.AUDIO_CHANNELS
+
+        ms = self.sample_rate // 1000
+        self.frame = config.STREAM_VAD_FRAME_MS * ms
+        self.pre_roll = config.STREAM_PRE_ROLL_MS * ms
+        self.partial_interval = config.STREAM_PARTIAL_INTERVAL_MS * ms
+        self.max_utterance = config.STREAM_MAX_UTTERANCE_SECONDS * self.sample_rate
+        self.utterance_silence_frames = max(1, config.STREAM_UTTERANCE_SILENCE_MS // config.STREAM_VAD_FRAME_MS)
+        self.answer_silence_frames = max(1, config.STREAM_ANSWER_SILENCE_MS // config.STREAM_VAD_FRAME_MS)
+
+        self.ring = PCMRingBuffer(config.STREAM_RING_SECONDS * self.sample_rate)
+        self.vad = EnergyVAD(config.STREAM_VAD_MIN_RMS, config.STREAM_VAD_ENERGY_RATIO)
+
+        self._carry = b""                        # bytes not yet forming a whole sample frame
+        self._vad_pos = 0                        # next sample position to classify
+        self._utterance_start: Optional[int] = None
+        self._utterance_rms: List[float] = []    # per-frame RMS since utterance start
+        self._silence_frames = 0
+        self._last_partial_at = 0
+        self._answer_has_speech = False
+        self._context: List[str] = []            # finished segment text for the current answer
+
+    # === Input ===
+
+    def _to_samples(self, chunk: bytes) -> np.ndarray:
+        data = self._carry + chunk
+        frame_bytes = self.sample_width * self.channels
+        usable = len(data) - len(data) % frame_bytes
+        self._carry = data[usable:]
+
+        if self.sample_width == 1:
+            # 8-bit PCM (as in WAV) is unsigned, centred on 128
+            samples = (np.frombuffer(data[:usable], dtype=np.uint8).astype(np.float32) - 128.0) * 256.0
+        else:
+            dtype = {2: np.int16, 4: np.int32}[self.sample_width]
+            samples = np.frombuffer(data[:usable], dtype=dtype)
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1)
+        if self.sample_width == 4:
+            samples = np.clip(samples.astype(np.float32) / 65536.0, -32768.0, 32767.0)
+        return samples.astype(np.int16, copy=False)
+
+    def feed(self, chunk: bytes) -> List[Dict]:
+        """
+        Consume one chunk of raw PCM and return the transcript events it produced.
+        """
+        self.ring.write(self._to_samples(chunk))
+        events: List[Dict] = []
+
+        while self.ring.total - self._vad_pos >= self.frame:
+            frame_start = self._vad_pos
+            speech, rms = self.vad.classify(self.ring.read(frame_start, frame_start + self.frame))
+            self._vad_pos += self.frame
+
+            if speech:
+                if self._utterance_start is None:
+                    self._utterance_start = max(self.ring.oldest, frame_start - self.pre_roll)
+                    self._utterance_rms = []
+                    self._last_partial_at = frame_start
+                self._silence_frames = 0
+            else:
+                self._silence_frames += 1
+
+            if self._utterance_start is None:
+                if self._answer_has_speech and self._silence_frames >= self.answer_silence_frames:
+                    events.append(self._endpoint())
+                continue
+
+            self._utterance_rms.append(rms)
+            if self._silence_frames >= self.utterance_silence_frames:
+                trailing = (self._silence_frames - 1) * self.frame
+                events.extend(self._close_utterance(self._vad_pos - trailing))
+            elif self._vad_pos - self._utterance_start >= self.max_utterance:
+                events.extend(self._cut_utterance())
+
+        if self._utterance_start is not None and self._vad_pos - self._last_partial_at >= self.partial_interval:
+            self._last_partial_at = self._vad_pos
+            text, _ = self._decode(self._utterance_start, self._vad_pos)
+            if text:
+                events.append({"event": "partial", "text": text})
+
+        return events
+
+    def flush(self) -> List[Dict]:
+        """
+        End of stream: close any open utterance and the current answer.
+        """
+        events: List[Dict] = []
+        if self._utterance_start is not None:
+            events.extend(self._close_utterance(self.ring.total))
+        if self._answer_has_speech:
+            events.append(self._endpoint())
+        return events
+
+    # === Internals ===
+
+    def _prompt(self) -> Optional[str]:
+        if not self._context:
+            return None
+        return " ".join(self._context)[-config.STREAM_PROMPT_CHARS:]
+
+    def _decode(self, start: int, end: int) -> Tuple[str, float]:
+        audio = self.ring.read(start, end).astype(np.float32) / 32768.0
+        if not len(audio):
+            return "", 0.0
+        text, confidence = self.decode(audio, self._prompt())
+        return text.strip(), confidence
+
+    def _emit_segment(self, start: int, end: int) -> List[Dict]:
+        text, confidence = self._decode(start, end)
+        if not text:
+            return []
+        self._context.append(text)
+        self._answer_has_speech = True
+        return [{"event": "segment", "text": text, "confidence": confidence}]
+
+    def _close_utterance(self, end: int) -> List[Dict]:
+        start, self._utterance_start = self._utterance_start, None
+        self._utterance_rms = []
+        return self._emit_segment(start, end)
+
+    def _cut_utterance(self) -> List[Dict]:
+        """
+        Utterance reached the decoder's window: finish it at the quietest frame in its
+        second half and keep the remainder open.
+        """
+        first_frame = self._vad_pos - len(self._utterance_rms) * self.frame
+        half = len(self._utterance_rms) // 2
+        quietest = half + int(np.argmin(self._utterance_rms[half:]))
+        cut = first_frame + quietest * self.frame
+
+        events = self._emit_segment(self._utterance_start, cut)
+        self._utterance_start = cut
+        self._utterance_rms = self._utterance_rms[quietest:]
+        self._last_partial_at = cut
+        return events
+
+    def _endpoint(self) -> Dict:
+        self._answer_has_speech = False
+        self._context = []
+        return {"event": "endpoint"}
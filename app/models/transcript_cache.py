@@ -0,0 +1,165 @@
+"""
+Transcript Cache for HirefyAI
+
+The single cache for Whisper transcripts, replacing the per-service dicts and the
+unbounded /tmp text files. Keys are (model, language, sha256 of the audio); values keep
+the transcript and its confidence. Two tiers, both byte-budgeted with LRU eviction:
+    - in-memory OrderedDict (TRANSCRIPT_CACHE_MAX_BYTES)
+    - SQLite file shared by workers and kept across restarts (TRANSCRIPT_CACHE_DISK_MAX_BYTES)
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Tuple
+
+from app.base.config import settings
+from app.base.metrics import transcript_cache_requests
+
+logger = logging.getLogger("transcript_cache")
+
+HASH_CHUNK_BYTES = 1024 * 1024
+ENTRY_OVERHEAD_BYTES = 128  # key, tuple and float per entry, roughly
+
+
+class TranscriptCache:
+    def __init__(self, max_bytes: int = None, db_path: Optional[str] = None, disk_max_bytes: int = None):
+        self.max_bytes = max_bytes or settings.TRANSCRIPT_CACHE_MAX_BYTES
+        self.disk_max_bytes = disk_max_bytes or settings.TRANSCRIPT_CACHE_DISK_MAX_BYTES
+        self.db_path = settings.TRANSCRIPT_CACHE_PATH if db_path is None else db_path
+        self._memory: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = Lock()
+        self._conn = self._open_db() if self.db_path else None
+
+    def _open_db(self) -> Optional[sqlite3.Connection]:
+        try:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS transcripts ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, confidence REAL NOT NULL, "
+                "size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS transcripts_accessed ON transcripts (accessed_at)")
+            conn.commit()
+            logger.info(f"[TranscriptCache] Disk tier at {self.db_path}")
+            return conn
+        except Exception as e:
+            logger.warning(f"[TranscriptCache] Disk tier disabled: {e}")
+            return None
+
+    # === Keys ===
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(HASH_CHUNK_BYTES):
+                h.update(chunk)
+        return h.hexdigest()
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def make_key(model_id: str, language: Optional[str], audio_hash: str) -> str:
+        return f"{model_id}|{language or 'auto'}|{audio_hash}"
+
+    # === Access ===
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                transcript_cache_requests.labels(result="memory_hit").inc()
+                return entry[0], entry[1]
+
+            row = self._read_disk(key)
+            if row is not None:
+                self._remember(key, row[0], row[1])
+                transcript_cache_requests.labels(result="disk_hit").inc()
+                return row
+
+        transcript_cache_requests.labels(result="miss").inc()
+        return None
+
+    def put(self, key: str, text: str, confidence: float):
+        with self._lock:
+            self._remember(key, text, confidence)
+            self._write_disk(key, text, confidence)
+
+    def _remember(self, key: str, text: str, confidence: float):
+        size = len(text.encode("utf-8")) + len(key) + ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old[2]
+        self._memory[key] = (text, confidence, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_bytes:
+            _, (_, _, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted
+
+    def _read_disk(self, key: str) -> Optional[Tuple[str, float]]:
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute("SELECT text, confidence FROM transcripts WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE transcripts SET accessed_at = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+            return row
+        except Exception as e:
+            logger.warning(f"[TranscriptCache] Disk read failed: {e}")
+            return None
+
+    def _write_disk(self, key: str, text: str, confidence: float):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts (key, text, confidence, size, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, text, confidence, len(text.encode("utf-8")) + len(key), time.time())
+            )
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+            if total > self.disk_max_bytes:
+                self._trim_disk(total)
+            self._conn.commit()
+        except Exception as e:
+            logger.warning(f"[TranscriptCache] Disk write failed: {e}")
+
+    def _trim_disk(self, total: int):
+        excess = total - self.disk_max_bytes
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM transcripts ORDER BY accessed_at ASC"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM transcripts WHERE key = ?", doomed)
+        logger.info(f"[TranscriptCache] Evicted {len(doomed)} transcripts from disk tier")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"memory_items": len(self._memory), "memory_bytes": self._memory_bytes}
+
+
+_cache: Optional[TranscriptCache] = None
+_cache_lock = Lock()
+
+
+def get_transcript_cache() -> TranscriptCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TranscriptCache()
+        return _cache
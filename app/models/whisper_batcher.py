@@ -0,0 +1,117 @@
+"""
+Whisper Batcher for HirefyAI
+
+Micro-batches inference across concurrent callers of the same Whisper model. The first
+request opens a short window (WHISPER_BATCH_WINDOW_MS); every clip that arrives for the
+same model before it closes, up to WHISPER_MAX_BATCH_SIZE, is run as one batched
+forward pass and each caller gets its own result back.
+
+Callers block (they run on ASR pool threads, never on the event loop). Only clips that
+can share a forward pass are queued: those of at most 30 s with a known language. Longer
+clips, "auto"-language clips and backends without batched decoding would be decoded one
+by one anyway, so they run directly on the caller's thread instead of serializing behind
+the batcher thread.
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from queue import Queue, Empty
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.base.config import settings
+from app.base.metrics import whisper_batch_size
+from app.models.whisper_loader import WhisperModelRegistry, WHISPER_WINDOW_SAMPLES
+
+logger = logging.getLogger("whisper_batcher")
+
+# (audio, language, prompt, future)
+_Request = Tuple[np.ndarray, Optional[str], Optional[str], Future]
+
+
+class WhisperBatcher:
+    def __init__(self, model_key: str, window_ms: int = None, max_batch_size: int = None):
+        self.model_key = model_key
+        self.window_seconds = (window_ms if window_ms is not None else settings.WHISPER_BATCH_WINDOW_MS) / 1000.0
+        self.max_batch_size = max_batch_size or settings.WHISPER_MAX_BATCH_SIZE
+        self.model_wrapper = WhisperModelRegistry.get_model(model_key)
+        self._requests: "Queue[_Request]" = Queue()
+        threading.Thread(target=self._run, name=f"whisper-batcher-{model_key}", daemon=True).start()
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        language: Optional[str] = None,
+        prompt: Optional[str] = None
+    ) -> Tuple[str, List[Any]]:
+        """
+        Blocking: enqueue one clip and wait for its (text, segments) from the next batch.
+        Clips that can't be batched are transcribed right here.
+        """
+        if not self.batchable(audio, language):
+            return self.model_wrapper.transcribe(audio, language=language, initial_prompt=prompt)
+        future: Future = Future()
+        self._requests.put((audio, language, prompt, future))
+        return future.result()
+
+    def batchable(self, audio: np.ndarray, language: Optional[str]) -> bool:
+        return (
+            self.model_wrapper.batch_supported
+            and language not in (None, "auto")
+            and len(audio) <= WHISPER_WINDOW_SAMPLES
+        )
+
+    def _collect(self) -> List[_Request]:
+        batch = [self._requests.get()]
+        deadline = time.monotonic() + self.window_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._requests.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            whisper_batch_size.labels(model=self.model_key).observe(len(batch))
+
+            by_language: "OrderedDict[Optional[str], List[_Request]]" = OrderedDict()
+            for request in batch:
+                by_language.setdefault(request[1], []).append(request)
+
+            for language, requests in by_language.items():
+                try:
+                    results = self.model_wrapper.transcribe_batch(
+                        [r[0] for r in requests],
+                        language=language,
+                        initial_prompts=[r[2] for r in requests]
+                    )
+                    for request, result in zip(requests, results):
+                        request[3].set_result(result)
+                except Exception as e:
+                    logger.exception(f"[WhisperBatcher] Batch of {len(requests)} failed for '{self.model_key}': {e}")
+                    for request in requests:
+                        request[3].set_exception(e)
+
+
+_batchers: Dict[str, WhisperBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_whisper_batcher(language: Optional[str] = "auto") -> WhisperBatcher:
+    """
+    Process-wide batcher per Whisper model key.
+    """
+    key = WhisperModelRegistry.resolve_model_key(language)
+    with _batchers_lock:
+        if key not in _batchers:
+            _batchers[key] = WhisperBatcher(key)
+        return _batchers[key]
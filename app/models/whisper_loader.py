@@ -5,10 +5,15 @@ This module abstracts over OpenAI Whisper and FasterWhisper implementations.
 Supports multilingual transcription for Uzbek, Russian, English, and fallback.
 """
 
+import os
+import time
 import logging
-from typing import Optional, Union, TYPE_CHECKING, Any
+from collections import OrderedDict
+from typing import Dict, List, Optional, Union, TYPE_CHECKING, Any
 from threading import Lock
 
+import numpy as np
+
 try:
     import whisper
 except ImportError:
@@ -16,11 +21,35 @@ except ImportError:
 
 from faster_whisper import WhisperModel as FasterWhisperModel
 
+from app.base.config import settings
+from app.base.metrics import whisper_model_memory_bytes
+
 if TYPE_CHECKING:
     from whisper import Whisper
 
 logger = logging.getLogger("whisper_loader")
 
+WHISPER_SAMPLE_RATE = 16000
+WHISPER_WINDOW_SAMPLES = 30 * WHISPER_SAMPLE_RATE  # one encoder window
+WHISPER_MAX_DECODE_TOKENS = 448
+
+# Per language key: faster-whisper model (size name, CT2 repo, or HF transformers repo to
+# convert) and the openai-whisper equivalent (None if there isn't one).
+WHISPER_MODEL_SPECS: Dict[str, Dict[str, Optional[str]]] = {
+    "uz": {"faster": settings.UZBEK_MODEL, "openai": None},
+    "ru": {"faster": "large-v3", "openai": "large-v3"},
+    "en": {"faster": "medium.en", "openai": "medium.en"},
+    "auto": {"faster": "base", "openai": "base"},
+}
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
 
 class WhisperModelWrapper:
     """
@@ -29,48 +58,210 @@ class WhisperModelWrapper:
     def __init__(self, model: Union["Whisper", FasterWhisperModel, Any], backend: str):
         self.model = model
         self.backend = backend
+        self.batch_supported = self._check_batch_support()
 
-    def transcribe(self, audio_path: str, language: Optional[str] = "auto") -> tuple[str, list[Any]]:
+    def _check_batch_support(self) -> bool:
+        """
+        Batched decoding calls backend internals that aren't public API; check them once so
+        a library upgrade that moves them disables batching loudly instead of failing per batch.
+        """
         if self.backend == "openai":
-            result = self.model.transcribe(audio_path, language=language)
+            missing = [name for name in ("decode", "DecodingOptions", "log_mel_spectrogram", "pad_or_trim")
+                       if not hasattr(whisper, name)]
+        else:
+            try:
+                from faster_whisper.tokenizer import Tokenizer  # noqa: F401
+                missing = []
+            except ImportError:
+                missing = ["faster_whisper.tokenizer.Tokenizer"]
+            missing += [name for name in ("encode", "get_prompt", "hf_tokenizer", "feature_extractor", "model")
+                        if not hasattr(self.model, name)]
+            inner = getattr(self.model, "model", None)
+            missing += [f"model.{name}" for name in ("generate", "is_multilingual") if not hasattr(inner, name)]
+            if not hasattr(getattr(self.model, "feature_extractor", None), "hop_length"):
+                missing.append("feature_extractor.hop_length")
+        if missing:
+            logger.warning(
+                f"[WhisperLoader] Batched decoding disabled for the {self.backend} backend; "
+                f"missing {', '.join(missing)}"
+            )
+        return not missing
+
+    def transcribe(
+        self,
+        audio: Union[str, "np.ndarray"],
+        language: Optional[str] = "auto",
+        initial_prompt: Optional[str] = None
+    ) -> tuple[str, list[Any]]:
+        """
+        `audio` is a file path or a mono float32 array at 16 kHz. `initial_prompt` carries
+        preceding transcript text so consecutive windows decode with context.
+        """
+        language = None if language in (None, "auto") else language
+        if self.backend == "openai":
+            result = self.model.transcribe(audio, language=language, initial_prompt=initial_prompt)
             return result.get("text", ""), result.get("segments", [])
         elif self.backend == "faster":
-            segments, _ = self.model.transcribe(audio_path, language=language, beam_size=5)
+            segments, _ = self.model.transcribe(audio, language=language, beam_size=5, initial_prompt=initial_prompt)
+            segments = list(segments)
             full_text = " ".join([seg.text for seg in segments])
             return full_text, segments
         else:
             raise ValueError(f"Unsupported backend: {self.backend}")
 
+    def load_audio(self, path: str) -> "np.ndarray":
+        """
+        Decode an audio file to mono float32 at 16 kHz with the backend's own ffmpeg/av loader.
+        """
+        if self.backend == "openai":
+            return whisper.load_audio(path)
+        from faster_whisper import decode_audio
+        return decode_audio(path, sampling_rate=WHISPER_SAMPLE_RATE)
+
+    def transcribe_batch(
+        self,
+        audios: List["np.ndarray"],
+        language: Optional[str] = "auto",
+        initial_prompts: Optional[List[Optional[str]]] = None
+    ) -> List[tuple[str, list[Any]]]:
+        """
+        Transcribe several clips of up to 30 s in one batched encoder/decoder pass.
+        Longer clips, undetermined language, unsupported backend internals (see
+        `_check_batch_support`) or a backend error fall back to per-clip calls.
+        """
+        prompts = initial_prompts or [None] * len(audios)
+        lang = None if language in (None, "auto") else language
+        results: List[Optional[tuple]] = [None] * len(audios)
+
+        batchable = [i for i, a in enumerate(audios) if len(a) <= WHISPER_WINDOW_SAMPLES]
+        if self.batch_supported and lang is not None and len(batchable) > 1:
+            try:
+                decode = self._decode_batch_openai if self.backend == "openai" else self._decode_batch_faster
+                for i, result in zip(batchable, decode([audios[i] for i in batchable], lang, [prompts[i] for i in batchable])):
+                    results[i] = result
+            except Exception as e:
+                logger.warning(f"[WhisperLoader] Batched decode failed, falling back to per-clip: {e}")
+
+        return [
+            result if result is not None else self.transcribe(audio, language=language, initial_prompt=prompt)
+            for audio, prompt, result in zip(audios, prompts, results)
+        ]
+
+    def _decode_batch_openai(
+        self,
+        audios: List["np.ndarray"],
+        language: str,
+        prompts: List[Optional[str]]
+    ) -> List[tuple[str, list[Any]]]:
+        import torch
+
+        device = self.model.device
+        mel = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(a)), n_mels=self.model.dims.n_mels)
+            for a in audios
+        ]).to(device)
+
+        # DecodingOptions takes one prompt per call, so clips are grouped by prompt.
+        groups: "OrderedDict[Optional[str], List[int]]" = OrderedDict()
+        for i, prompt in enumerate(prompts):
+            groups.setdefault(prompt, []).append(i)
+
+        results: List[Optional[tuple]] = [None] * len(audios)
+        for prompt, idxs in groups.items():
+            options = whisper.DecodingOptions(
+                language=language,
+                prompt=prompt,
+                without_timestamps=True,
+                fp16=device.type == "cuda"
+            )
+            for i, decoded in zip(idxs, whisper.decode(self.model, mel[idxs], options)):
+                results[i] = (decoded.text, [{"avg_logprob": decoded.avg_logprob}])
+        return results
+
+    def _decode_batch_faster(
+        self,
+        audios: List["np.ndarray"],
+        language: str,
+        prompts: List[Optional[str]]
+    ) -> List[tuple[str, list[Any]]]:
+        from faster_whisper.tokenizer import Tokenizer
+
+        model = self.model
+        tokenizer = Tokenizer(model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language=language)
+        n_frames = WHISPER_WINDOW_SAMPLES // model.feature_extractor.hop_length
+        features = np.stack([
+            model.feature_extractor(np.pad(a, (0, WHISPER_WINDOW_SAMPLES - len(a))))[:, :n_frames]
+            for a in audios
+        ])
+        encoder_output = model.encode(features)
+
+        # CTranslate2 takes a prompt per batch item, so the whole batch decodes together.
+        previous = [tokenizer.encode(" " + p.strip()) if p else [] for p in prompts]
+        batch_prompts = [model.get_prompt(tokenizer, tokens, without_timestamps=True) for tokens in previous]
+        outputs = model.model.generate(
+            encoder_output,
+            batch_prompts,
+            beam_size=5,
+            return_scores=True,
+            max_length=WHISPER_MAX_DECODE_TOKENS
+        )
+
+        results = []
+        for output in outputs:
+            tokens = [t for t in output.sequences_ids[0] if t < tokenizer.eot]
+            results.append((tokenizer.decode(tokens), [{"avg_logprob": output.scores[0]}]))
+        return results
+
 
 class WhisperModelRegistry:
     """
     Global singleton registry for Whisper models with lazy loading and caching.
     Supports:
-        - 🇺🇿 Uzbek: aisha-org/Whisper-Uzbek (FasterWhisper)
-        - 🇷🇺 Russian: OpenAI whisper-large-v3
-        - 🇬🇧 English: OpenAI whisper-medium.en
-        - Auto fallback: OpenAI whisper-base
+        - 🇺🇿 Uzbek: aisha-org/Whisper-Uzbek (FasterWhisper, converted to CTranslate2)
+        - 🇷🇺 Russian: whisper-large-v3
+        - 🇬🇧 English: whisper-medium.en
+        - Auto fallback: whisper-base
+
+    Loading policy (settings.WHISPER_*):
+        - backend: faster-whisper by default; "openai" keeps openai-whisper where available
+        - device/compute type: int8 (or int8_float32) on CPU, float16 on CUDA
+        - CPU threads per model, e.g. WHISPER_CPU_THREADS_PER_MODEL="ru:8,uz:4"
+        - non-CT2 Hugging Face checkpoints are converted once and cached under WHISPER_CT2_CACHE_DIR
     """
     _instances: dict[str, WhisperModelWrapper] = {}
+    _stats: Dict[str, Dict[str, Any]] = {}
     _lock = Lock()
 
     @classmethod
     def get_model(cls, language: Optional[str] = "auto") -> WhisperModelWrapper:
-        key = cls._resolve_model_key(language)
+        key = cls.resolve_model_key(language)
 
         with cls._lock:
             if key not in cls._instances:
                 logger.info(f"[WhisperLoader] Loading model for language='{language}' → resolved='{key}'")
                 try:
-                    cls._instances[key] = cls._load_model_for_key(key)
+                    rss_before = _rss_bytes()
+                    started = time.perf_counter()
+                    wrapper, stats = cls._load_model_for_key(key)
+                    stats["load_seconds"] = round(time.perf_counter() - started, 3)
+                    stats["memory_bytes"] = max(0, _rss_bytes() - rss_before)
                 except Exception as e:
                     logger.exception(f"[WhisperLoader] Failed to load model for key='{key}': {e}")
                     raise RuntimeError(f"Whisper model loading failed for language='{language}'") from e
 
+                cls._instances[key] = wrapper
+                cls._stats[key] = stats
+                whisper_model_memory_bytes.labels(model=key).set(stats["memory_bytes"])
+                logger.info(
+                    f"[WhisperLoader] Loaded '{key}' ({stats['backend']}, {stats['model']}, "
+                    f"{stats['compute_type']}) in {stats['load_seconds']:.2f}s, "
+                    f"+{stats['memory_bytes'] / 1024 ** 2:.0f} MB RSS"
+                )
+
             return cls._instances[key]
 
     @staticmethod
-    def _resolve_model_key(lang: Optional[str]) -> str:
+    def resolve_model_key(lang: Optional[str]) -> str:
         if not lang:
             return "auto"
         lang = lang.lower()
@@ -83,24 +274,79 @@ class WhisperModelRegistry:
         return "auto"
 
     @staticmethod
-    def _load_model_for_key(key: str) -> WhisperModelWrapper:
-        if key == "uz":
-            model = FasterWhisperModel(
-                model_size_or_path="aisha-org/Whisper-Uzbek",
-                compute_type="float16",
-                device="cuda" if FasterWhisperModel.is_cuda_available() else "cpu"
-            )
-            return WhisperModelWrapper(model, backend="faster")
+    def _device() -> str:
+        if settings.WHISPER_DEVICE != "auto":
+            return settings.WHISPER_DEVICE
+        try:
+            import ctranslate2
+            return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        except Exception:
+            return "cpu"
 
-        if not whisper:
-            raise ImportError("OpenAI Whisper not installed")
+    @staticmethod
+    def _cpu_threads(key: str) -> int:
+        for item in settings.WHISPER_CPU_THREADS_PER_MODEL.split(","):
+            name, _, threads = item.partition(":")
+            if name.strip() == key and threads.strip().isdigit():
+                return int(threads)
+        return settings.WHISPER_CPU_THREADS
 
-        if key == "ru":
-            return WhisperModelWrapper(whisper.load_model("large-v3"), backend="openai")
-        elif key == "en":
-            return WhisperModelWrapper(whisper.load_model("medium.en"), backend="openai")
-        else:
-            return WhisperModelWrapper(whisper.load_model("base"), backend="openai")
+    @staticmethod
+    def _ct2_model_path(model_id: str, compute_type: str) -> str:
+        """
+        Size names ("base", "large-v3") and CTranslate2 repos load directly. Other Hugging Face
+        repos are plain transformers checkpoints: convert once and reuse the on-disk copy.
+        """
+        if "/" not in model_id or "faster-whisper" in model_id or os.path.isdir(model_id):
+            return model_id
+
+        quantization = "int8" if compute_type.startswith("int8") else compute_type
+        output_dir = os.path.join(settings.WHISPER_CT2_CACHE_DIR, f"{model_id.replace('/', '--')}-{quantization}")
+        if not os.path.exists(os.path.join(output_dir, "model.bin")):
+            from ctranslate2.converters import TransformersConverter
+
+            logger.info(f"[WhisperLoader] Converting '{model_id}' to CTranslate2 ({quantization}) → {output_dir}")
+            os.makedirs(settings.WHISPER_CT2_CACHE_DIR, exist_ok=True)
+            TransformersConverter(
+                model_id, copy_files=["tokenizer.json", "preprocessor_config.json"]
+            ).convert(output_dir, quantization=quantization, force=True)
+        return output_dir
+
+    @classmethod
+    def _load_model_for_key(cls, key: str) -> tuple[WhisperModelWrapper, Dict[str, Any]]:
+        spec = WHISPER_MODEL_SPECS[key]
+        device = cls._device()
+
+        if settings.WHISPER_BACKEND == "openai" and spec["openai"]:
+            if not whisper:
+                raise ImportError("OpenAI Whisper not installed")
+            model = whisper.load_model(spec["openai"], device=device)
+            stats = {"backend": "openai", "model": spec["openai"], "device": device,
+                     "compute_type": "float16" if device == "cuda" else "float32", "cpu_threads": None}
+            return WhisperModelWrapper(model, backend="openai"), stats
+
+        compute_type = settings.WHISPER_GPU_COMPUTE_TYPE if device == "cuda" else settings.WHISPER_CPU_COMPUTE_TYPE
+        cpu_threads = cls._cpu_threads(key)
+        model_path = cls._ct2_model_path(spec["faster"], compute_type)
+        model = FasterWhisperModel(
+            model_size_or_path=model_path,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=settings.WHISPER_NUM_WORKERS,
+            download_root=settings.WHISPER_CT2_CACHE_DIR
+        )
+        stats = {"backend": "faster", "model": spec["faster"], "device": device,
+                 "compute_type": compute_type, "cpu_threads": cpu_threads}
+        return WhisperModelWrapper(model, backend="faster"), stats
+
+    @classmethod
+    def memory_report(cls) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-model backend, compute type, threads, load time and RSS growth (bytes) at load.
+        """
+        with cls._lock:
+            return {key: dict(stats) for key, stats in cls._stats.items()}
 
     @classmethod
     def preload_all(cls):
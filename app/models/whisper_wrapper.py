@@ -5,18 +5,67 @@ High-level abstraction for audio transcription using Whisper and FasterWhisper.
 Supports byte stream or file input, multilingual handling, and confidence scoring.
 """
 
+import io
 import os
-import hashlib
+import wave
 import torch
 import logging
 import tempfile
-from typing import Tuple, Optional
+from typing import Any, List, Tuple, Optional
 
+import numpy as np
+
+from app.base.config import settings
 from app.models.whisper_loader import WhisperModelRegistry
+from app.models.whisper_batcher import get_whisper_batcher
+from app.models.transcript_cache import TranscriptCache, get_transcript_cache
 from app.routers.interview_bot.config import config
 
 logger = logging.getLogger("whisper_wrapper")
 
+WHISPER_SAMPLE_RATE = 16000
+
+
+def _pcm_to_float32(data: bytes, sample_width: int, channels: int) -> np.ndarray:
+    """
+    Interpret interleaved little-endian PCM as mono float32 in [-1, 1] (np.frombuffer view, one cast).
+    """
+    if sample_width == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    else:
+        dtype = {2: np.int16, 4: np.int32}[sample_width]
+        usable = len(data) - len(data) % (sample_width * channels)
+        samples = np.frombuffer(data, dtype=dtype, count=usable // sample_width).astype(np.float32)
+        samples /= float(np.iinfo(dtype).max + 1)
+    if channels > 1:
+        samples = samples[: len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+    return samples
+
+
+def decode_audio_bytes(audio_bytes: bytes, raw_pcm: bool = False) -> Optional[np.ndarray]:
+    """
+    Decode in memory when possible:
+        - PCM WAV at 16 kHz → parsed with `wave`, no ffmpeg
+        - raw_pcm=True → headerless PCM per InterviewBotConfig (rate, width, channels)
+    Returns None for everything else (mp3, aac, webm, ogg, WAV needing resampling, ...),
+    which goes through the file-based ffmpeg path. Headerless bytes are never guessed to
+    be PCM: MPEG and ADTS frames have no magic number to tell them apart.
+    """
+    head = audio_bytes[:12]
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        try:
+            with wave.open(io.BytesIO(audio_bytes)) as wav:
+                if wav.getframerate() != WHISPER_SAMPLE_RATE or wav.getcomptype() != "NONE":
+                    return None
+                frames = wav.readframes(wav.getnframes())
+                return _pcm_to_float32(frames, wav.getsampwidth(), wav.getnchannels())
+        except (wave.Error, EOFError, KeyError):
+            return None
+
+    if not raw_pcm or config.AUDIO_SAMPLE_RATE != WHISPER_SAMPLE_RATE:
+        return None
+    return _pcm_to_float32(audio_bytes, config.AUDIO_SAMPLE_WIDTH, config.AUDIO_CHANNELS)
+
 
 class WhisperTranscriber:
     def __init__(self, language: str = "auto"):
@@ -25,18 +74,14 @@ class WhisperTranscriber:
         Automatically resolves the backend and device.
         """
         self.language = language
+        self.model_key = WhisperModelRegistry.resolve_model_key(language)
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.model_wrapper = WhisperModelRegistry.get_model(language=language)
+        self.cache = get_transcript_cache()
 
-    def _compute_checksum(self, file_path: str) -> str:
-        """
-        Calculate a SHA256 hash of the audio file to avoid redundant work.
-        """
-        h = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            while chunk := f.read(8192):
-                h.update(chunk)
-        return h.hexdigest()
+        # Cache keys are per model build, so a backend or compute-type switch never serves stale text.
+        stats = WhisperModelRegistry.memory_report().get(self.model_key, {})
+        self.model_id = ":".join([self.model_key] + [str(stats.get(k) or "") for k in ("backend", "model", "compute_type")])
 
     def transcribe(self, file_path: str, language: Optional[str] = None) -> Tuple[str, float]:
         """
@@ -52,49 +97,102 @@ class WhisperTranscriber:
         lang = language or self.language or "auto"
         try:
             logger.info(f"[WhisperTranscriber] Transcribing {file_path} | lang={lang}")
-            checksum = self._compute_checksum(file_path)
-            cache_path = f"/tmp/whisper_cache/{checksum}.txt"
-
-            # Check cache
-            if os.path.exists(cache_path):
+            cache_key = TranscriptCache.make_key(self.model_id, lang, TranscriptCache.hash_file(file_path))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
                 logger.info(f"[WhisperTranscriber] Using cached result for {file_path}")
-                with open(cache_path, "r", encoding="utf-8") as f:
-                    return f.read(), 1.0
+                return cached
 
-            text, segments = self.model_wrapper.transcribe(file_path, language=lang)
-            confidences = []
+            audio = self.model_wrapper.load_audio(file_path)
+            text, segments = self._infer(audio, lang)
+            avg_conf = self._average_confidence(segments)
+            if text:
+                self.cache.put(cache_key, text, avg_conf)
 
-            for segment in segments:
-                if hasattr(segment, "avg_logprob"):
-                    confidence = min(1.0, max(0.0, 1.0 + float(segment.avg_logprob)))
-                else:
-                    confidence = 1.0
-                confidences.append(confidence)
+            return text, avg_conf
 
-            avg_conf = round(sum(confidences) / len(confidences), 3) if confidences else 0.0
+        except Exception as e:
+            logger.exception(f"[WhisperTranscriber] Error during transcription: {e}")
+            return "", 0.0
 
-            os.makedirs("/tmp/whisper_cache", exist_ok=True)
-            with open(cache_path, "w", encoding="utf-8") as f:
-                f.write(text)
+    def _infer(self, audio: np.ndarray, language: str, prompt: Optional[str] = None) -> Tuple[str, List[Any]]:
+        """
+        Route through the model's micro-batcher (shared with concurrent sessions) unless disabled.
+        """
+        if settings.WHISPER_BATCH_WINDOW_MS > 0:
+            return get_whisper_batcher(self.model_key).transcribe(audio, language=language, prompt=prompt)
+        return self.model_wrapper.transcribe(audio, language=language, initial_prompt=prompt)
+
+    @staticmethod
+    def _average_confidence(segments: List[Any]) -> float:
+        confidences = []
+        for segment in segments:
+            logprob = segment.get("avg_logprob") if isinstance(segment, dict) else getattr(segment, "avg_logprob", None)
+            confidences.append(1.0 if logprob is None else min(1.0, max(0.0, 1.0 + float(logprob))))
+        return round(sum(confidences) / len(confidences), 3) if confidences else 0.0
+
+    def transcribe_array(
+        self,
+        audio: np.ndarray,
+        language: Optional[str] = None,
+        prompt: Optional[str] = None
+    ) -> Tuple[str, float]:
+        """
+        Transcribe in-memory mono float32 samples at 16 kHz without touching disk.
 
-            return text, avg_conf
+        Args:
+            audio: Samples in [-1, 1]
+            language: Optional language override
+            prompt: Preceding transcript text used as decoding context
 
+        Returns:
+            (transcript_text, average_confidence)
+        """
+        lang = language or self.language or "auto"
+        try:
+            text, segments = self._infer(audio, lang, prompt)
+            return text.strip(), self._average_confidence(segments)
         except Exception as e:
-            logger.exception(f"[WhisperTranscriber] Error during transcription: {e}")
+            logger.exception(f"[WhisperTranscriber] Error during array transcription: {e}")
             return "", 0.0
 
-    def transcribe_from_bytes(self, audio_bytes: bytes, language: Optional[str] = None) -> Tuple[str, float]:
+    def transcribe_from_bytes(
+        self,
+        audio_bytes: bytes,
+        language: Optional[str] = None,
+        raw_pcm: bool = False
+    ) -> Tuple[str, float]:
         """
-        Transcribe audio directly from byte stream using a temporary file.
+        Transcribe audio from a byte stream. 16 kHz PCM WAV, and raw PCM when the caller
+        says so, are decoded in memory and handed to the model as an array; everything
+        else (webm, ogg, mp3, ...) is spilled to a temporary file for ffmpeg.
 
         Args:
-            audio_bytes: Raw audio file as bytes
+            audio_bytes: An encoded audio file, or headerless PCM samples if raw_pcm
             language: Optional language override
+            raw_pcm: Bytes are headerless PCM in the InterviewBotConfig format
 
         Returns:
             (transcript_text, average_confidence)
         """
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
+        audio = decode_audio_bytes(audio_bytes, raw_pcm=raw_pcm)
+        if audio is None:
+            return self._transcribe_via_file(audio_bytes, language)
+
+        lang = language or self.language or "auto"
+        cache_key = TranscriptCache.make_key(self.model_id, lang, TranscriptCache.hash_bytes(audio_bytes))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info("[WhisperTranscriber] Using cached result for byte stream")
+            return cached
+
+        text, confidence = self.transcribe_array(audio, language=lang)
+        if text:
+            self.cache.put(cache_key, text, confidence)
+        return text, confidence
+
+    def _transcribe_via_file(self, audio_bytes: bytes, language: Optional[str] = None) -> Tuple[str, float]:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".audio") as tmp_file:
             tmp_file.write(audio_bytes)
             tmp_path = tmp_file.name
 
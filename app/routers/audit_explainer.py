@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field, validator
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Literal
 import logging
 
 from app.services.audit_explainer_service import AuditExplainerService
+from app.base.config import settings
 
 router = APIRouter(tags=["Audit & Explainability"])
 logger = logging.getLogger("audit_explainer")
@@ -22,6 +23,7 @@ class ScoringContext(BaseModel):
     final_score: float = Field(..., ge=0.0, le=1.0)
     override_weights: Optional[Dict[str, float]] = Field(None, example={"semantic_score": 0.4})
     language: Optional[str] = Field("en", example="en")
+    explain_mode: Optional[Literal["linear", "shap"]] = Field(None, description="Defaults to AUDIT_EXPLAIN_MODE")
 
     @validator("override_weights")
     def validate_weights(cls, v):
@@ -40,7 +42,12 @@ class AuditExplanation(BaseModel):
     summary: Optional[str] = Field(None, description="Natural language summary of explanation")
 
 
-# === Endpoint ===
+class BatchExplainRequest(BaseModel):
+    contexts: List[ScoringContext] = Field(..., min_items=1)
+    explain_mode: Optional[Literal["linear", "shap"]] = Field(None, description="Defaults to AUDIT_EXPLAIN_MODE")
+
+
+# === Endpoints ===
 
 @router.post(
     "/audit/explain_score",
@@ -51,8 +58,31 @@ class AuditExplanation(BaseModel):
 def explain_candidate_score(context: ScoringContext):
     try:
         logger.info(f"[Audit] Explaining score for candidate={context.candidate_id} job={context.job_id}")
-        result = audit_service.explain_score(context.dict())
-        return AuditExplanation(**result)
+        result = audit_service.explain_score(context.dict(), mode=context.explain_mode)
+        return AuditExplanation(**result.dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.exception(f"[Audit] Failed to generate explanation for {context.candidate_id}")
         raise HTTPException(status_code=500, detail=f"Failed to explain score: {str(e)}")
+
+
+@router.post(
+    "/audit/explain_batch",
+    response_model=List[AuditExplanation],
+    summary="Explain Many Scoring Decisions",
+    description="Explains up to AUDIT_BATCH_MAX_ITEMS candidates in one call; results keep input order. "
+                "An item's own explain_mode overrides the batch-level one."
+)
+def explain_candidate_scores(request: BatchExplainRequest):
+    if len(request.contexts) > settings.AUDIT_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many items (>{settings.AUDIT_BATCH_MAX_ITEMS})")
+    try:
+        logger.info(f"[Audit] Explaining batch of {len(request.contexts)} scores")
+        results = audit_service.explain_batch([c.dict() for c in request.contexts], mode=request.explain_mode)
+        return [AuditExplanation(**r.dict()) for r in results]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception("[Audit] Failed to generate batch explanation")
+        raise HTTPException(status_code=500, detail=f"Failed to explain scores: {str(e)}")
@@ -5,6 +5,8 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict
 
 from app.services.copilot_service import CopilotService
+from app.base.models import CopilotRequest, CopilotResponse as CopilotContentResponse
+from app.base.utils.sse import stream_tokens
 
 router = APIRouter(tags=["Copilot Service"])
 copilot = CopilotService()
@@ -67,3 +69,30 @@ def generate_offer_letter(req: OfferLetterRequest):
         return CopilotResponse(result=letter)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/copilot/generate", response_model=CopilotContentResponse, summary="Generate Copilot Content")
+def generate_content(req: CopilotRequest):
+    try:
+        return copilot.generate(req)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/copilot/generate/stream", summary="Generate Copilot Content (Server-Sent Events)")
+def generate_content_stream(req: CopilotRequest):
+    """
+    Streams `token` events as the LLM writes, then a `done` event with the full content.
+    Closing the connection cancels the generation.
+    """
+    try:
+        tokens, tags = copilot.generate_stream(req)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return stream_tokens(
+        tokens,
+        on_done=lambda content: {
+            "type": req.type,
+            "language": req.language or "en",
+            "tags": tags,
+            "model_used": req.model or "gpt-4-turbo",
+        }
+    )
@@ -13,9 +13,25 @@ class InterviewBotConfig(BaseSettings):
     # === Buffer Size in Bytes ===
     AUDIO_BUFFER_BYTES: int = None
 
+    # === Streaming ASR (ring buffer + VAD) ===
+    STREAM_RING_SECONDS: int = 60  # audio history kept per session
+    STREAM_VAD_FRAME_MS: int = 30
+    STREAM_VAD_MIN_RMS: float = 300.0  # int16 RMS below this is never speech
+    STREAM_VAD_ENERGY_RATIO: float = 3.0  # speech if RMS > noise floor * ratio
+    STREAM_PRE_ROLL_MS: int = 200  # audio kept before detected speech onset
+    STREAM_UTTERANCE_SILENCE_MS: int = 600  # silence that closes an utterance
+    STREAM_ANSWER_SILENCE_MS: int = 2500  # silence that closes an answer
+    STREAM_PARTIAL_INTERVAL_MS: int = 1000  # new audio between partial decodes
+    STREAM_MAX_UTTERANCE_SECONDS: int = 25  # force a cut (at the quietest frame) before Whisper's 30 s window
+    STREAM_PROMPT_CHARS: int = 200  # preceding transcript passed as decoding context
+    STREAM_MAX_PENDING_SECONDS: int = 10  # audio held while the ASR pool pushes back; oldest dropped beyond
+
     # === Streaming Timeouts ===
     STREAMING_TIMEOUT_SECONDS: int = int(os.getenv("STREAMING_TIMEOUT_SECONDS", 120))
     MAX_STREAM_DURATION_MINUTES: int = int(os.getenv("MAX_STREAM_DURATION_MINUTES", 15))
+    MAX_CONCURRENT_STREAM_SESSIONS: int = int(os.getenv("MAX_CONCURRENT_STREAM_SESSIONS", 32))  # per worker
+    STREAM_REAP_INTERVAL_SECONDS: int = 30  # how often idle/overlong sessions are evicted
+    MAX_STREAM_SESSION_BUFFER_BYTES: int = int(os.getenv("MAX_STREAM_SESSION_BUFFER_BYTES", 8 * 1024 * 1024))  # evicted beyond
 
     # === Multilingual LLM Configuration ===
     DEFAULT_LANGUAGE: str = os.getenv("DEFAULT_LANGUAGE", "uz")  # Default to Uzbek
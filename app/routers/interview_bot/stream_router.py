@@ -1,43 +1,71 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
-from typing import Dict
-import uuid
+import time
 import logging
 import asyncio
 
-from app.services.interview_stream_service import InterviewStreamService
+from app.services.interview_stream_service import InterviewStreamService, SessionLimitError
+from app.services.asr_worker_pool import ASRBackpressureError
+from app.routers.interview_bot.config import config
 from app.base.models import StreamInterviewConfig
 
 router = APIRouter(prefix="/interview_stream", tags=["Interview Bot - Real-Time"])
 logger = logging.getLogger("interview_stream")
 
-# In-memory session manager
-active_sessions: Dict[str, InterviewStreamService] = {}
+# Process-wide session registry (limits, idle reaping, shared models)
+stream_service = InterviewStreamService()
 
 @router.websocket("/ws/{session_id}")
 async def interview_websocket(websocket: WebSocket, session_id: str):
     await websocket.accept()
     logger.info(f"[InterviewStream] 📞 New WebSocket session: {session_id}")
-
-    stream_handler = InterviewStreamService()
-    active_sessions[session_id] = stream_handler
+    session = None  # only a session this socket started is ended in `finally`
 
     try:
         # Step 1: Receive config
-        config_data = await websocket.receive_json()
+        config_data = await asyncio.wait_for(websocket.receive_json(), timeout=config.STREAMING_TIMEOUT_SECONDS)
         interview_config = StreamInterviewConfig(**config_data)
-        session = stream_handler.start_session(interview_config)
+        session = stream_service.start_session(session_id, interview_config)
         logger.info(f"[InterviewStream] Configured session for {interview_config.candidate_id}")
+        deadline = time.monotonic() + config.MAX_STREAM_DURATION_MINUTES * 60
 
         # Step 2: Receive and process audio chunks
         while True:
+            if not stream_service.is_current(session_id, session):
+                logger.warning(f"[InterviewStream] Session superseded or expired: {session_id}")
+                await websocket.send_json({"event": "session_closed"})
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"[InterviewStream] Max duration reached: {session_id}")
+                await websocket.send_json({"event": "time_limit"})
+                break
             try:
-                chunk = await asyncio.wait_for(websocket.receive_bytes(), timeout=30)
+                chunk = await asyncio.wait_for(
+                    websocket.receive_bytes(), timeout=min(config.STREAMING_TIMEOUT_SECONDS, remaining)
+                )
             except asyncio.TimeoutError:
+                if time.monotonic() >= deadline:
+                    continue
                 logger.warning(f"[InterviewStream] Timeout waiting for chunk: {session_id}")
                 break
 
-            answer = await session.handle_stream_chunk(chunk)
+            try:
+                answer = await session.handle_stream_chunk(chunk)
+            except ASRBackpressureError:
+                # Chunk is buffered in the session; ask the client to slow down.
+                await websocket.send_json({"event": "backpressure"})
+                continue
+            finally:
+                if stream_service.is_current(session_id, session):
+                    stream_service.record_usage(session_id)
+
+            # Intermediate transcript of the answer in progress (for frontend UX)
+            partial = session.pop_partial_transcript()
+            if partial:
+                await websocket.send_json({
+                    "event": "partial_transcript",
+                    "text": partial
+                })
 
             if answer:
                 # Once complete response scored → notify frontend
@@ -46,20 +74,24 @@ async def interview_websocket(websocket: WebSocket, session_id: str):
                     "answer": answer.dict()
                 })
 
-            # (Optional) Intermediate transcript (for frontend UX)
-            # await websocket.send_json({
-            #     "event": "partial_transcript",
-            #     "text": "..."  # from stream_handler if partial decode supported
-            # })
+            # Running skills and summary, updated as each answer is digested
+            update = session.pop_session_update()
+            if update:
+                await websocket.send_json({"event": "session_update", **update})
 
     except WebSocketDisconnect:
         logger.info(f"[InterviewStream] 🚫 Client disconnected: {session_id}")
+    except asyncio.TimeoutError:
+        logger.warning(f"[InterviewStream] No config received: {session_id}")
+    except SessionLimitError as e:
+        logger.warning(f"[InterviewStream] Rejected {session_id}: {e}")
+        await websocket.send_json({"event": "error", "message": str(e)})
     except Exception as e:
         logger.exception(f"[InterviewStream] ❌ Error in session {session_id}: {e}")
         await websocket.send_json({"event": "error", "message": str(e)})
     finally:
         try:
-            result = stream_handler.end_session(interview_config.candidate_id)
+            result = await stream_service.end_session(session_id, session) if session else None
             if result:
                 await websocket.send_json({
                     "event": "complete",
@@ -68,4 +100,3 @@ async def interview_websocket(websocket: WebSocket, session_id: str):
         except Exception as e:
             logger.warning(f"[InterviewStream] Finalization failed for {session_id}: {e}")
         await websocket.close()
-        active_sessions.pop(session_id, None)
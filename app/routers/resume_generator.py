@@ -7,6 +7,7 @@ import logging
 
 from app.services.resume_generator_service import ResumeGeneratorService
 from app.base.models import ResumeGenerationResult
+from app.base.utils.sse import stream_tokens
 
 router = APIRouter(tags=["Resume Generator"])
 logger = logging.getLogger("resume_generator")
@@ -70,3 +71,17 @@ def generate_resume(request: ResumeGenRequest):
     except Exception as e:
         logger.exception(f"[ResumeGen] Unexpected error during generation: {e}")
         raise HTTPException(status_code=500, detail="Resume generation failed. Please try again later.")
+
+
+@router.post("/resume_generator/generate/stream")
+def generate_resume_stream(request: ResumeGenRequest):
+    """
+    Same input as /resume_generator/generate, streamed as Server-Sent Events: `token`
+    events while the resume is written, then `done` with the full text. Closing the
+    connection cancels the generation.
+    """
+    logger.info(f"[ResumeGen] Start streaming resume generation for: {request.name}")
+    return stream_tokens(
+        resume_gen_service.generate_resume_stream(request),
+        on_done=lambda resume: {"name": request.name, "language": request.language or "en"}
+    )
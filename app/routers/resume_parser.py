@@ -1,16 +1,23 @@
 # app/routers/resume_parser.py
 
+import io
 import os
+import json
 import uuid
 import time
+import shutil
 import logging
-from typing import Dict
+import zipfile
+from contextlib import closing
+from typing import Dict, List
 
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.services.resume_parser_service import ResumeParserService
 from app.base.models import ParsedResume
+from app.base.config import settings
 
 router = APIRouter(tags=["Resume Parser"])
 logger = logging.getLogger("resume_parser")
@@ -47,8 +54,10 @@ async def parse_resume(file: UploadFile = File(...)) -> ParsedResume:
 
         logger.info(f"[ResumeParser] File={file.filename}, Size={file_size_mb:.2f}MB, Type={ext}")
 
-        parsed_data: Dict = parser_service.parse_resume(tmp_path)
-        os.remove(tmp_path)
+        try:
+            parsed_data: Dict = await run_in_threadpool(parser_service.parse_resume, tmp_path)
+        finally:
+            os.remove(tmp_path)
 
         duration = time.time() - start_time
         logger.info(f"[ResumeParser] Parsed successfully in {duration:.2f}s")
@@ -60,3 +69,71 @@ async def parse_resume(file: UploadFile = File(...)) -> ParsedResume:
     except Exception as e:
         logger.exception(f"[ResumeParser] Failed to parse {file.filename}: {e}")
         raise HTTPException(status_code=500, detail="Resume parsing failed. Please try another file.")
+
+
+def _stage_upload(filename: str, contents: bytes, batch_dir: str, staged: Dict[str, str]):
+    """
+    Write one upload (or every resume inside a zip) into batch_dir; maps tmp path → original name.
+    """
+    ext = filename.split(".")[-1].lower()
+    if ext == "zip":
+        with zipfile.ZipFile(io.BytesIO(contents)) as archive:
+            for member in archive.infolist():
+                member_ext = member.filename.split(".")[-1].lower()
+                if member.is_dir() or member_ext not in ALLOWED_EXTENSIONS:
+                    continue
+                if member.file_size > MAX_FILE_SIZE_MB * 1024 * 1024:
+                    logger.warning(f"[ResumeParser] Skipping oversized archive member {member.filename}")
+                    continue
+                _stage_upload(member.filename, archive.read(member), batch_dir, staged)
+        return
+
+    if ext not in ALLOWED_EXTENSIONS or len(contents) > MAX_FILE_SIZE_MB * 1024 * 1024:
+        logger.warning(f"[ResumeParser] Skipping unsupported or oversized file {filename}")
+        return
+
+    tmp_path = os.path.join(batch_dir, f"{uuid.uuid4()}.{ext}")
+    with open(tmp_path, "wb") as f:
+        f.write(contents)
+    staged[tmp_path] = filename
+
+
+@router.post("/resume_parser/parse_batch")
+async def parse_resume_batch(files: List[UploadFile] = File(...)) -> StreamingResponse:
+    """
+    Upload many resume files and/or zip archives. Streams one NDJSON line per file
+    ({"file", "result"} or {"file", "error"}) as each finishes parsing.
+    """
+    batch_dir = os.path.join(TMP_DIR, f"batch_{uuid.uuid4()}")
+    os.makedirs(batch_dir, exist_ok=True)
+    staged: Dict[str, str] = {}
+
+    try:
+        for upload in files:
+            contents = await upload.read()
+            await run_in_threadpool(_stage_upload, upload.filename, contents, batch_dir, staged)
+    except zipfile.BadZipFile:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail="Invalid zip archive")
+
+    if not staged:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail="No supported resume files found")
+    if len(staged) > settings.RESUME_BATCH_MAX_FILES:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail=f"Too many files (>{settings.RESUME_BATCH_MAX_FILES})")
+
+    logger.info(f"[ResumeParser] Batch of {len(staged)} files staged in {batch_dir}")
+
+    def stream():
+        # closing(): on client disconnect the batch stops its pool work before the files go
+        try:
+            with closing(parser_service.parse_resumes_batch(list(staged))) as results:
+                for item in results:
+                    item["file"] = staged.get(item["file"], item["file"])
+                    yield json.dumps(item, ensure_ascii=False, default=str) + "\n"
+        finally:
+            shutil.rmtree(batch_dir, ignore_errors=True)
+
+    # Sync generators are iterated in Starlette's threadpool, keeping the event loop free.
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -0,0 +1,134 @@
+"""
+ASR Worker Pool for HirefyAI
+
+Runs blocking Whisper work off the event loop. Each Whisper model gets its own lane:
+    - a fixed set of worker threads (model weights are shared, not copied per process)
+    - a bounded pending queue; a full lane raises ASRBackpressureError instead of
+      letting latency grow without limit. One session may hold at most a quarter of
+      the slots, so a batch can't lock live sessions out of the queue
+    - round-robin scheduling across sessions, so one session submitting many jobs
+      (e.g. a batch interview) cannot starve live websocket sessions
+
+Async handlers just `await get_asr_pool().run(model_key, session_id, fn, *args)`.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, Tuple
+
+from app.base.config import settings
+from app.base.metrics import asr_queue_depth, asr_backpressure_total
+
+logger = logging.getLogger("asr_worker_pool")
+
+BACKPRESSURE_RETRY_SECONDS = 0.05
+
+_Job = Tuple[Callable[..., Any], tuple, Future]
+
+
+class ASRBackpressureError(RuntimeError):
+    """
+    The model's lane is full; the caller should slow down or retry.
+    """
+
+
+class _ModelLane:
+    def __init__(self, model_key: str, workers: int, max_pending: int):
+        self.model_key = model_key
+        self.max_pending = max_pending
+        self.max_pending_per_session = max(1, max_pending // 4)
+        self._queues: "OrderedDict[str, Deque[_Job]]" = OrderedDict()
+        self._pending = 0
+        self._cond = threading.Condition()
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f"asr-{model_key}-{i}", daemon=True).start()
+
+    def submit(self, session_id: str, fn: Callable[..., Any], args: tuple) -> Future:
+        future: Future = Future()
+        with self._cond:
+            session_pending = len(self._queues.get(session_id, ()))
+            if self._pending >= self.max_pending or session_pending >= self.max_pending_per_session:
+                asr_backpressure_total.labels(model=self.model_key).inc()
+                raise ASRBackpressureError(f"ASR queue for '{self.model_key}' is full ({self._pending} pending)")
+            self._queues.setdefault(session_id, deque()).append((fn, args, future))
+            self._pending += 1
+            asr_queue_depth.labels(model=self.model_key).set(self._pending)
+            self._cond.notify()
+        return future
+
+    def _next_job(self) -> _Job:
+        """
+        Take the head job of the least recently served session. Caller holds the lock.
+        """
+        session_id, queue = next(iter(self._queues.items()))
+        job = queue.popleft()
+        if queue:
+            self._queues.move_to_end(session_id)
+        else:
+            del self._queues[session_id]
+        self._pending -= 1
+        asr_queue_depth.labels(model=self.model_key).set(self._pending)
+        return job
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._queues:
+                    self._cond.wait()
+                fn, args, future = self._next_job()
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+class ASRWorkerPool:
+    def __init__(self, workers_per_model: int = None, max_pending_per_model: int = None):
+        self.workers_per_model = workers_per_model or settings.ASR_WORKERS_PER_MODEL
+        self.max_pending_per_model = max_pending_per_model or settings.ASR_MAX_PENDING_PER_MODEL
+        self._lanes: Dict[str, _ModelLane] = {}
+        self._lock = threading.Lock()
+
+    def _lane(self, model_key: str) -> _ModelLane:
+        with self._lock:
+            if model_key not in self._lanes:
+                logger.info(
+                    f"[ASRPool] New lane '{model_key}' "
+                    f"(workers={self.workers_per_model}, max_pending={self.max_pending_per_model})"
+                )
+                self._lanes[model_key] = _ModelLane(model_key, self.workers_per_model, self.max_pending_per_model)
+            return self._lanes[model_key]
+
+    async def run(self, model_key: str, session_id: str, fn: Callable[..., Any], *args, wait: bool = False) -> Any:
+        """
+        Run `fn(*args)` on the model's lane. Raises ASRBackpressureError when the lane is
+        full, unless `wait=True`, in which case it retries until a slot frees up.
+        """
+        lane = self._lane(model_key)
+        while True:
+            try:
+                future = lane.submit(session_id, fn, args)
+                break
+            except ASRBackpressureError:
+                if not wait:
+                    raise
+                await asyncio.sleep(BACKPRESSURE_RETRY_SECONDS)
+        return await asyncio.wrap_future(future)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_asr_pool() -> ASRWorkerPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ASRWorkerPool()
+        return _pool
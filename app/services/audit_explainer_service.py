@@ -1,74 +1,170 @@
 import logging
-from typing import Dict
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
 
-import shap
-import pandas as pd
 import numpy as np
 
-from base.scoring_utils import compute_final_score
+try:
+    import shap
+except ImportError:
+    shap = None
+
+from app.base.config import settings
 from app.base.models import AuditExplanationResult
+from app.base.scoring_utils import DEFAULT_WEIGHTS
 
 logger = logging.getLogger("audit_explainer_service")
 
+FEATURE_COLS = ["semantic_score", "skill_overlap", "psychometric_score", "fairness_score"]
+# Feature column → weight key used by compute_final_score
+WEIGHT_KEYS = {
+    "semantic_score": "semantic",
+    "skill_overlap": "skill_overlap",
+    "psychometric_score": "psychometric",
+    "fairness_score": "fairness",
+}
+FEATURE_DEFAULTS = {"semantic_score": 0.0, "skill_overlap": 0.0, "psychometric_score": 0.5, "fairness_score": 0.5}
+MAX_CACHED_EXPLAINERS = 32
+EXPLAIN_MODES = ("linear", "shap")
+
 
 class AuditExplainerService:
-    def __init__(self):
-        """Initialize SHAP explainer with a dummy model."""
-        self.model = self._wrap_model()
-
-    def _wrap_model(self):
-        def model_fn(X: pd.DataFrame) -> np.ndarray:
-            return np.array([
-                compute_final_score(
-                    semantic_score=row.get("semantic_score", 0),
-                    skill_overlap=row.get("skill_overlap", 0),
-                    psychometric_score=row.get("psychometric_score", 0.5),
-                    fairness_adjusted_score=row.get("fairness_score", 0.5)
-                )
-                for _, row in X.iterrows()
-            ])
-        return model_fn
+    """
+    Explains final scores, which are a known linear combination of four features.
+
+    - "linear" (default): exact attributions in closed form, contribution_i = w_i * x_i,
+      so the contributions sum to the computed score. One matrix product per batch.
+    - "shap": opt-in, for when the scorer stops being linear. Values are relative to the
+      mean score over a fixed background sample; the explainer and background are built
+      once per weight vector and reused (LRU, MAX_CACHED_EXPLAINERS).
+    """
+    def __init__(self, mode: str = None):
+        self.mode = self.resolve_mode(mode or settings.AUDIT_EXPLAIN_MODE)
+        self._explainers: "OrderedDict[Tuple[float, ...], object]" = OrderedDict()
+        self._background: Optional[np.ndarray] = None
+        self._lock = Lock()
 
-    def explain_score(self, context: Dict) -> AuditExplanationResult:
+    # === Public API ===
+
+    @staticmethod
+    def resolve_mode(mode: str) -> str:
         """
-        Generate SHAP-based explanation for a final score decision.
+        Normalized explain mode; ValueError if unknown or if "shap" is asked for without shap installed.
         """
-        try:
-            candidate_id = context.get("candidate_id", "unknown")
-            logger.info(f"[AuditExplainer] Explaining score for candidate {candidate_id}")
+        mode = mode.lower()
+        if mode not in EXPLAIN_MODES:
+            raise ValueError(f"Unknown explain mode '{mode}' (expected one of {', '.join(EXPLAIN_MODES)})")
+        if mode == "shap" and not shap:
+            raise ValueError("Explain mode 'shap' requires the shap package, which is not installed")
+        return mode
 
-            feature_cols = ["semantic_score", "skill_overlap", "psychometric_score", "fairness_score"]
-            features = {k: float(context.get(k, 0.0)) for k in feature_cols}
-            df = pd.DataFrame([features])
+    def explain_score(self, context: Dict, mode: Optional[str] = None) -> AuditExplanationResult:
+        """
+        Explain a single final score decision.
+        """
+        candidate_id = context.get("candidate_id", "unknown")
+        logger.info(f"[AuditExplainer] Explaining score for candidate {candidate_id}")
+        return self.explain_batch([context], mode=mode)[0]
 
-            explainer = shap.Explainer(self.model, df)
-            shap_values = explainer(df)
+    def explain_batch(self, contexts: List[Dict], mode: Optional[str] = None) -> List[AuditExplanationResult]:
+        """
+        Explain many decisions at once. A context's own "explain_mode" overrides `mode`;
+        rows sharing a mode and weight vector are attributed together. Raises ValueError
+        for an unusable mode before any work is done.
+        """
+        default_mode = self.resolve_mode(mode) if mode else self.mode
+        modes = [
+            self.resolve_mode(c["explain_mode"]) if c.get("explain_mode") else default_mode
+            for c in contexts
+        ]
+        if not contexts:
+            return []
+        try:
+            X = np.array(
+                [[float(c.get(f, FEATURE_DEFAULTS[f]) or 0.0) for f in FEATURE_COLS] for c in contexts],
+                dtype=np.float64
+            )
+            contributions = np.empty_like(X)
 
-            top_features = self._extract_top_contributors(shap_values[0], df.columns)
-            summary = self._summarize(top_features)
+            groups: Dict[Tuple[str, Tuple[float, ...]], List[int]] = {}
+            for i, context in enumerate(contexts):
+                groups.setdefault((modes[i], self._weight_vector(context.get("override_weights"))), []).append(i)
 
-            return AuditExplanationResult(
-                final_score=round(context.get("final_score", 0.0), 4),
-                explanation=top_features,
-                top_contributors=list(top_features.keys())[:3],
-                fairness_flags=None,
-                summary=summary
-            )
+            for (row_mode, weights), rows in groups.items():
+                w = np.array(weights)
+                if row_mode == "shap":
+                    contributions[rows] = self._shap_values(w, X[rows])
+                else:
+                    contributions[rows] = X[rows] * w
+
+            logger.info(f"[AuditExplainer] Explained {len(contexts)} scores ({len(groups)} mode/weight sets)")
+            return self._results(contexts, contributions)
 
         except Exception as e:
-            logger.exception("[AuditExplainer] Explanation failed")
-            return AuditExplanationResult(
-                final_score=context.get("final_score", 0.0),
-                explanation={},
-                top_contributors=[],
-                fairness_flags=None,
-                summary="Explanation failed due to internal error"
-            )
+            logger.exception(f"[AuditExplainer] Explanation failed: {e}")
+            return [
+                AuditExplanationResult(
+                    final_score=c.get("final_score", 0.0),
+                    explanation={},
+                    top_contributors=[],
+                    fairness_flags=None,
+                    summary="Explanation failed due to internal error"
+                )
+                for c in contexts
+            ]
+
+    # === Attribution ===
 
-    def _extract_top_contributors(self, shap_row, feature_names, k: int = 10) -> Dict[str, float]:
-        shap_vals = dict(zip(feature_names, shap_row.values))
-        sorted_items = sorted(shap_vals.items(), key=lambda item: abs(item[1]), reverse=True)
-        return {k: float(v) for k, v in sorted_items[:k]}
+    @staticmethod
+    def _weight_vector(override: Optional[Dict[str, float]]) -> Tuple[float, ...]:
+        """
+        Accepts override keys as feature names ("semantic_score") or weight keys ("semantic").
+        """
+        override = override or {}
+        return tuple(
+            float(override.get(f, override.get(WEIGHT_KEYS[f], DEFAULT_WEIGHTS[WEIGHT_KEYS[f]])))
+            for f in FEATURE_COLS
+        )
+
+    def _background_data(self) -> np.ndarray:
+        # Features are scores in [0, 1]; a fixed uniform sample stands in for the population.
+        if self._background is None:
+            rng = np.random.default_rng(0)
+            self._background = rng.uniform(0.0, 1.0, size=(settings.AUDIT_SHAP_BACKGROUND_SIZE, len(FEATURE_COLS)))
+        return self._background
+
+    def _shap_values(self, w: np.ndarray, X: np.ndarray) -> np.ndarray:
+        key = tuple(w)
+        with self._lock:
+            explainer = self._explainers.get(key)
+            if explainer is None:
+                explainer = shap.Explainer(lambda data: np.asarray(data) @ w, self._background_data())
+                self._explainers[key] = explainer
+                logger.info(f"[AuditExplainer] Built SHAP explainer for weights {key}")
+                while len(self._explainers) > MAX_CACHED_EXPLAINERS:
+                    self._explainers.popitem(last=False)
+            else:
+                self._explainers.move_to_end(key)
+        return np.asarray(explainer(X).values)
+
+    # === Formatting ===
+
+    def _results(self, contexts: List[Dict], contributions: np.ndarray) -> List[AuditExplanationResult]:
+        order = np.argsort(-np.abs(contributions), axis=1)
+        scores = contributions.sum(axis=1)
+        results = []
+        for i, context in enumerate(contexts):
+            ranked = {FEATURE_COLS[j]: round(float(contributions[i, j]), 6) for j in order[i]}
+            final_score = context.get("final_score")
+            results.append(AuditExplanationResult(
+                final_score=round(float(scores[i] if final_score is None else final_score), 4),
+                explanation=ranked,
+                top_contributors=list(ranked)[:3],
+                fairness_flags=None,
+                summary=self._summarize(ranked)
+            ))
+        return results
 
     def _summarize(self, top_features: Dict[str, float]) -> str:
         if not top_features:
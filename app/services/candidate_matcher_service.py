@@ -1,6 +1,5 @@
 # app/services/candidate_matcher_service.py
 
-from sentence_transformers import SentenceTransformer
 import numpy as np
 import faiss
 from datetime import datetime
@@ -8,6 +7,8 @@ from typing import List, Optional, Dict
 from pydantic import BaseModel
 import logging
 
+from app.models.embedding_cache import get_cached_encoder
+
 logger = logging.getLogger("candidate_matcher")
 
 # === Config ===
@@ -46,15 +47,25 @@ class CandidateMatchResponse(BaseModel):
 # === Candidate Matcher Service ===
 class CandidateMatcherService:
     def __init__(self):
-        self.model = SentenceTransformer(EMBEDDING_MODEL)
-        self.index = faiss.IndexFlatIP(EMBEDDING_DIM)
-        self.vectors: List[np.ndarray] = []
+        self.encoder = get_cached_encoder(EMBEDDING_MODEL)
+        self.model = self.encoder.model
+        self.index = self._new_index()
+        self.vectors: Dict[int, np.ndarray] = {}
         self.store: Dict[str, dict] = {}
         self.id_to_index: Dict[str, int] = {}
         self.index_to_id: Dict[int, str] = {}
+        self._next_index_id = 0
+
+    @staticmethod
+    def _new_index() -> faiss.IndexIDMap2:
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(EMBEDDING_DIM))
+
+    @staticmethod
+    def _resume_text(resume: ResumeProfile) -> str:
+        return resume.resume_text + " " + " ".join(resume.skills)
 
     def _encode(self, text: str) -> np.ndarray:
-        return self.model.encode(text, convert_to_numpy=True, normalize_embeddings=True)
+        return self.encoder.encode(text)
 
     def _keyword_overlap(self, a: str, b: str) -> float:
         return len(set(a.lower().split()) & set(b.lower().split())) / max(len(b.lower().split()), 1)
@@ -68,14 +79,23 @@ class CandidateMatcherService:
 
     def index_candidate(self, resume: ResumeProfile):
         try:
-            if resume.candidate_id in self.store:
+            vector = None
+            previous = self.store.get(resume.candidate_id)
+            if previous is not None:
                 logger.info(f"[Update] Resume already exists: {resume.candidate_id}")
+                if self._resume_text(ResumeProfile(**previous)) == self._resume_text(resume):
+                    vector = self.vectors[self.id_to_index[resume.candidate_id]]
                 self.delete_candidate(resume.candidate_id)
 
-            vector = self._encode(resume.resume_text + " " + " ".join(resume.skills))
-            idx = len(self.vectors)
-            self.vectors.append(vector)
-            self.index.add(np.array([vector]))
+            if vector is None:
+                vector = self._encode(self._resume_text(resume))
+            idx = self._next_index_id
+            self._next_index_id += 1
+            self.vectors[idx] = vector
+            self.index.add_with_ids(
+                np.array([vector], dtype=np.float32),
+                np.array([idx], dtype=np.int64)
+            )
 
             self.store[resume.candidate_id] = resume.dict()
             self.id_to_index[resume.candidate_id] = idx
@@ -88,16 +108,19 @@ class CandidateMatcherService:
 
     def delete_candidate(self, candidate_id: str):
         if candidate_id in self.store:
+            idx = self.id_to_index.pop(candidate_id)
+            self.index.remove_ids(np.array([idx], dtype=np.int64))
+            self.index_to_id.pop(idx, None)
+            self.vectors.pop(idx, None)
             del self.store[candidate_id]
-            self.rebuild_index()
 
     def rebuild_index(self):
-        self.index = faiss.IndexFlatIP(EMBEDDING_DIM)
-        self.vectors.clear()
-        self.id_to_index.clear()
-        self.index_to_id.clear()
-        for resume in self.store.values():
-            self.index_candidate(ResumeProfile(**resume))
+        """Rebuild FAISS from the stored vectors without re-encoding."""
+        self.index = self._new_index()
+        if not self.vectors:
+            return
+        ids = np.fromiter(self.vectors.keys(), dtype=np.int64, count=len(self.vectors))
+        self.index.add_with_ids(np.stack([self.vectors[i] for i in ids]).astype(np.float32), ids)
 
     def clear_index(self):
         self.index.reset()
@@ -119,14 +142,16 @@ class CandidateMatcherService:
 
         job_text = f"{job_title}. {job_description}. Skills: {'; '.join(required_skills)}"
         job_vector = self._encode(job_text)
-        D, I = self.index.search(np.array([job_vector]), len(self.vectors))
+        D, I = self.index.search(np.array([job_vector], dtype=np.float32), self.index.ntotal)
 
         results = []
         for idx in I[0]:
-            cand_id = self.index_to_id.get(idx)
+            cand_id = self.index_to_id.get(int(idx))
+            if not cand_id:
+                continue
             cand = self.store[cand_id]
 
-            resume_vec = self.vectors[idx]
+            resume_vec = self.vectors[int(idx)]
             semantic = float(np.dot(job_vector, resume_vec))
             matched_skills = list(set(required_skills) & set(cand["skills"]))
             skill_overlap = len(matched_skills) / max(len(required_skills), 1)
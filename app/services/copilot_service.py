@@ -1,10 +1,9 @@
 import logging
-from typing import Dict, Literal, Optional, Tuple, List
-import os
+from typing import AsyncIterator, Dict, Literal, Optional, Tuple, List
 
 from app.base.models import CopilotRequest, CopilotResponse
 from app.models.gpt_wrapper import GPTWriter
-from app.base.utils.prompt_loader import load_prompt_template, render_prompt
+from app.base.utils.prompt_loader import get_prompt_registry
 
 logger = logging.getLogger("copilot_service")
 
@@ -50,17 +49,29 @@ class CopilotService:
             logger.exception(f"[Copilot Error] Failed to generate {request.type}")
             raise RuntimeError(f"Copilot generation failed: {e}")
 
+    def generate_stream(self, request: CopilotRequest) -> Tuple[AsyncIterator[str], List[str]]:
+        """
+        Streaming variant of `generate`: returns (token iterator, tags). The prompt is built
+        up front, so unsupported types raise ValueError before anything is streamed.
+        """
+        prompt, tags = self._build_prompt(request)
+        model = request.model or "gpt-4-turbo"
+        logger.info(f"[Copilot] Streaming: type={request.type} | tone={request.tone} | lang={request.language}")
+        return self.llm.astream(prompt, model=model), tags
+
     def _build_prompt(self, req: CopilotRequest) -> Tuple[str, List[str]]:
         """
         Load the appropriate prompt template and render it with user-provided inputs.
         Returns the final prompt string and list of tags (keys from inputs).
         """
         prompt_path = PROMPT_PATHS.get(req.type)
-        if not prompt_path or not os.path.exists(prompt_path):
+        try:
+            template = get_prompt_registry().get(prompt_path) if prompt_path else None
+        except FileNotFoundError:
+            template = None
+        if template is None:
             raise ValueError(f"Unsupported or missing prompt file for type: {req.type}")
 
-        raw_template = load_prompt_template(prompt_path)
-
         # Safely render using user context
         context = {
             **(req.inputs or {}),
@@ -68,5 +79,5 @@ class CopilotService:
             "language": req.language or "en"
         }
 
-        prompt = render_prompt(raw_template, context)
+        prompt = template.render(context)
         return prompt, list(context.keys())
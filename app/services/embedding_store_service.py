@@ -2,12 +2,11 @@ import os
 import faiss
 import json
 import threading
-import hashlib
 import numpy as np
 import logging
 from typing import List, Dict, Optional
 
-from sentence_transformers import SentenceTransformer
+from app.models.embedding_cache import get_cached_encoder
 from app.base.models import EmbeddingRecord, EmbeddingSearchResult
 
 logger = logging.getLogger("embedding_store")
@@ -21,10 +20,10 @@ MODEL_NAME = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v
 
 class EmbeddingStoreService:
     def __init__(self, model_name: Optional[str] = None):
-        self.model = SentenceTransformer(model_name or MODEL_NAME)
+        self.encoder = get_cached_encoder(model_name or MODEL_NAME)
+        self.model = self.encoder.model
         self.index = self._load_index()
         self.metadata: Dict[int, EmbeddingRecord] = self._load_metadata()
-        self.cache: Dict[str, np.ndarray] = {}
         self.lock = threading.Lock()
         self.id_counter = max(self.metadata.keys(), default=-1) + 1
 
@@ -45,19 +44,10 @@ class EmbeddingStoreService:
                 logger.warning(f"[EmbeddingStore] Metadata load failed: {e}")
         return {}
 
-    def _hash_text(self, text: str) -> str:
-        return hashlib.md5(text.encode("utf-8")).hexdigest()
-
     def _encode_text(self, text: str) -> np.ndarray:
-        h = self._hash_text(text)
-        if h in self.cache:
-            return self.cache[h]
-
-        emb = self.model.encode(text, convert_to_numpy=True, normalize_embeddings=True)
+        emb = self.encoder.encode(text)
         if emb.shape[0] != EMBEDDING_DIM:
             raise ValueError(f"Embedding shape mismatch: expected {EMBEDDING_DIM}, got {emb.shape[0]}")
-
-        self.cache[h] = emb
         return emb
 
     def add_embedding(self, record: EmbeddingRecord) -> int:
@@ -115,7 +105,6 @@ class EmbeddingStoreService:
         with self.lock:
             self.index.reset()
             self.metadata.clear()
-            self.cache.clear()
             self.id_counter = 0
             if os.path.exists(INDEX_PATH):
                 os.remove(INDEX_PATH)
@@ -1,16 +1,12 @@
-import os
+import asyncio
 import logging
-import hashlib
-from typing import List, Tuple, Dict
+from typing import List, Tuple
 
 from app.models.whisper_wrapper import WhisperTranscriber
 from app.models.gpt_wrapper import GPTScorer
-from app.base.utils.interview_templates import (
-    load_questions,
-    SESSION_SUMMARY_TEMPLATE,
-    SKILL_EXTRACTION_TEMPLATE,
-    PROFILE_EXTRACTION_TEMPLATE,
-)
+from app.services.asr_worker_pool import get_asr_pool
+from app.base.config import settings
+from app.base.utils.interview_templates import load_questions
 from app.base.models import (
     CandidateAudioInput,
     InterviewQuestion,
@@ -27,23 +23,68 @@ class InterviewService:
     def __init__(self):
         self.transcriber = WhisperTranscriber()
         self.llm_scorer = GPTScorer()
-        self.transcript_cache: Dict[str, Tuple[str, float]] = {}
-
-    def _hash_audio(self, path: str) -> str:
-        with open(path, "rb") as f:
-            return hashlib.sha256(f.read()).hexdigest()
+        self._llm_semaphore = None  # created on first use, inside the serving event loop
 
     def _transcribe_audio(self, path: str, lang: str = "auto") -> Tuple[str, float]:
-        checksum = self._hash_audio(path)
-        if checksum in self.transcript_cache:
-            logger.debug(f"[Cache] Using cached transcript for: {path}")
-            return self.transcript_cache[checksum]
+        # Repeat uploads are served from the shared transcript cache inside the transcriber.
+        return self.transcriber.transcribe(path, language=lang)
+
+    async def _call_llm(self, fn, *args):
+        """
+        Run a blocking GPTScorer call off the event loop, bounded by the LLM concurrency limit.
+        """
+        if self._llm_semaphore is None:
+            self._llm_semaphore = asyncio.Semaphore(settings.INTERVIEW_LLM_CONCURRENCY)
+        async with self._llm_semaphore:
+            return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def _transcribe_and_score(
+        self,
+        session_id: str,
+        idx: int,
+        question: InterviewQuestion,
+        audio_path: str,
+        language: str
+    ) -> InterviewAnswer:
+        transcript, confidence = await get_asr_pool().run(
+            self.transcriber.model_key, session_id, self._transcribe_audio, audio_path, language, wait=True
+        )
+        answer_text = transcript.strip()
+        logger.info(f"[Transcription] Q{idx + 1} confidence={confidence:.2f}")
+        if not answer_text:
+            logger.warning(f"[EmptyTranscript] Q{idx + 1} returned empty transcript.")
 
-        transcript, confidence = self.transcriber.transcribe(path, language=lang)
-        self.transcript_cache[checksum] = (transcript, confidence)
-        return transcript, confidence
-
-    def process_interview(self, input_data: CandidateAudioInput) -> InterviewResult:
+        try:
+            score_result = await self._call_llm(self.llm_scorer.score_answer, question.text, answer_text)
+        except Exception as e:
+            logger.warning(f"[ScoreFallback] Q{idx + 1}: {e}")
+            score_result = {
+                "score": 0,
+                "reasoning": "Scoring failed",
+                "tags": [],
+                "model_used": "fallback"
+            }
+
+        return InterviewAnswer(
+            question=question.text,
+            answer=answer_text,
+            score=score_result["score"],
+            reasoning=score_result["reasoning"],
+            language=language,
+            transcription_confidence=confidence,
+            tags=score_result.get("tags", []),
+            metadata={
+                "question_type": question.type,
+                "source": "llm_score",
+                "model": score_result.get("model_used")
+            }
+        )
+
+    async def process_interview(self, input_data: CandidateAudioInput) -> InterviewResult:
+        """
+        Each answer is transcribed on the shared ASR worker pool and scored as soon as its transcript
+        is ready; profile, skill and summary extraction then run concurrently.
+        """
         try:
             logger.info(f"[InterviewService] Starting interview for {input_data.candidate_id}")
             language = input_data.language or "uz"
@@ -52,60 +93,44 @@ class InterviewService:
             questions: List[InterviewQuestion] = load_questions(
                 domain=input_data.domain,
                 difficulty=input_data.difficulty,
-                type=input_data.interview_type or "mixed"
+                type=input_data.interview_type or "mixed",
+                language=language
             )
             if not questions:
                 raise ValueError("No questions loaded for given parameters.")
 
             logger.info(f"[InterviewService] Loaded {len(questions)} questions")
 
-            # === Step 2: Transcribe Answers ===
-            transcripts = []
-            for idx, audio_path in enumerate(input_data.audio_paths):
-                transcript, confidence = self._transcribe_audio(audio_path, lang=language)
-                logger.info(f"[Transcription] Q{idx + 1} confidence={confidence:.2f}")
-                if not transcript.strip():
-                    logger.warning(f"[EmptyTranscript] Q{idx + 1} returned empty transcript.")
-                transcripts.append((transcript.strip(), confidence))
-
-            if len(transcripts) != len(questions):
+            if len(input_data.audio_paths) != len(questions):
                 raise ValueError("Mismatch between number of questions and answers")
 
-            # === Step 3: Score Answers ===
-            answer_objs: List[InterviewAnswer] = []
-            for i, (answer_text, confidence) in enumerate(transcripts):
-                try:
-                    score_result = self.llm_scorer.score_answer(questions[i].text, answer_text)
-                except Exception as e:
-                    logger.warning(f"[ScoreFallback] Q{i + 1}: {e}")
-                    score_result = {
-                        "score": 0,
-                        "reasoning": "Scoring failed",
-                        "tags": [],
-                        "model_used": "fallback"
-                    }
-
-                answer_objs.append(InterviewAnswer(
-                    question=questions[i].text,
-                    answer=answer_text,
-                    score=score_result["score"],
-                    reasoning=score_result["reasoning"],
-                    language=language,
-                    transcription_confidence=confidence,
-                    tags=score_result.get("tags", []),
-                    metadata={
-                        "question_type": questions[i].type,
-                        "source": "llm_score",
-                        "model": score_result.get("model_used")
-                    }
-                ))
+            # === Step 2: Transcribe & Score Answers ===
+            answer_objs: List[InterviewAnswer] = list(await asyncio.gather(*[
+                self._transcribe_and_score(input_data.candidate_id, i, questions[i], audio_path, language)
+                for i, audio_path in enumerate(input_data.audio_paths)
+            ]))
 
             full_text = "\n".join([f"A: {a.answer}" for a in answer_objs])
+            domain = input_data.domain or "general"
+
+            # === Step 3: Profile, Skills & Summary (concurrent) ===
+            profile_data, skills_result, session_summary = await asyncio.gather(
+                self._call_llm(self.llm_scorer.extract_profile, full_text),
+                self._call_llm(self.llm_scorer.extract_skills, full_text, domain),
+                self._call_llm(
+                    self.llm_scorer.get_summary,
+                    "\n".join([f"Q: {a.question}\nA: {a.answer}" for a in answer_objs]),
+                    domain,
+                    input_data.difficulty or "mixed",
+                    language
+                ),
+                return_exceptions=True
+            )
 
-            # === Step 4: Extract Profile ===
-            try:
-                profile_prompt = PROFILE_EXTRACTION_TEMPLATE.format(full_text=full_text)
-                profile_data = self.llm_scorer.extract_profile(profile_prompt)
+            if isinstance(profile_data, Exception):
+                logger.warning(f"[ProfileFallback] Profile extraction failed: {profile_data}")
+                extracted_profile = CandidateProfile()
+            else:
                 extracted_profile = CandidateProfile(
                     expected_salary=profile_data.get("expected_salary"),
                     total_experience=profile_data.get("total_experience"),
@@ -114,37 +139,20 @@ class InterviewService:
                     relocation_interest=profile_data.get("relocation_interest"),
                     current_role=profile_data.get("current_role")
                 )
-            except Exception as e:
-                logger.warning(f"[ProfileFallback] Profile extraction failed: {e}")
-                extracted_profile = CandidateProfile()
 
-            # === Step 5: Extract Skills & Intent ===
-            try:
-                skill_prompt = SKILL_EXTRACTION_TEMPLATE.format(
-                    full_text=full_text,
-                    job_context=input_data.domain or "general"
-                )
-                skills_result = self.llm_scorer.extract_skills(skill_prompt)
+            if isinstance(skills_result, Exception):
+                logger.warning(f"[SkillFallback] Skill extraction failed: {skills_result}")
+                extracted_skills = SkillExtraction(language_used=language)
+            else:
                 extracted_skills = SkillExtraction(
                     extracted_skills=skills_result.get("skills", []),
                     inferred_intent=skills_result.get("intent"),
                     personality_traits=skills_result.get("traits", []),
                     language_used=language
                 )
-            except Exception as e:
-                logger.warning(f"[SkillFallback] Skill extraction failed: {e}")
-                extracted_skills = SkillExtraction(language_used=language)
 
-            # === Step 6: Generate Summary ===
-            try:
-                summary_prompt = SESSION_SUMMARY_TEMPLATE.format(
-                    answers="\n".join([f"Q: {a.question}\nA: {a.answer}" for a in answer_objs]),
-                    domain=input_data.domain or "general",
-                    level=input_data.difficulty or "mixed"
-                )
-                session_summary = self.llm_scorer.get_summary(summary_prompt)
-            except Exception as e:
-                logger.warning(f"[SummaryFallback] Summary generation failed: {e}")
+            if isinstance(session_summary, Exception):
+                logger.warning(f"[SummaryFallback] Summary generation failed: {session_summary}")
                 session_summary = "Summary could not be generated."
 
             logger.info(f"[InterviewService] Completed session for {input_data.candidate_id}")
@@ -1,15 +1,23 @@
+import time
 import asyncio
-import hashlib
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from app.models.whisper_wrapper import WhisperTranscriber
+from app.models.whisper_loader import WhisperModelRegistry
+from app.models.streaming_asr import StreamingTranscriber
 from app.models.gpt_wrapper import GPTScorer
-from app.base.utils.interview_templates import (
-    load_questions,
-    SESSION_SUMMARY_TEMPLATE,
-    SKILL_EXTRACTION_TEMPLATE,
+from app.services.asr_worker_pool import get_asr_pool
+from app.routers.interview_bot.config import config
+from app.base.metrics import (
+    interview_stream_sessions,
+    interview_stream_buffer_bytes,
+    interview_stream_sessions_closed,
+    interview_stream_audio_dropped_bytes,
 )
+from app.base.utils.interview_templates import load_questions
 from app.base.models import (
     InterviewResult,
     InterviewQuestion,
@@ -21,14 +29,30 @@ from app.base.models import (
 logger = logging.getLogger("interview_stream_service")
 
 
+class SessionLimitError(RuntimeError):
+    """
+    The worker already holds MAX_CONCURRENT_STREAM_SESSIONS live sessions.
+    """
+
+
 class InterviewStreamSession:
-    def __init__(self, candidate_id: str, domain: str, difficulty: str, language: str = "auto"):
+    def __init__(
+        self,
+        candidate_id: str,
+        domain: str,
+        difficulty: str,
+        language: str = "auto",
+        transcriber: Optional[WhisperTranscriber] = None,
+        llm_scorer: Optional[GPTScorer] = None
+    ):
         self.candidate_id = candidate_id
         self.domain = domain
         self.difficulty = difficulty
         self.language = language or "uz"
-        self.transcriber = WhisperTranscriber()
-        self.llm_scorer = GPTScorer()
+        self.transcriber = transcriber or WhisperTranscriber(language=self.language)
+        self.llm_scorer = llm_scorer or GPTScorer()
+        self.started_at = time.monotonic()
+        self.last_activity = self.started_at
 
         # Load static or predefined question set
         self.questions: List[InterviewQuestion] = load_questions(
@@ -43,56 +67,138 @@ class InterviewStreamSession:
         self.skill_extraction: Optional[SkillExtraction] = None
         self.session_summary: Optional[str] = None
         self._current_q_idx = 0
-        self._buffer = b""
         self._max_questions = len(self.questions)
-        self._recent_checksums = set()
+        self._stream = StreamingTranscriber(decode=self._decode)
+        self._answer_segments: List[Tuple[str, float]] = []
+        self._partial_transcript: Optional[str] = None
+        self._pending_audio = bytearray()  # chunks not yet accepted by the ASR pool
+        self._frame_bytes = config.AUDIO_SAMPLE_WIDTH * config.AUDIO_CHANNELS
+        self._max_pending_bytes = config.STREAM_MAX_PENDING_SECONDS * config.AUDIO_SAMPLE_RATE * self._frame_bytes
+        self.dropped_bytes = 0
+
+        # Running skill/trait sets and summary, folded in per answer by `_digest_answer`
+        self._skills: Dict[str, str] = {}  # lowercased → first spelling seen
+        self._traits: Dict[str, str] = {}
+        self._intent: Optional[str] = None
+        self._digest_task: Optional[asyncio.Task] = None
+        self._session_update = False
 
         logger.info(f"[StreamInit] Started session for {self.candidate_id} | domain={self.domain} | level={self.difficulty} | Qs={self._max_questions}")
 
-    def _compute_checksum(self, data: bytes) -> str:
-        return hashlib.sha256(data).hexdigest()
+    def _decode(self, audio: np.ndarray, prompt: Optional[str]) -> Tuple[str, float]:
+        return self.transcriber.transcribe_array(audio, language=self.language, prompt=prompt)
 
     def get_next_question(self) -> Optional[str]:
         if self._current_q_idx < self._max_questions:
             return self.questions[self._current_q_idx].text
         return None
 
-    async def handle_stream_chunk(self, audio_chunk: bytes) -> Optional[InterviewAnswer]:
-        self._buffer += audio_chunk
+    @property
+    def buffer_bytes(self) -> int:
+        """
+        Audio held for this session: the preallocated ring plus chunks waiting for the ASR pool.
+        """
+        return self._stream.ring.capacity * 2 + len(self._pending_audio)
+
+    def expiry_reason(self, now: Optional[float] = None) -> Optional[str]:
+        now = time.monotonic() if now is None else now
+        if now - self.started_at > config.MAX_STREAM_DURATION_MINUTES * 60:
+            return "duration"
+        if now - self.last_activity > config.STREAMING_TIMEOUT_SECONDS:
+            return "idle"
+        if self.buffer_bytes > config.MAX_STREAM_SESSION_BUFFER_BYTES:
+            return "buffer"
+        return None
 
-        if len(self._buffer) < 16000 * 5:
-            return None  # Wait until at least 5 seconds of audio is collected
+    def pop_partial_transcript(self) -> Optional[str]:
+        """
+        Latest running transcript of the current answer, if it changed since the last call.
+        """
+        partial, self._partial_transcript = self._partial_transcript, None
+        return partial
 
-        checksum = self._compute_checksum(self._buffer)
-        if checksum in self._recent_checksums:
-            logger.debug("[Stream] Duplicate buffer skipped")
-            self._buffer = b""
+    def pop_session_update(self) -> Optional[Dict]:
+        """
+        Running skills, traits and summary, if an answer was folded in since the last call.
+        """
+        if not self._session_update:
             return None
-        self._recent_checksums.add(checksum)
+        self._session_update = False
+        return {
+            "skills": list(self._skills.values()),
+            "traits": list(self._traits.values()),
+            "intent": self._intent,
+            "summary": self.session_summary,
+        }
 
-        try:
-            transcript, confidence = self.transcriber.transcribe_from_bytes(
-                self._buffer, language=self.language
-            )
-        except Exception as e:
-            logger.warning(f"[Transcription Error] {e}")
-            self._buffer = b""
-            return None
+    def cancel(self):
+        if self._digest_task and not self._digest_task.done():
+            self._digest_task.cancel()
 
-        self._buffer = b""
+    async def handle_stream_chunk(self, audio_chunk: bytes) -> Optional[InterviewAnswer]:
+        """
+        Feed raw PCM into the streaming transcriber on the ASR worker pool. Returns the
+        scored answer once the candidate's end-of-answer silence is detected; partial
+        transcripts are exposed via `pop_partial_transcript`.
 
-        if not transcript.strip():
+        Raises ASRBackpressureError when the model's queue is full; the chunk is kept and
+        fed together with the next one. At most STREAM_MAX_PENDING_SECONDS of audio is
+        kept this way; beyond that the oldest audio is dropped.
+        """
+        self.last_activity = time.monotonic()
+        self._pending_audio += audio_chunk
+        self._trim_pending()
+        data = bytes(self._pending_audio)
+        events = await get_asr_pool().run(self.transcriber.model_key, self.candidate_id, self._stream.feed, data)
+        del self._pending_audio[:len(data)]
+        return await self._apply_events(events)
+
+    def _trim_pending(self):
+        excess = len(self._pending_audio) - self._max_pending_bytes
+        if excess <= 0:
+            return
+        excess += -excess % self._frame_bytes  # keep whole frames so channels stay aligned
+        del self._pending_audio[:excess]
+        if not self.dropped_bytes:
+            logger.warning(f"[Stream] Backpressure buffer full for {self.candidate_id}; dropping oldest audio")
+        self.dropped_bytes += excess
+        interview_stream_audio_dropped_bytes.inc(excess)
+
+    def _drain(self) -> List[Dict]:
+        data, self._pending_audio = bytes(self._pending_audio), bytearray()
+        return self._stream.feed(data) + self._stream.flush()
+
+    async def _apply_events(self, events: List[Dict]) -> Optional[InterviewAnswer]:
+        answer = None
+        for event in events:
+            kind = event["event"]
+            if kind == "segment":
+                self._answer_segments.append((event["text"], event["confidence"]))
+                self._partial_transcript = " ".join(text for text, _ in self._answer_segments)
+            elif kind == "partial":
+                self._partial_transcript = " ".join([text for text, _ in self._answer_segments] + [event["text"]])
+            elif kind == "endpoint":
+                answer = await self._complete_answer() or answer
+        return answer
+
+    async def _complete_answer(self) -> Optional[InterviewAnswer]:
+        segments, self._answer_segments = self._answer_segments, []
+        transcript = " ".join(text for text, _ in segments).strip()
+        if not transcript:
             logger.info("[Stream] Empty transcript segment.")
             return None
+        confidence = round(sum(c for _, c in segments) / len(segments), 3)
 
         if self._current_q_idx >= self._max_questions:
             logger.warning("[Stream] Overflow - received more answers than expected")
             return None
 
         current_q = self.questions[self._current_q_idx]
+        # Skills and summary don't depend on the score, so they run alongside the scoring call.
+        self._start_digest(current_q.text, transcript)
 
         try:
-            score_result = self.llm_scorer.score_answer(current_q.text, transcript)
+            score_result = await self.llm_scorer.ascore_answer(current_q.text, transcript)
         except Exception as e:
             logger.warning(f"[LLM Fallback] Failed scoring: {e}")
             score_result = {
@@ -123,38 +229,75 @@ class InterviewStreamSession:
         logger.info(f"[Scored] Q{self._current_q_idx}/{self._max_questions} → score={score_result['score']:.2f}")
         return answer
 
+    def _start_digest(self, question: str, transcript: str):
+        previous = self._digest_task
+        self._digest_task = asyncio.get_running_loop().create_task(
+            self._digest_answer(previous, question, transcript)
+        )
+
+    async def _digest_answer(self, previous: Optional[asyncio.Task], question: str, transcript: str):
+        """
+        Merge one answer's skills/traits into the running sets and fold it into the summary.
+        Digests are chained so the summary takes answers in order; skill extraction for this
+        answer starts immediately and overlaps with the previous digest.
+        """
+        skills_task = asyncio.ensure_future(self.llm_scorer.aextract_skills(transcript, self.domain or "general"))
+        if previous:
+            await asyncio.gather(previous, return_exceptions=True)
+
+        summary, skills = await asyncio.gather(
+            self.llm_scorer.aupdate_summary(self.session_summary, question, transcript, self.domain, self.difficulty),
+            skills_task,
+            return_exceptions=True
+        )
+        if isinstance(summary, str):
+            self.session_summary = summary
+        else:
+            logger.warning(f"[Summary Update Failed] {summary}")
+        if isinstance(skills, dict):
+            self._merge(self._skills, skills.get("skills"))
+            self._merge(self._traits, skills.get("traits"))
+            if skills.get("intent") and skills["intent"] != "unknown":
+                self._intent = skills["intent"]
+        else:
+            logger.warning(f"[Skill Extraction Failed] {skills}")
+        self._session_update = True
+
+    @staticmethod
+    def _merge(target: Dict[str, str], values: Any):
+        if isinstance(values, str):
+            values = [values]
+        for value in values or []:
+            value = str(value).strip()
+            if value:
+                target.setdefault(value.lower(), value)
+
     async def finalize(self) -> InterviewResult:
+        """
+        Flush trailing audio and return the result from the running state; only the last
+        answer's digest (if still in flight) is awaited.
+        """
         logger.info(f"[Finalize] {self.candidate_id=} | Total Answers={len(self.answers)}")
 
-        # === Extract Skills ===
+        # === Flush trailing audio ===
         try:
-            full_text = "\n".join([a.answer for a in self.answers])
-            skill_prompt = SKILL_EXTRACTION_TEMPLATE.format(
-                full_text=full_text,
-                job_context=self.domain or "general"
-            )
-            skills_result = self.llm_scorer.extract_skills(skill_prompt)
-
-            self.skill_extraction = SkillExtraction(
-                extracted_skills=skills_result.get("skills", []),
-                inferred_intent=skills_result.get("intent"),
-                personality_traits=skills_result.get("traits", []),
-                language_used=self.language
+            events = await get_asr_pool().run(
+                self.transcriber.model_key, self.candidate_id, self._drain, wait=True
             )
+            await self._apply_events(events)
         except Exception as e:
-            logger.warning(f"[Skill Extraction Failed] {e}")
-            self.skill_extraction = SkillExtraction(language_used=self.language)
+            logger.warning(f"[Stream Flush Failed] {e}")
 
-        # === Generate Summary ===
-        try:
-            summary_prompt = SESSION_SUMMARY_TEMPLATE.format(
-                answers="\n".join([f"Q: {a.question}\nA: {a.answer}" for a in self.answers]),
-                domain=self.domain,
-                level=self.difficulty,
-            )
-            self.session_summary = self.llm_scorer.get_summary(summary_prompt)
-        except Exception as e:
-            logger.warning(f"[Summary Generation Failed] {e}")
+        if self._digest_task:
+            await asyncio.gather(self._digest_task, return_exceptions=True)
+
+        self.skill_extraction = SkillExtraction(
+            extracted_skills=list(self._skills.values()),
+            inferred_intent=self._intent,
+            personality_traits=list(self._traits.values()),
+            language_used=self.language
+        )
+        if not self.session_summary:
             self.session_summary = "Summary could not be generated."
 
         return InterviewResult(
@@ -168,30 +311,130 @@ class InterviewStreamSession:
 
 
 class InterviewStreamService:
-    def __init__(self):
+    """
+    Process-wide registry of live streaming sessions:
+        - at most MAX_CONCURRENT_STREAM_SESSIONS per worker (SessionLimitError beyond that)
+        - sessions idle for STREAMING_TIMEOUT_SECONDS or older than MAX_STREAM_DURATION_MINUTES
+          are reaped in the background, so abandoned sockets don't pin their audio buffers
+        - a session holding more than MAX_STREAM_SESSION_BUFFER_BYTES of audio is evicted
+        - one WhisperTranscriber per Whisper model and one GPTScorer shared by all sessions
+    """
+    def __init__(self, max_sessions: int = None):
+        self.max_sessions = max_sessions or config.MAX_CONCURRENT_STREAM_SESSIONS
         self.sessions: Dict[str, InterviewStreamSession] = {}
+        self._transcribers: Dict[str, WhisperTranscriber] = {}
+        self._llm_scorer: Optional[GPTScorer] = None
+        self._reaper: Optional[asyncio.Task] = None
+
+    def _shared_transcriber(self, language: str) -> WhisperTranscriber:
+        key = WhisperModelRegistry.resolve_model_key(language)
+        if key not in self._transcribers:
+            self._transcribers[key] = WhisperTranscriber(language=key)
+        return self._transcribers[key]
+
+    def _shared_scorer(self) -> GPTScorer:
+        if self._llm_scorer is None:
+            self._llm_scorer = GPTScorer()
+        return self._llm_scorer
 
-    def start_session(self, init: CandidateStreamInit) -> InterviewStreamSession:
+    def start_session(self, session_id: str, init: CandidateStreamInit) -> InterviewStreamSession:
+        """
+        Register a new session and return it. The returned object is the handle for
+        `end_session`; a reconnect under the same id replaces (and cancels) the old one.
+        """
+        if session_id in self.sessions:
+            logger.warning(f"[Start] Replacing existing stream session {session_id}")
+            self._discard(session_id, "replaced")
+        if len(self.sessions) >= self.max_sessions:
+            interview_stream_sessions_closed.labels(reason="rejected").inc()
+            raise SessionLimitError(f"Stream session limit reached ({self.max_sessions})")
+
+        language = init.language or "uz"
         session = InterviewStreamSession(
             candidate_id=init.candidate_id,
             domain=init.domain,
             difficulty=init.difficulty,
-            language=init.language or "uz"
+            language=language,
+            transcriber=self._shared_transcriber(language),
+            llm_scorer=self._shared_scorer()
         )
-        self.sessions[init.candidate_id] = session
-        logger.info(f"[Start] Stream session started for {init.candidate_id}")
+        self.sessions[session_id] = session
+        self._ensure_reaper()
+        self.record_usage(session_id)
+        logger.info(f"[Start] Stream session {session_id} started for {init.candidate_id} ({len(self.sessions)} live)")
         return session
 
-    def get_session(self, candidate_id: str) -> Optional[InterviewStreamSession]:
-        return self.sessions.get(candidate_id)
+    def get_session(self, session_id: str) -> Optional[InterviewStreamSession]:
+        return self.sessions.get(session_id)
 
-    def end_session(self, candidate_id: str) -> Optional[InterviewResult]:
-        session = self.sessions.pop(candidate_id, None)
+    def record_usage(self, session_id: str):
+        """
+        Publish the session's buffer size, evicting it at once if over MAX_STREAM_SESSION_BUFFER_BYTES.
+        """
+        session = self.sessions.get(session_id)
         if session:
-            try:
-                result = asyncio.run(session.finalize())
-                logger.info(f"[End] Session complete → {candidate_id}")
-                return result
-            except Exception as e:
-                logger.exception(f"[Finalization Error] Failed for {candidate_id}: {e}")
-        return None
+            if session.buffer_bytes > config.MAX_STREAM_SESSION_BUFFER_BYTES:
+                logger.warning(f"[Usage] Evicting stream session {session_id} ({session.buffer_bytes} buffered bytes)")
+                self._discard(session_id, "buffer", session)
+                return
+            interview_stream_buffer_bytes.labels(session=session_id).set(session.buffer_bytes)
+        interview_stream_sessions.set(len(self.sessions))
+
+    def is_current(self, session_id: str, session: InterviewStreamSession) -> bool:
+        """
+        False once the session was replaced by a reconnect or reaped.
+        """
+        return self.sessions.get(session_id) is session
+
+    async def end_session(self, session_id: str, session: InterviewStreamSession) -> Optional[InterviewResult]:
+        """
+        Finalize `session` if it is still the live session for `session_id`. A handle that
+        was replaced or reaped finalizes nothing, so a stale socket can't end its successor.
+        """
+        if not self.is_current(session_id, session):
+            return None
+        try:
+            result = await session.finalize()
+            logger.info(f"[End] Session complete → {session_id} ({session.candidate_id})")
+            return result
+        except Exception as e:
+            logger.exception(f"[Finalization Error] Failed for {session_id}: {e}")
+            return None
+        finally:
+            self._discard(session_id, "completed", session)
+
+    def _discard(self, session_id: str, reason: str, expected: Optional[InterviewStreamSession] = None):
+        if expected is not None and not self.is_current(session_id, expected):
+            return
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            return
+        session.cancel()
+        interview_stream_sessions_closed.labels(reason=reason).inc()
+        try:
+            interview_stream_buffer_bytes.remove(session_id)
+        except KeyError:
+            pass
+        interview_stream_sessions.set(len(self.sessions))
+
+    def reap(self) -> int:
+        """
+        Drop sessions past their idle timeout or maximum duration. Returns how many were dropped.
+        """
+        now = time.monotonic()
+        expired = [(sid, reason) for sid, s in self.sessions.items() if (reason := s.expiry_reason(now))]
+        for session_id, reason in expired:
+            logger.warning(f"[Reaper] Evicting stream session {session_id} ({reason})")
+            self._discard(session_id, reason, self.sessions[session_id])
+        return len(expired)
+
+    def _ensure_reaper(self):
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.get_running_loop().create_task(self._reap_forever())
+
+    async def _reap_forever(self):
+        while self.sessions:
+            await asyncio.sleep(config.STREAM_REAP_INTERVAL_SECONDS)
+            self.reap()
+            for session_id in list(self.sessions):
+                self.record_usage(session_id)
@@ -6,15 +6,18 @@ from datetime import datetime
 from typing import List, Optional, Dict
 
 from pydantic import BaseModel
-from sentence_transformers import SentenceTransformer
+from sklearn.feature_extraction.text import CountVectorizer
 import numpy as np
 import faiss
 
+from app.models.embedding_cache import get_cached_encoder
+
 logger = logging.getLogger("job_matcher_service")
 
 # === Configuration ===
 EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
 EMBEDDING_DIM = 384
+ENCODE_BATCH_SIZE = 64
 SCORING_WEIGHTS = {
     "semantic": 0.45,
     "skill_overlap": 0.25,
@@ -54,55 +57,179 @@ class MatchResponse(BaseModel):
     candidate_id: str
     matches: List[MatchScore]
 
+# === Stateless Scoring ===
+
+def keyword_overlap(text_a: str, text_b: str) -> float:
+    tokens_a = set(text_a.lower().split())
+    tokens_b = set(text_b.lower().split())
+    return len(tokens_a & tokens_b) / max(len(tokens_b), 1)
+
+
+def recency_score(created_at: Optional[str]) -> float:
+    try:
+        dt = datetime.fromisoformat(created_at)
+        delta = (datetime.utcnow() - dt).days
+        return max(0.0, 1.0 - delta / 365.0)
+    except Exception:
+        return 0.5
+
+
+def score_pair(
+    job_id: str,
+    resume_vector: np.ndarray,
+    job_vector: np.ndarray,
+    resume_skills: List[str],
+    required_skills: List[str],
+    resume_text: str,
+    job_description: str,
+    created_at: Optional[str] = None
+) -> MatchScore:
+    """
+    Score one resume against one job from precomputed embeddings.
+
+    Pure function: it reads no shared state, so it is safe to call concurrently
+    and its cost does not depend on how many jobs are indexed.
+    """
+    semantic = float(np.dot(resume_vector, job_vector))
+
+    matched_skills = list(set(resume_skills) & set(required_skills))
+    skill_overlap = len(matched_skills) / max(len(required_skills), 1)
+
+    keyword_score = keyword_overlap(resume_text, job_description)
+    recency = recency_score(created_at)
+
+    final_score = sum([
+        SCORING_WEIGHTS["semantic"] * semantic,
+        SCORING_WEIGHTS["skill_overlap"] * skill_overlap,
+        SCORING_WEIGHTS["keyword"] * keyword_score,
+        SCORING_WEIGHTS["recency"] * recency
+    ])
+
+    return MatchScore(
+        job_id=job_id,
+        semantic_score=round(semantic, 4),
+        skill_overlap=round(skill_overlap, 4),
+        keyword_match_score=round(keyword_score, 4),
+        recency_score=round(recency, 4),
+        final_score=round(final_score, 4),
+        matched_skills=matched_skills,
+        explanation={
+            "semantic": semantic,
+            "skill_overlap": skill_overlap,
+            "keyword_match": keyword_score,
+            "recency": recency
+        }
+    )
+
 # === Job Matching Engine ===
 
 class JobMatcherService:
     def __init__(self):
-        self.model = SentenceTransformer(EMBEDDING_MODEL)
-        self.index = faiss.IndexFlatIP(EMBEDDING_DIM)
-        self.job_vectors: List[np.ndarray] = []
+        self.encoder = get_cached_encoder(EMBEDDING_MODEL)
+        self.model = self.encoder.model
+        self.index = self._new_index()
+        self.job_vectors: Dict[int, np.ndarray] = {}
         self.job_store: Dict[str, dict] = {}
         self.job_id_to_index: Dict[str, int] = {}
         self.index_to_job_id: Dict[int, str] = {}
+        self._next_index_id = 0
+
+    @staticmethod
+    def _new_index() -> faiss.IndexIDMap2:
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(EMBEDDING_DIM))
 
     def encode(self, text: str) -> np.ndarray:
         if not text.strip():
             return np.zeros(EMBEDDING_DIM)
-        return self.model.encode(text, convert_to_numpy=True, normalize_embeddings=True)
+        return self.encoder.encode(text)
+
+    def encode_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode many texts with a single model call (cache misses only).
+        Blank texts map to zero vectors.
+        """
+        matrix = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+        non_empty = [i for i, t in enumerate(texts) if t.strip()]
+        if non_empty:
+            matrix[non_empty] = self.encoder.encode(
+                [texts[i] for i in non_empty],
+                batch_size=ENCODE_BATCH_SIZE
+            )
+        return matrix
 
     def _keyword_overlap(self, text_a: str, text_b: str) -> float:
-        tokens_a = set(text_a.lower().split())
-        tokens_b = set(text_b.lower().split())
-        return len(tokens_a & tokens_b) / max(len(tokens_b), 1)
+        return keyword_overlap(text_a, text_b)
 
     def _recency_score(self, created_at: Optional[str]) -> float:
-        try:
-            dt = datetime.fromisoformat(created_at)
-            delta = (datetime.utcnow() - dt).days
-            return max(0.0, 1.0 - delta / 365.0)
-        except Exception:
-            return 0.5
+        return recency_score(created_at)
+
+    def _job_text(self, job: JobPosting) -> str:
+        return f"{job.title}. {job.description}. Skills: {'; '.join(job.required_skills)}"
+
+    @staticmethod
+    def _resume_text(resume_text: str, skills: List[str]) -> str:
+        return resume_text + " " + " ".join(skills)
+
+    def _keyword_overlap_batch(self, texts: List[str], reference: str) -> np.ndarray:
+        """
+        Vectorized equivalent of `_keyword_overlap(text, reference)` for many texts.
+        """
+        ref_tokens = set(reference.lower().split())
+        if not ref_tokens:
+            return np.zeros(len(texts))
+        vectorizer = CountVectorizer(
+            vocabulary=sorted(ref_tokens),
+            tokenizer=str.split,
+            token_pattern=None,
+            lowercase=True,
+            binary=True
+        )
+        hits = np.asarray(vectorizer.transform(texts).sum(axis=1)).ravel()
+        return hits / len(ref_tokens)
+
+    def _skill_overlap_batch(self, skill_lists: List[List[str]], required_skills: List[str]) -> np.ndarray:
+        """
+        Fraction of `required_skills` present in each skill list, as one sparse pass.
+        """
+        required = sorted(set(required_skills))
+        if not required:
+            return np.zeros(len(skill_lists))
+        vectorizer = CountVectorizer(vocabulary=required, analyzer=lambda skills: skills, binary=True)
+        hits = np.asarray(vectorizer.transform(skill_lists).sum(axis=1)).ravel()
+        return hits / max(len(required_skills), 1)
 
     # === Indexing ===
 
     def index_job(self, job: JobPosting):
+        """
+        Insert or upsert a job. Only the job itself is encoded, and an upsert whose
+        embedded text is unchanged reuses the stored vector.
+        """
         try:
-            if job.job_id in self.job_store:
+            vector = None
+            previous = self.job_store.get(job.job_id)
+            if previous is not None:
                 logger.info(f"[Update] Job ID already exists: {job.job_id}. Overwriting.")
+                if self._job_text(JobPosting(**previous)) == self._job_text(job):
+                    vector = self.job_vectors[self.job_id_to_index[job.job_id]]
                 self.delete_job(job.job_id)
 
-            combined_text = f"{job.title}. {job.description}. Skills: {'; '.join(job.required_skills)}"
-            vector = self.encode(combined_text)
+            if vector is None:
+                vector = self.encode(self._job_text(job))
 
-            index_id = len(self.job_vectors)
-            self.index.add(np.array([vector]))
-            self.job_vectors.append(vector)
+            index_id = self._next_index_id
+            self._next_index_id += 1
+            self.index.add_with_ids(
+                np.array([vector], dtype=np.float32),
+                np.array([index_id], dtype=np.int64)
+            )
+            self.job_vectors[index_id] = vector
 
             self.job_store[job.job_id] = job.dict()
             self.job_id_to_index[job.job_id] = index_id
             self.index_to_job_id[index_id] = job.job_id
 
-            logger.info(f"[Index] Job {job.job_id} indexed at position {index_id}")
+            logger.info(f"[Index] Job {job.job_id} indexed with id {index_id}")
         except Exception as e:
             logger.exception(f"[Error indexing job {job.job_id}] {e}")
             raise
@@ -110,11 +237,15 @@ class JobMatcherService:
     def delete_job(self, job_id: str):
         if job_id not in self.job_store:
             return
+        index_id = self.job_id_to_index.pop(job_id)
+        self.index.remove_ids(np.array([index_id], dtype=np.int64))
+        self.index_to_job_id.pop(index_id, None)
+        self.job_vectors.pop(index_id, None)
         del self.job_store[job_id]
-        self.rebuild_index()
+        logger.info(f"[Index] Job {job_id} removed (id {index_id})")
 
     def clear_index(self):
-        self.index = faiss.IndexFlatIP(EMBEDDING_DIM)
+        self.index = self._new_index()
         self.job_vectors.clear()
         self.job_store.clear()
         self.job_id_to_index.clear()
@@ -122,14 +253,16 @@ class JobMatcherService:
         logger.info("[Index] Cleared FAISS index and store")
 
     def rebuild_index(self):
-        logger.info("[Index] Rebuilding FAISS from stored jobs")
-        all_jobs = list(self.job_store.values())
-        self.clear_index()
-        for job_data in all_jobs:
-            try:
-                self.index_job(JobPosting(**job_data))
-            except Exception as e:
-                logger.warning(f"[Rebuild Skipped] Job {job_data.get('job_id')} failed: {e}")
+        """
+        Rebuild the FAISS index from stored vectors. Nothing is re-encoded.
+        """
+        logger.info("[Index] Rebuilding FAISS from stored vectors")
+        self.index = self._new_index()
+        if not self.job_vectors:
+            return
+        ids = np.fromiter(self.job_vectors.keys(), dtype=np.int64, count=len(self.job_vectors))
+        vectors = np.stack([self.job_vectors[i] for i in ids]).astype(np.float32)
+        self.index.add_with_ids(vectors, ids)
 
     # === Matching ===
 
@@ -142,54 +275,47 @@ class JobMatcherService:
         if not self.job_vectors:
             raise ValueError("No jobs indexed yet.")
 
-        resume_vector = self.encode(resume.resume_text + " " + " ".join(resume.skills))
-        scores, indices = self.index.search(np.array([resume_vector]), len(self.job_vectors))
+        resume_vector = self.encode(self._resume_text(resume.resume_text, resume.skills))
+        scores, indices = self.index.search(np.array([resume_vector], dtype=np.float32), self.index.ntotal)
 
         results = []
         for idx in indices[0]:
-            job_id = self.index_to_job_id.get(idx)
+            job_id = self.index_to_job_id.get(int(idx))
             if not job_id:
                 continue
             if filter_ids and job_id not in filter_ids:
                 continue
 
             job_data = self.job_store[job_id]
-            job_vec = self.job_vectors[idx]
-            semantic = float(np.dot(resume_vector, job_vec))
-
-            required_skills = job_data.get("required_skills", [])
-            matched_skills = list(set(resume.skills) & set(required_skills))
-            skill_overlap = len(matched_skills) / max(len(required_skills), 1)
-
-            keyword_score = self._keyword_overlap(resume.resume_text, job_data["description"])
-            recency = self._recency_score(job_data.get("created_at"))
-
-            final_score = sum([
-                SCORING_WEIGHTS["semantic"] * semantic,
-                SCORING_WEIGHTS["skill_overlap"] * skill_overlap,
-                SCORING_WEIGHTS["keyword"] * keyword_score,
-                SCORING_WEIGHTS["recency"] * recency
-            ])
-
-            results.append(MatchScore(
+            results.append(score_pair(
                 job_id=job_id,
-                semantic_score=round(semantic, 4),
-                skill_overlap=round(skill_overlap, 4),
-                keyword_match_score=round(keyword_score, 4),
-                recency_score=round(recency, 4),
-                final_score=round(final_score, 4),
-                matched_skills=matched_skills,
-                explanation={
-                    "semantic": semantic,
-                    "skill_overlap": skill_overlap,
-                    "keyword_match": keyword_score,
-                    "recency": recency
-                }
+                resume_vector=resume_vector,
+                job_vector=self.job_vectors[int(idx)],
+                resume_skills=resume.skills,
+                required_skills=job_data.get("required_skills", []),
+                resume_text=resume.resume_text,
+                job_description=job_data["description"],
+                created_at=job_data.get("created_at")
             ))
 
         results.sort(key=lambda x: x.final_score, reverse=True)
         return results[:top_k]
 
+    def score_resume_against_job(self, resume: ResumeProfile, job: JobPosting) -> MatchScore:
+        """
+        Pairwise scoring that never reads or mutates the shared index.
+        """
+        return score_pair(
+            job_id=job.job_id,
+            resume_vector=self.encode(self._resume_text(resume.resume_text, resume.skills)),
+            job_vector=self.encode(self._job_text(job)),
+            resume_skills=resume.skills,
+            required_skills=job.required_skills,
+            resume_text=resume.resume_text,
+            job_description=job.description,
+            created_at=job.created_at
+        )
+
     # === Temporary Matching APIs ===
 
     def match_resume_to_job(self, resume_text: str, job_description: str) -> Dict:
@@ -200,13 +326,89 @@ class JobMatcherService:
             required_skills=[],
             created_at=datetime.utcnow().isoformat()
         )
-        self.index_job(job)
-
         profile = ResumeProfile(candidate_id="temp", resume_text=resume_text, skills=[])
-        matches = self.hybrid_match(profile, top_k=1, filter_ids=[job.job_id])
+        return self.score_resume_against_job(profile, job).dict()
+
+    def score_resumes_against_job(
+        self,
+        job: JobPosting,
+        resume_texts: List[str],
+        resume_skills: Optional[List[List[str]]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score many resumes against one job without touching the shared index.
+
+        All resumes are encoded in one model call, semantic similarity is a single
+        matrix-vector product, and keyword / skill overlap are computed as sparse
+        token counts. Returns one array per score component, aligned with `resume_texts`.
+        """
+        resume_skills = resume_skills or [[] for _ in resume_texts]
+        if len(resume_skills) != len(resume_texts):
+            raise ValueError("resume_skills must align with resume_texts")
+
+        job_vector = self.encode(self._job_text(job)).astype(np.float32)
+        resume_matrix = self.encode_batch([
+            self._resume_text(text, skills) for text, skills in zip(resume_texts, resume_skills)
+        ])
+
+        semantic = resume_matrix @ job_vector
+        skill_overlap = self._skill_overlap_batch(resume_skills, job.required_skills)
+        keyword = self._keyword_overlap_batch(resume_texts, job.description)
+        recency = np.full(len(resume_texts), self._recency_score(job.created_at))
+
+        final = (
+            SCORING_WEIGHTS["semantic"] * semantic +
+            SCORING_WEIGHTS["skill_overlap"] * skill_overlap +
+            SCORING_WEIGHTS["keyword"] * keyword +
+            SCORING_WEIGHTS["recency"] * recency
+        )
 
-        self.delete_job(job.job_id)
-        return matches[0].dict() if matches else {"score": 0.0, "explanation": "No match found"}
+        return {
+            "semantic": semantic,
+            "skill_overlap": skill_overlap,
+            "keyword_match": keyword,
+            "recency": recency,
+            "final": final
+        }
+
+    def _batch_results(
+        self,
+        job: JobPosting,
+        resume_texts: List[str],
+        resume_skills: Optional[List[List[str]]] = None
+    ) -> List[Dict]:
+        if not resume_texts:
+            return []
+
+        scores = self.score_resumes_against_job(job, resume_texts, resume_skills)
+        required = set(job.required_skills)
+        columns = zip(
+            scores["semantic"].tolist(),
+            scores["skill_overlap"].tolist(),
+            scores["keyword_match"].tolist(),
+            scores["recency"].tolist(),
+            scores["final"].tolist()
+        )
+
+        results = []
+        for idx, (semantic, skill_overlap, keyword, recency, final) in enumerate(columns):
+            skills = resume_skills[idx] if resume_skills else []
+            results.append({
+                "job_id": job.job_id,
+                "semantic_score": round(semantic, 4),
+                "skill_overlap": round(skill_overlap, 4),
+                "keyword_match_score": round(keyword, 4),
+                "recency_score": round(recency, 4),
+                "final_score": round(final, 4),
+                "matched_skills": list(set(skills) & required),
+                "explanation": {
+                    "semantic": semantic,
+                    "skill_overlap": skill_overlap,
+                    "keyword_match": keyword,
+                    "recency": recency
+                }
+            })
+        return results
 
     def batch_match_resumes(self, resume_texts: List[str], job_description: str) -> List[Dict]:
         job = JobPosting(
@@ -216,16 +418,8 @@ class JobMatcherService:
             required_skills=[],
             created_at=datetime.utcnow().isoformat()
         )
-        self.index_job(job)
-
-        results = []
-        for idx, resume_text in enumerate(resume_texts):
-            profile = ResumeProfile(candidate_id=f"cand_{idx}", resume_text=resume_text, skills=[])
-            matches = self.hybrid_match(profile, top_k=1, filter_ids=[job.job_id])
-            results.append(matches[0].dict() if matches else {"score": 0.0})
-
-        self.delete_job(job.job_id)
-        return results
+        logger.info(f"[BatchMatch] Scoring {len(resume_texts)} resumes against job {job.job_id}")
+        return self._batch_results(job, resume_texts)
 
     def match_job_to_candidates(self, job_description: str, candidate_resumes: List[Dict]) -> List[Dict]:
         job = JobPosting(
@@ -235,15 +429,8 @@ class JobMatcherService:
             required_skills=[],
             created_at=datetime.utcnow().isoformat()
         )
-        self.index_job(job)
 
-        results = []
-        for c in candidate_resumes:
-            profile = ResumeProfile(candidate_id=c["candidate_id"], resume_text=c["resume_text"], skills=[])
-            matches = self.hybrid_match(profile, top_k=1, filter_ids=[job.job_id])
-            result = matches[0].dict() if matches else {"score": 0.0}
+        results = self._batch_results(job, [c["resume_text"] for c in candidate_resumes])
+        for result, c in zip(results, candidate_resumes):
             result["candidate_id"] = c["candidate_id"]
-            results.append(result)
-
-        self.delete_job(job.job_id)
         return results
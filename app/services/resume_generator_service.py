@@ -1,15 +1,15 @@
 # services/resume_generator_service.py
 
 import os
-import json
+import asyncio
 import logging
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict
 
-import openai
 from openai import OpenAIError
-from sentence_transformers import SentenceTransformer, util
 
 from app.base.models import ResumeGenerationRequest, ResumeGenerationResult
+from app.models.llm_client import get_llm_client
+from app.models.skill_bank_index import get_skill_bank_index
 
 logger = logging.getLogger("resume_generator_service")
 
@@ -17,34 +17,16 @@ logger = logging.getLogger("resume_generator_service")
 class ResumeGeneratorService:
     def __init__(self):
         self.model_name = os.getenv("RESUME_MODEL_NAME", "gpt-4-turbo")
-        openai.api_key = os.getenv("OPENAI_API_KEY")
-        self.sbert_model = SentenceTransformer("all-MiniLM-L6-v2")
-        self.skill_bank = self.load_skill_bank()
-
-    def load_skill_bank(self, path: str = "skill_bank.json") -> List[str]:
-        if os.path.exists(path):
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"[ResumeGenerator] Failed to load skill bank: {e}")
-        logger.warning("[ResumeGenerator] Skill bank not found or empty.")
-        return []
+        self.skill_index = get_skill_bank_index("skill_bank.json")
 
     def expand_skills(self, skills: List[str], top_k: int = 5) -> List[str]:
-        if not self.skill_bank:
+        if not skills or not self.skill_index.skills:
             return skills
 
         try:
-            base_embeds = self.sbert_model.encode(skills, convert_to_tensor=True)
-            bank_embeds = self.sbert_model.encode(self.skill_bank, convert_to_tensor=True)
             expanded = set(skills)
-
-            for emb in base_embeds:
-                scores = util.cos_sim(emb, bank_embeds)[0]
-                top_indices = scores.argsort(descending=True)[:top_k]
-                for i in top_indices:
-                    expanded.add(self.skill_bank[i])
+            for matches in self.skill_index.top_k(skills, k=top_k):
+                expanded.update(skill for skill, _ in matches)
 
             return sorted(expanded)
         except Exception as e:
@@ -76,6 +58,24 @@ Output Format:
 5. Certifications (if any)
 """
 
+    async def generate_resume_stream(self, req: ResumeGenerationRequest) -> AsyncIterator[str]:
+        """
+        Streaming variant of `generate_resume`: yields resume text as the LLM writes it.
+        Skill expansion runs in the default executor first; API errors propagate.
+        """
+        logger.info(f"[ResumeGenerator] Streaming resume for: {req.name}")
+        expanded_skills = await asyncio.get_running_loop().run_in_executor(None, self.expand_skills, req.skills)
+        prompt = self._build_prompt(req, expanded_skills)
+
+        async for token in get_llm_client().stream(
+            prompt,
+            model=self.model_name,
+            system_prompt="You are a helpful AI resume builder.",
+            temperature=0.6,
+            max_tokens=1200,
+        ):
+            yield token
+
     def generate_resume(self, req: ResumeGenerationRequest) -> ResumeGenerationResult:
         try:
             logger.info(f"[ResumeGenerator] Generating resume for: {req.name}")
@@ -83,17 +83,13 @@ Output Format:
             expanded_skills = self.expand_skills(req.skills)
             prompt = self._build_prompt(req, expanded_skills)
 
-            response = openai.ChatCompletion.create(
+            content = get_llm_client().complete_sync(
+                prompt,
                 model=self.model_name,
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI resume builder."},
-                    {"role": "user", "content": prompt}
-                ],
+                system_prompt="You are a helpful AI resume builder.",
                 temperature=0.6,
                 max_tokens=1200,
             )
-
-            content = response.choices[0].message["content"]
             logger.info(f"[ResumeGenerator] Resume generated successfully for: {req.name}")
 
             return ResumeGenerationResult(
@@ -5,79 +5,240 @@ import re
 import json
 import tempfile
 import logging
-from typing import List, Dict, Optional
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+from threading import Lock
+from typing import List, Dict, Iterator, Optional, Tuple
 
 import pytesseract
-import spacy
 from PIL import Image, ImageOps
 from docx import Document
 from pdfminer.high_level import extract_text as extract_pdf_text
 from langdetect import detect, LangDetectException
-from transformers import pipeline
-from sentence_transformers import SentenceTransformer, util
-from sklearn.cluster import AgglomerativeClustering
+
+from app.base.config import settings
+from app.models.embedding_cache import get_cached_encoder
+from app.models.spacy_loader import SpacyModelRegistry
+from app.models.skill_bank_index import get_skill_bank_index
+from app.models.skill_bank_compactor import get_skill_bank_compactor
 
 logger = logging.getLogger("resume_parser_service")
 
 # === Constants ===
 SUPPORTED_EXTENSIONS = [".pdf", ".docx", ".png", ".jpg", ".jpeg"]
 SKILL_BANK_PATH = "skill_bank.json"
-
-# === Models ===
-spacy_models = {
-    "en": spacy.load("en_core_web_sm"),
-    "ru": spacy.load("ru_core_news_sm"),
-    "uz": spacy.load("en_core_web_sm"),  # fallback
+RESUME_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+SUMMARY_SENTENCES = 5
+
+SECTION_KEYWORDS = {
+    "education": {
+        "en": ["university", "bachelor", "master", "phd", "college"],
+        "ru": ["университет", "бакалавр", "магистр", "институт"],
+        "uz": ["universitet", "bakalavr", "magistr", "litsey"]
+    },
+    "experience": {
+        "en": ["experience", "intern", "worked", "responsibilities", "role", "job"],
+        "ru": ["опыт", "работал", "должность", "обязанности"],
+        "uz": ["tajriba", "ish", "lavozim", "majburiyat"]
+    },
+    "certifications": {
+        "en": ["certificate", "certification", "training", "completed"],
+        "ru": ["сертификат", "курсы", "обучение"],
+        "uz": ["sertifikat", "kurs", "trening"]
+    },
 }
-ner_pipeline = pipeline("ner", model="dslim/bert-base-NER", aggregation_strategy="simple")
-sbert_model = SentenceTransformer("all-MiniLM-L6-v2")
+
+
+def _compile_section_pattern(lang: str) -> "re.Pattern":
+    """
+    One alternation per language with a named group per section. Wrapped in a lookahead so
+    matches may overlap and every section keyword occurring in a sentence is reported.
+    """
+    groups = []
+    for section, by_lang in SECTION_KEYWORDS.items():
+        words = sorted(by_lang.get(lang, by_lang["en"]), key=len, reverse=True)
+        groups.append(f"(?P<{section}>{'|'.join(re.escape(w) for w in words)})")
+    return re.compile(f"(?=(?:{'|'.join(groups)}))")
+
+
+SECTION_PATTERNS = {lang: _compile_section_pattern(lang) for lang in ("en", "ru", "uz")}
+
+KNOWN_LANGUAGES = ["english", "russian", "uzbek", "french", "turkish", "german", "arabic"]
+LANGUAGE_PATTERN = re.compile("|".join(KNOWN_LANGUAGES))
+
+
+def warm_up(languages: Optional[List[str]] = None):
+    """
+    Load parsing models ahead of the first request (spaCy per language, skill bank, resume SBERT).
+    Models are otherwise loaded lazily on first use.
+    """
+    languages = languages or SpacyModelRegistry.supported_languages()
+    logger.info(f"[ResumeParser] Warming up models for {languages}")
+    SpacyModelRegistry.preload(languages)
+    try:
+        get_skill_bank_index(SKILL_BANK_PATH).skills
+        get_cached_encoder(RESUME_EMBEDDING_MODEL)
+    except Exception as e:
+        logger.warning(f"[ResumeParser] Embedding warm-up failed: {e}")
+
+# === Bulk extraction pool ===
+_extract_pool: Optional[ProcessPoolExecutor] = None
+_extract_pool_lock = Lock()
+
+
+def _get_extract_pool() -> ProcessPoolExecutor:
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is None:
+            # spawn, not fork: by now the worker runs the LLM loop, ASR lanes and batcher
+            # threads, and a forked child can inherit one of their locks held forever.
+            _extract_pool = ProcessPoolExecutor(
+                max_workers=settings.RESUME_PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _extract_pool
+
+
+def _extract_for_batch(file_path: str) -> Tuple[str, str]:
+    """
+    Process-pool task: file → (cleaned text, language code). Runs pdfminer / OCR off the main process.
+    """
+    service = ResumeParserService()
+    ext = service.validate_extension(file_path)
+    cleaned = service.clean_text(service.extract_text(file_path, ext))
+    return cleaned, service.detect_language(cleaned)
+
 
 class ResumeParserService:
     def parse_resume(self, file_path: str, pinfl: str = "unknown") -> Dict:
-        ext = os.path.splitext(file_path)[-1].lower()
-        if ext not in SUPPORTED_EXTENSIONS:
-            raise ValueError(f"Unsupported file type: {ext}")
+        ext = self.validate_extension(file_path)
 
         # === Extract text ===
         text = self.extract_text(file_path, ext)
         cleaned = self.clean_text(text)
 
         # === Detect language ===
-        try:
-            lang = detect(cleaned)
-            lang_code = lang[:2] if lang[:2] in spacy_models else "en"
-        except LangDetectException:
-            lang_code = "en"
+        lang_code = self.detect_language(cleaned)
 
-        nlp = spacy_models[lang_code]
+        nlp = SpacyModelRegistry.get_model(lang_code)
         doc = nlp(cleaned)
 
         # === Extract structured fields ===
-        new_skills = self.extract_candidate_skills(doc)
-        self.save_skill_bank(new_skills)
+        get_skill_bank_compactor(SKILL_BANK_PATH).submit(self.extract_candidate_skills(doc))
+
+        parsed = self._assemble(
+            doc, cleaned, lang_code,
+            skills=self.semantic_skill_match(cleaned),
+            embedding=self.get_resume_embedding(cleaned)
+        )
 
-        parsed = {
+        self.store_feedback(pinfl, parsed)
+        return parsed
+
+    def parse_resumes_batch(
+        self,
+        file_paths: List[str],
+        pinfl: str = "unknown",
+        batch_size: int = None
+    ) -> Iterator[Dict]:
+        """
+        Bulk parse. Text extraction fans out to a process pool; as files complete they are
+        grouped into batches that go through `nlp.pipe`, one skill-bank query and one
+        embedding encode. Yields {"file", "result"} or {"file", "error"} per file as soon
+        as its batch is done.
+
+        Closing the generator early cancels queued extractions and waits for running ones,
+        so the caller may delete the input files right after `close()`.
+        """
+        batch_size = batch_size or settings.RESUME_PARSE_BATCH_SIZE
+        pool = _get_extract_pool()
+        futures = {pool.submit(_extract_for_batch, path): path for path in file_paths}
+
+        try:
+            ready: List[Tuple[str, str, str]] = []
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    cleaned, lang_code = future.result()
+                except Exception as e:
+                    logger.warning(f"[BatchParse] Extraction failed for {path}: {e}")
+                    yield {"file": path, "error": str(e)}
+                    continue
+
+                ready.append((path, cleaned, lang_code))
+                if len(ready) >= batch_size:
+                    yield from self._parse_extracted(ready, pinfl)
+                    ready = []
+
+            if ready:
+                yield from self._parse_extracted(ready, pinfl)
+        finally:
+            running = [f for f in futures if not f.done() and not f.cancel()]
+            if running:
+                logger.info(f"[BatchParse] Batch abandoned; waiting for {len(running)} running extractions")
+                wait(running)
+
+    def _parse_extracted(self, items: List[Tuple[str, str, str]], pinfl: str) -> Iterator[Dict]:
+        texts = [cleaned for _, cleaned, _ in items]
+        try:
+            skills = [[s for s, _ in matches] for matches in get_skill_bank_index(SKILL_BANK_PATH).top_k(texts, k=10)]
+            embeddings = get_cached_encoder(RESUME_EMBEDDING_MODEL).encode(texts, normalize=False).tolist()
+        except Exception as e:
+            logger.exception(f"[BatchParse] Batch embedding failed: {e}")
+            for path, _, _ in items:
+                yield {"file": path, "error": str(e)}
+            return
+
+        by_lang: Dict[str, List[int]] = {}
+        for pos, (_, _, lang_code) in enumerate(items):
+            by_lang.setdefault(lang_code, []).append(pos)
+
+        candidate_skills: List[str] = []
+        for lang_code, positions in by_lang.items():
+            docs = SpacyModelRegistry.get_model(lang_code).pipe([texts[p] for p in positions], batch_size=len(positions))
+            for pos, doc in zip(positions, docs):
+                path = items[pos][0]
+                try:
+                    candidate_skills.extend(self.extract_candidate_skills(doc))
+                    parsed = self._assemble(doc, texts[pos], lang_code, skills[pos], embeddings[pos])
+                    self.store_feedback(pinfl, parsed)
+                    yield {"file": path, "result": parsed}
+                except Exception as e:
+                    logger.warning(f"[BatchParse] Parsing failed for {path}: {e}")
+                    yield {"file": path, "error": str(e)}
+
+        get_skill_bank_compactor(SKILL_BANK_PATH).submit(candidate_skills)
+
+    def _assemble(self, doc, cleaned: str, lang_code: str, skills: List[str], embedding: List[float]) -> Dict:
+        return {
             "name": self.extract_name(doc),
             "email": self.extract_email(cleaned),
             "phone": self.extract_phone(cleaned),
             "links": self.extract_links(cleaned),
             "location": self.extract_location(doc),
-            "skills": self.semantic_skill_match(cleaned),
-            "education": self.extract_education(doc, lang_code),
-            "experience": self.extract_experience(doc, lang_code),
-            "certifications": self.extract_certifications(doc, lang_code),
+            "skills": skills,
+            **self.extract_sections(doc, lang_code),
             "languages": self.extract_languages(cleaned),
-            "summary": self.extract_summary(doc),
             "job_history": self.extract_job_history(cleaned),
             "language": lang_code,
-            "resume_embedding": self.get_resume_embedding(cleaned),
+            "resume_embedding": embedding,
             "raw_text": cleaned,
             "parse_confidence": self.estimate_confidence(cleaned),
             "fields_found": self.count_fields_present(cleaned),
         }
 
-        self.store_feedback(pinfl, parsed)
-        return parsed
+    def validate_extension(self, file_path: str) -> str:
+        ext = os.path.splitext(file_path)[-1].lower()
+        if ext not in SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Unsupported file type: {ext}")
+        return ext
+
+    def detect_language(self, cleaned: str) -> str:
+        try:
+            lang = detect(cleaned)
+            return lang[:2] if lang[:2] in SpacyModelRegistry.supported_languages() else "en"
+        except LangDetectException:
+            return "en"
 
     def extract_text(self, file_path: str, ext: str) -> str:
         if ext == ".pdf":
@@ -120,39 +281,29 @@ class ResumeParserService:
                 return ent.text.strip()
         return ""
 
-    def extract_summary(self, doc) -> str:
-        return " ".join([s.text for s in list(doc.sents)[:5] if len(s.text.strip()) > 20])
+    def extract_sections(self, doc, lang: str) -> Dict[str, str]:
+        """
+        Single pass over sentences: each sentence is lowercased once and matched against one
+        precompiled alternation of all section keywords. Returns summary, education,
+        experience and certifications together.
+        """
+        pattern = SECTION_PATTERNS.get(lang, SECTION_PATTERNS["en"])
+        sections: Dict[str, List[str]] = {section: [] for section in SECTION_KEYWORDS}
+        summary: List[str] = []
+
+        for i, sent in enumerate(doc.sents):
+            text = sent.text
+            if i < SUMMARY_SENTENCES and len(text.strip()) > 20:
+                summary.append(text)
+            for section in {m.lastgroup for m in pattern.finditer(text.lower())}:
+                sections[section].append(text)
+
+        result = {section: "\n".join(sents) for section, sents in sections.items()}
+        result["summary"] = " ".join(summary)
+        return result
 
     def extract_languages(self, text: str) -> List[str]:
-        known = ["english", "russian", "uzbek", "french", "turkish", "german", "arabic"]
-        return list({lang.title() for lang in known if lang in text.lower()})
-
-    def extract_education(self, doc, lang: str) -> str:
-        keywords = {
-            "en": ["university", "bachelor", "master", "phd", "college"],
-            "ru": ["университет", "бакалавр", "магистр", "институт"],
-            "uz": ["universitet", "bakalavr", "magistr", "litsey"]
-        }
-        kwords = keywords.get(lang, keywords["en"])
-        return "\n".join([s.text for s in doc.sents if any(kw in s.text.lower() for kw in kwords)])
-
-    def extract_experience(self, doc, lang: str) -> str:
-        keywords = {
-            "en": ["experience", "intern", "worked", "responsibilities", "role", "job"],
-            "ru": ["опыт", "работал", "должность", "обязанности"],
-            "uz": ["tajriba", "ish", "lavozim", "majburiyat"]
-        }
-        kwords = keywords.get(lang, keywords["en"])
-        return "\n".join([s.text for s in doc.sents if any(kw in s.text.lower() for kw in kwords)])
-
-    def extract_certifications(self, doc, lang: str) -> str:
-        keywords = {
-            "en": ["certificate", "certification", "training", "completed"],
-            "ru": ["сертификат", "курсы", "обучение"],
-            "uz": ["sertifikat", "kurs", "trening"]
-        }
-        kwords = keywords.get(lang, keywords["en"])
-        return "\n".join([s.text for s in doc.sents if any(kw in s.text.lower() for kw in kwords)])
+        return sorted({match.title() for match in LANGUAGE_PATTERN.findall(text.lower())})
 
     def extract_job_history(self, text: str) -> List[str]:
         pattern = r"(?:[A-ZА-Я][\w\s&\-,.]+)\s+at\s+[\w&\-,.\s]+\s+\d{4}"
@@ -168,17 +319,11 @@ class ResumeParserService:
         return list(skills)
 
     def semantic_skill_match(self, text: str) -> List[str]:
-        bank = self.load_skill_bank()
-        if not bank:
-            return []
-        text_embed = sbert_model.encode(text, convert_to_tensor=True)
-        skill_embeds = sbert_model.encode(bank, convert_to_tensor=True)
-        scores = util.cos_sim(text_embed, skill_embeds)[0]
-        top_indices = scores.argsort(descending=True)[:10]
-        return [bank[i] for i in top_indices]
+        matches = get_skill_bank_index(SKILL_BANK_PATH).top_k([text], k=10)[0]
+        return [skill for skill, _ in matches]
 
     def get_resume_embedding(self, text: str) -> List[float]:
-        return sbert_model.encode(text).tolist()
+        return get_cached_encoder(RESUME_EMBEDDING_MODEL).encode(text, normalize=False).tolist()
 
     def estimate_confidence(self, text: str) -> float:
         return min(1.0, 0.5 + 0.0001 * len(text))  # naive heuristic
@@ -191,30 +336,7 @@ class ResumeParserService:
         }
 
     def load_skill_bank(self) -> List[str]:
-        if os.path.exists(SKILL_BANK_PATH):
-            with open(SKILL_BANK_PATH, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return []
-
-    def save_skill_bank(self, new_skills: List[str]):
-        try:
-            existing = set(self.load_skill_bank())
-            existing.update(new_skills)
-            deduped = self.deduplicate_skills(list(existing))
-            with open(SKILL_BANK_PATH, "w", encoding="utf-8") as f:
-                json.dump(sorted(deduped), f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.warning(f"[SkillBank] Failed to save skill bank: {e}")
-
-    def deduplicate_skills(self, skills: List[str]) -> List[str]:
-        if len(skills) < 2:
-            return skills
-        embeddings = sbert_model.encode(skills)
-        clustering = AgglomerativeClustering(n_clusters=None, distance_threshold=0.4).fit(embeddings)
-        clusters = {}
-        for idx, label in enumerate(clustering.labels_):
-            clusters.setdefault(label, []).append(skills[idx])
-        return [sorted(group, key=len)[0] for group in clusters.values()]
+        return get_skill_bank_index(SKILL_BANK_PATH).skills
 
     def store_feedback(self, pinfl: str, parsed: Dict):
         try:
@@ -13,8 +13,8 @@ logger = logging.getLogger("scoring_service")
 
 
 class ScoringService:
-    def __init__(self):
-        self.matcher = JobMatcherService()
+    def __init__(self, matcher: Optional[JobMatcherService] = None):
+        self.matcher = matcher or JobMatcherService()
         self.psychometric_url = settings.PSYCHOMETRIC_API_URL
 
     def fetch_psychometric_score(self, candidate_id: str) -> float:
@@ -61,34 +61,25 @@ class ScoringService:
 
             logger.info(f"[Scoring] candidate={resume.candidate_id}, job={job.job_id}")
 
-            # Step 1: Index job temporarily
-            self.matcher.index_job(job)
+            # Step 1: Pairwise match (no shared index mutation)
+            match = self.matcher.score_resume_against_job(resume, job)
 
-            # Step 2: Run hybrid matcher
-            matches = self.matcher.hybrid_match(resume, top_k=1, filter_ids=[job.job_id])
-            if not matches:
-                raise ValueError(f"No match found for job_id={job.job_id}")
-            match = matches[0]
-
-            # Step 3: Remove indexed job
-            self.matcher.delete_job(job.job_id)
-
-            # Step 4: Fetch psychometric score
+            # Step 2: Fetch psychometric score
             psychometric = psychometric_score or self.fetch_psychometric_score(resume.candidate_id)
 
-            # Step 5: Normalize fairness-adjusted score
+            # Step 3: Normalize fairness-adjusted score
             fairness_score = normalize_score((match.final_score + psychometric) / 2)
 
-            # Step 6: Weighted final score
+            # Step 4: Weighted final score
             final_score = compute_final_score(
                 semantic_score=match.semantic_score,
                 skill_overlap=match.skill_overlap,
                 psychometric_score=psychometric,
-                fairness_adjusted_score=fairness_score,
+                fairness_score=fairness_score,
                 weights=override_weights
             )
 
-            # Step 7: SHAP explanation
+            # Step 5: SHAP explanation
             explanation = None
             if explain:
                 explanation = self.explain_score({
@@ -98,7 +89,7 @@ class ScoringService:
                     "fairness_adjusted_score": fairness_score
                 })
 
-            # Step 8: Return structured result
+            # Step 6: Return structured result
             result = {
                 "candidate_id": resume.candidate_id,
                 "job_id": job.job_id,
@@ -1,9 +1,10 @@
 import logging
 import numpy as np
 from typing import List, Union
-from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from app.models.embedding_loader import EmbeddingModelRegistry
+
 logger = logging.getLogger("vector_utils")
 
 # Load once at module level
@@ -12,7 +13,7 @@ _default_model_name = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-
 class EmbeddingEncoder:
     def __init__(self, model_name: str = _default_model_name):
         try:
-            self.model = SentenceTransformer(model_name)
+            self.model = EmbeddingModelRegistry.get_model(model_name)
             self.dim = self.model.get_sentence_embedding_dimension()
             logger.info(f"[EmbeddingEncoder] Loaded model: {model_name} (dim={self.dim})")
         except Exception as e:
@@ -0,0 +1,64 @@
+import asyncio
+import types
+
+import pytest
+
+for module in ("pydantic", "prometheus_client", "fastapi", "torch", "openai"):
+    pytest.importorskip(module)
+
+from app.routers.interview_bot.config import config  # noqa: E402
+from app.services import interview_stream_service  # noqa: E402
+from app.services.asr_worker_pool import ASRBackpressureError  # noqa: E402
+
+
+class SaturatedPool:
+    def __init__(self):
+        self.calls = 0
+
+    async def run(self, model_key, session_key, fn, *args):
+        self.calls += 1
+        raise ASRBackpressureError(f"ASR lane '{model_key}' is full")
+
+
+@pytest.fixture
+def session(monkeypatch):
+    pool = SaturatedPool()
+    monkeypatch.setattr(interview_stream_service, "get_asr_pool", lambda: pool)
+    monkeypatch.setattr(interview_stream_service, "load_questions", lambda **kwargs: [])
+    return interview_stream_service.InterviewStreamSession(
+        candidate_id="cand_1",
+        domain="backend",
+        difficulty="mid",
+        language="en",
+        transcriber=types.SimpleNamespace(model_key="en"),
+        llm_scorer=object(),
+    )
+
+
+def test_backpressure_buffer_is_bounded(session):
+    frame = config.AUDIO_SAMPLE_WIDTH * config.AUDIO_CHANNELS
+    limit = config.STREAM_MAX_PENDING_SECONDS * config.AUDIO_SAMPLE_RATE * frame
+    chunk = bytes(config.AUDIO_SAMPLE_RATE * frame // 2 + 1)  # ~0.5 s, deliberately not frame-aligned
+    ring_bytes = session.buffer_bytes
+
+    for _ in range(4 * config.STREAM_MAX_PENDING_SECONDS):
+        with pytest.raises(ASRBackpressureError):
+            asyncio.run(session.handle_stream_chunk(chunk))
+        assert len(session._pending_audio) <= limit
+
+    assert session.buffer_bytes <= ring_bytes + limit
+    assert session.dropped_bytes > 0
+    assert session.dropped_bytes % frame == 0
+    assert session.dropped_bytes + len(session._pending_audio) == 4 * config.STREAM_MAX_PENDING_SECONDS * len(chunk)
+
+
+def test_oversized_session_is_evicted(session, monkeypatch):
+    service = interview_stream_service.InterviewStreamService()
+    service.sessions["s1"] = session
+    service.record_usage("s1")
+    assert service.is_current("s1", session)
+
+    monkeypatch.setattr(config, "MAX_STREAM_SESSION_BUFFER_BYTES", session.buffer_bytes - 1)
+    assert session.expiry_reason() == "buffer"
+    service.record_usage("s1")
+    assert "s1" not in service.sessions
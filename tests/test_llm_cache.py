@@ -0,0 +1,210 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("prometheus_client")
+
+from app.models import llm_cache  # noqa: E402
+from app.models.llm_cache import (  # noqa: E402
+    LLMCacheBackend,
+    LLMResponseCache,
+    MemoryLLMCacheBackend,
+    RedisLLMCacheBackend,
+    SQLiteLLMCacheBackend,
+)
+
+
+class DictBackend(LLMCacheBackend):
+    """
+    Stand-in backend: a plain dict that records writes, ignoring TTLs.
+    """
+    name = "dict"
+
+    def __init__(self):
+        self.entries = {}
+        self.writes = 0
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value, ttl_seconds):
+        self.writes += 1
+        self.entries[key] = value
+
+    def clear(self):
+        self.entries.clear()
+
+
+class BrokenBackend(DictBackend):
+    def get(self, key):
+        raise ConnectionError("backend down")
+
+    def set(self, key, value, ttl_seconds):
+        raise ConnectionError("backend down")
+
+
+class FakeRedis:
+    """
+    The subset of redis-py that RedisLLMCacheBackend uses; returns bytes like a real client.
+    """
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    def get(self, key):
+        value = self.store.get(key)
+        return value.encode("utf-8") if value is not None else None
+
+    def setex(self, key, ttl_seconds, value):
+        self.store[key] = value
+        self.ttls[key] = ttl_seconds
+
+    def scan_iter(self, pattern):
+        prefix = pattern.rstrip("*")
+        return [k for k in list(self.store) if k.startswith(prefix)]
+
+    def delete(self, key):
+        self.store.pop(key, None)
+        self.ttls.pop(key, None)
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache.time, "time", clock.time)
+    return clock
+
+
+class FakeLLMClient:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    async def complete(self, prompt, model, system_prompt, temperature, max_tokens):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def test_backend_must_implement_every_method():
+    class Incomplete(LLMCacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        LLMCacheBackend()
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_key_ignores_whitespace_but_not_params():
+    key = LLMResponseCache.make_key("gpt-4", "score  this\nanswer", temperature=0.0, max_tokens=10)
+    assert key == LLMResponseCache.make_key("gpt-4", "score this answer", temperature=0.0, max_tokens=10)
+    assert key != LLMResponseCache.make_key("gpt-4", "score this answer", temperature=0.7, max_tokens=10)
+
+
+def test_hit_and_miss():
+    cache = LLMResponseCache(DictBackend(), ttl_seconds=60)
+    assert cache.get("k") is None
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+
+
+def test_backend_errors_read_as_misses():
+    cache = LLMResponseCache(BrokenBackend(), ttl_seconds=60)
+    cache.set("k", "v")
+    assert cache.get("k") is None
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryLLMCacheBackend(max_items=2)
+    backend.set("a", "1", 60)
+    backend.set("b", "2", 60)
+    assert backend.get("a") == "1"  # "b" is now least recently used
+    backend.set("c", "3", 60)
+    assert backend.get("b") is None
+    assert backend.get("a") == "1"
+    assert backend.get("c") == "3"
+
+
+def test_memory_backend_expires_entries(clock):
+    backend = MemoryLLMCacheBackend(max_items=2)
+    backend.set("a", "1", 10)
+    clock.now += 9
+    assert backend.get("a") == "1"
+    clock.now += 2
+    assert backend.get("a") is None
+
+
+def test_sqlite_backend_expires_and_trims(tmp_path, clock):
+    backend = SQLiteLLMCacheBackend(str(tmp_path / "llm_cache.sqlite"), max_items=2)
+    backend.set("a", "1", 10)
+    clock.now += 11
+    assert backend.get("a") is None
+
+    for i, key in enumerate("bcd"):
+        clock.now += 1
+        backend.set(key, str(i), 60)
+    assert backend.get("b") is None  # oldest access, trimmed past max_items
+    assert backend.get("c") == "1"
+    assert backend.get("d") == "2"
+
+    backend.clear()
+    assert backend.get("c") is None
+
+
+def test_redis_backend_uses_injected_client():
+    client = FakeRedis()
+    backend = RedisLLMCacheBackend(client=client)
+    backend.set("a", "1", 30)
+    assert client.ttls == {"llmcache:a": 30}
+    assert backend.get("a") == "1"
+    assert backend.get("missing") is None
+
+    client.store["other:key"] = "kept"
+    backend.clear()
+    assert backend.get("a") is None
+    assert client.store == {"other:key": "kept"}
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    pytest.importorskip("openai")
+    from app.models import gpt_writer
+
+    def build(responses):
+        client = FakeLLMClient(responses)
+        monkeypatch.setattr(gpt_writer, "get_llm_client", lambda api_key=None: client)
+        w = gpt_writer.GPTWriter(model="gpt-4", cache=False)
+        w.cache = LLMResponseCache(DictBackend(), ttl_seconds=60)
+        return w, client
+
+    return build
+
+
+def test_writer_serves_repeat_prompts_from_cache(writer):
+    w, client = writer(["first"])
+    assert asyncio.run(w.awrite("hello")) == "first"
+    assert asyncio.run(w.awrite("hello")) == "first"
+    assert client.calls == 1
+
+
+def test_writer_does_not_cache_errors(writer):
+    from app.models.gpt_writer import FALLBACK_MESSAGES
+
+    w, client = writer([RuntimeError("boom"), "recovered"])
+    assert asyncio.run(w.awrite("hello")) in FALLBACK_MESSAGES
+    assert w.cache.backend.writes == 0
+    assert asyncio.run(w.awrite("hello")) == "recovered"
+    assert client.calls == 2
@@ -0,0 +1,44 @@
+import ast
+import pathlib
+
+import pytest
+
+SERVICE_PATH = pathlib.Path(__file__).resolve().parents[1] / "app" / "services" / "resume_parser_service.py"
+
+
+def test_parser_only_calls_methods_it_defines():
+    tree = ast.parse(SERVICE_PATH.read_text(encoding="utf-8"))
+    cls = next(n for n in tree.body if isinstance(n, ast.ClassDef) and n.name == "ResumeParserService")
+    defined = {n.name for n in cls.body if isinstance(n, ast.FunctionDef)}
+    called = {
+        node.func.attr
+        for node in ast.walk(cls)
+        if isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "self"
+    }
+    assert called <= defined, f"undefined methods called: {sorted(called - defined)}"
+
+
+def test_assemble_parses_minimal_resume():
+    spacy = pytest.importorskip("spacy")
+    for module in ("pydantic", "pytesseract", "PIL", "docx", "pdfminer", "langdetect", "sentence_transformers"):
+        pytest.importorskip(module)
+    from app.services.resume_parser_service import ResumeParserService
+
+    text = (
+        "Jane Doe is a backend engineer with five years of experience. "
+        "She holds a master degree from Tashkent University. "
+        "Speaks English and Russian. Contact jane@example.com or +998 90 123 45 67."
+    )
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    service = ResumeParserService()
+    parsed = service._assemble(nlp(text), text, "en", skills=["Python"], embedding=[0.0])
+
+    assert parsed["email"] == "jane@example.com"
+    assert parsed["languages"] == ["English", "Russian"]
+    assert "University" in parsed["education"]
+    assert "experience" in parsed["experience"]
+    assert parsed["skills"] == ["Python"]